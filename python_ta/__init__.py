@@ -28,25 +28,66 @@ except AttributeError:
     pass
 
 
+import importlib
 import logging
 import webbrowser
 from typing import IO, TYPE_CHECKING, Any, Literal, Optional, Union
 
-from .check.helpers import (
-    check_file,
-    get_file_paths,
-    get_valid_files_to_check,
-    setup_linter,
-    upload_linter_results,
-    verify_pre_check,
-)
-from .check.watch import watch_files
-
 if TYPE_CHECKING:
+    from .check.cache import evict_cache_entries
+    from .check.helpers import (
+        check_file,
+        get_file_paths,
+        get_valid_files_to_check,
+        prefetch_type_checks,
+        setup_linter,
+        upload_linter_results,
+        verify_pre_check,
+    )
+    from .check.parallel import (
+        check_files_in_pool,
+        create_worker_pool,
+        submit_files_to_pool,
+    )
+    from .check.watch import watch_files
     from .reporters.core import PythonTaReporter
 
 HELP_URL = "http://www.cs.toronto.edu/~david/pyta/checkers/index.html"
 
+# The functions used to check modules, and the modules they are imported from when they are first
+# used. These modules import pylint and astroid, so they are not imported with python_ta itself,
+# which keeps importing submodules that do not use them (such as python_ta.contracts) fast.
+_LAZY_ATTRIBUTES = {
+    "evict_cache_entries": ".check.cache",
+    "check_file": ".check.helpers",
+    "get_file_paths": ".check.helpers",
+    "get_valid_files_to_check": ".check.helpers",
+    "prefetch_type_checks": ".check.helpers",
+    "setup_linter": ".check.helpers",
+    "upload_linter_results": ".check.helpers",
+    "verify_pre_check": ".check.helpers",
+    "check_files_in_pool": ".check.parallel",
+    "create_worker_pool": ".check.parallel",
+    "submit_files_to_pool": ".check.parallel",
+    "watch_files": ".check.watch",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the attributes in _LAZY_ATTRIBUTES when they are first accessed."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def _import_lazy_attributes() -> None:
+    """Import all attributes in _LAZY_ATTRIBUTES that have not been imported (or set) yet."""
+    for name in _LAZY_ATTRIBUTES:
+        if name not in globals():
+            __getattr__(name)
+
 
 def check_errors(
     module_name: Union[list[str], str] = "",
@@ -55,6 +96,8 @@ def check_errors(
     load_default_config: bool = True,
     autoformat: Optional[bool] = False,
     on_verify_fail: Literal["log", "raise"] = "log",
+    jobs: int = 1,
+    use_cache: bool = True,
 ) -> PythonTaReporter:
     """Check a module for errors, printing a report."""
     return _check(
@@ -65,6 +108,8 @@ def check_errors(
         load_default_config=load_default_config,
         autoformat=autoformat,
         on_verify_fail=on_verify_fail,
+        jobs=jobs,
+        use_cache=use_cache,
     )
 
 
@@ -75,6 +120,8 @@ def check_all(
     load_default_config: bool = True,
     autoformat: Optional[bool] = False,
     on_verify_fail: Literal["log", "raise"] = "log",
+    jobs: int = 1,
+    use_cache: bool = True,
 ) -> PythonTaReporter:
     """Analyse one or more Python modules for code issues and display the results.
 
@@ -104,6 +151,15 @@ def check_all(
             Determines how to handle files that cannot be checked. If set to "log" (default), an error
             message is logged and execution continues. If set to "raise", an error is raised immediately to stop
             execution.
+        jobs:
+            The number of worker processes used to check modules in parallel. If 1 (default),
+            modules are checked one at a time in the current process. If 0, one worker process is
+            started for each available CPU.
+        use_cache:
+            If True (default) and the ``pyta-cache-dir`` configuration option is set, the results
+            of checking modules are cached in that directory, and modules that have not changed
+            since they were last checked are not checked again.
+            If False, the cache is neither read nor updated.
 
     Returns:
         The ``PythonTaReporter`` object that generated the report.
@@ -116,6 +172,8 @@ def check_all(
         load_default_config=load_default_config,
         autoformat=autoformat,
         on_verify_fail=on_verify_fail,
+        jobs=jobs,
+        use_cache=use_cache,
     )
 
 
@@ -127,6 +185,8 @@ def _check(
     load_default_config: bool = True,
     autoformat: Optional[bool] = False,
     on_verify_fail: Literal["log", "raise"] = "log",
+    jobs: int = 1,
+    use_cache: bool = True,
 ) -> PythonTaReporter:
     """Check a module for problems, printing a report.
 
@@ -143,36 +203,86 @@ def _check(
     `autoformat` is used to specify whether the black formatting tool is run. It is not run by default.
     `on_verify_fail` determines how to handle files that cannot be checked. If set to "log" (default), an error
      message is logged and execution continues. If set to "raise", an error is raised immediately to stop execution.
+    `jobs` is the number of worker processes used to check files in parallel (0 for one per CPU).
+    `use_cache` determines whether the result cache (configured by pyta-cache-dir) is used.
     """
     # Configuring logger
     logging.basicConfig(format="[%(levelname)s] %(message)s", level=logging.INFO)
+    _import_lazy_attributes()
     linter, current_reporter = setup_linter(local_config, load_default_config, output)
+    pool = None
+    if jobs != 1:
+        pool = create_worker_pool(jobs, local_config, load_default_config, autoformat, use_cache)
     try:
         # Flag indicating whether at least one file has been checked
         is_any_file_checked = False
         linted_files = set()
         f_paths = []  # Paths to files for data submission
+        # The files to check from each location. They are all verified before any is checked, so
+        # that the worker pool can check the files of every location together.
+        files_by_location = []
+        # An error raised by verify_pre_check (with `on_verify_fail="raise"`) is only raised
+        # once the files before the one that failed have been checked, as they were when each
+        # file was checked right after being verified
+        verify_error = None
         for locations in get_valid_files_to_check(module_name):
-            f_paths = []
+            files_to_check = []
+            files_by_location.append(files_to_check)
             for file_py in get_file_paths(locations):
                 linted_files.add(file_py)
-                if not verify_pre_check(
-                    file_py, linter.config.allow_pylint_comments, on_verify_fail=on_verify_fail
-                ):
-                    # The only way to reach this is if verify_pre_check returns False, and `on_verify_fail="log"`.
-                    continue
-                is_any_file_checked, linter = check_file(
-                    file_py=file_py,
-                    local_config=local_config,
-                    load_default_config=load_default_config,
-                    autoformat=autoformat,
+                try:
+                    if not verify_pre_check(
+                        file_py, linter.config.allow_pylint_comments, on_verify_fail=on_verify_fail
+                    ):
+                        # The only way to reach this is if verify_pre_check returns False, and `on_verify_fail="log"`.
+                        continue
+                except Exception as e:
+                    verify_error = e
+                    break
+                files_to_check.append(file_py)
+            if verify_error is not None:
+                break
+
+        all_files = [file_py for files in files_by_location for file_py in files]
+        if pool is not None:
+            results = submit_files_to_pool(pool, all_files, linter, jobs)
+        else:
+            prefetch_type_checks(all_files, local_config, load_default_config, use_cache)
+        for i, files_to_check in enumerate(files_by_location):
+            f_paths = []
+            if pool is not None:
+                is_any_file_checked = check_files_in_pool(
+                    results=results,
+                    files=files_to_check,
+                    level=level,
                     is_any_file_checked=is_any_file_checked,
+                    linter=linter,
                     current_reporter=current_reporter,
                     f_paths=f_paths,
                 )
-                current_reporter = linter.reporter
-                current_reporter.print_messages(level)
+            else:
+                for file_py in files_to_check:
+                    is_any_file_checked, linter = check_file(
+                        file_py=file_py,
+                        local_config=local_config,
+                        load_default_config=load_default_config,
+                        autoformat=autoformat,
+                        is_any_file_checked=is_any_file_checked,
+                        current_reporter=current_reporter,
+                        f_paths=f_paths,
+                        use_cache=use_cache,
+                    )
+                    current_reporter = linter.reporter
+                    current_reporter.print_messages(level)
+            if verify_error is not None and i == len(files_by_location) - 1:
+                raise verify_error
             upload_linter_results(linter, current_reporter, f_paths, local_config)
+        if use_cache and linter.config.pyta_cache_dir:
+            evict_cache_entries(
+                linter.config.pyta_cache_dir,
+                linter.config.pyta_cache_max_size,
+                linter.config.pyta_cache_max_age,
+            )
         # Only generate reports (display the webpage) if there were valid files to check
         if is_any_file_checked:
             linter.generate_reports()
@@ -194,6 +304,9 @@ def _check(
         )
         logging.error('Error message: "{}"'.format(e))
         raise e
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 
 def doc(msg_id: str) -> None:
@@ -142,14 +142,39 @@ def _display(
     graph.render(outfile=filename + ".svg", view=auto_open)
 
 
-def _visit(block: CFGBlock, graph: graphviz.Digraph, visited: set[int], end: CFGBlock) -> None:
+def _visit(block: CFGBlock, graph: graphviz.Digraph, visited: set[str], end: CFGBlock) -> None:
     """
-    Visit a CFGBlock and add it to the control flow graph.
+    Visit a CFGBlock and the blocks reachable from it, and add them to the control flow graph.
     """
-    node_id = f"{graph.name}_{block.id}"
-    if node_id in visited:
+    if f"{graph.name}_{block.id}" in visited:
         return
 
+    _add_node(block, graph, visited, end)
+    # Stack of the successors of the blocks being visited that have not been visited yet
+    stack = [iter(block.successors)]
+    while stack:
+        for edge in stack[-1]:
+            source_id = f"{graph.name}_{edge.source.id}"
+            target_id = f"{graph.name}_{edge.target.id}"
+            color = "black" if edge.is_feasible else "lightgrey"
+            if edge.get_label() is not None:
+                graph.edge(source_id, target_id, label=edge.get_label(), color=color)
+            else:
+                graph.edge(source_id, target_id, color=color)
+
+            if target_id not in visited:
+                _add_node(edge.target, graph, visited, end)
+                stack.append(iter(edge.target.successors))
+                break
+        else:
+            stack.pop()
+
+
+def _add_node(block: CFGBlock, graph: graphviz.Digraph, visited: set[str], end: CFGBlock) -> None:
+    """
+    Add a CFGBlock to the control flow graph, and record it as visited.
+    """
+    node_id = f"{graph.name}_{block.id}"
     label = ""
     fill_color = "white"
 
@@ -188,13 +213,3 @@ def _visit(block: CFGBlock, graph: graphviz.Digraph, visited: set[int], end: CFG
 
     graph.node(node_id, label=label, fillcolor=fill_color, style="filled")
     visited.add(node_id)
-
-    for edge in block.successors:
-        color = "black" if edge.is_feasible else "lightgrey"
-        if edge.get_label() is not None:
-            graph.edge(
-                node_id, f"{graph.name}_{edge.target.id}", label=edge.get_label(), color=color
-            )
-        else:
-            graph.edge(node_id, f"{graph.name}_{edge.target.id}", color=color)
-        _visit(edge.target, graph, visited, end)
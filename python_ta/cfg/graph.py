@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 import logging
-from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Set
+import time
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, Optional, Set, Tuple
 
 if TYPE_CHECKING:
     try:
@@ -25,6 +26,14 @@ from astroid import (
 # Global z3
 z3 = Any
 
+# Default maximum number of paths whose z3 constraints are computed separately. Functions with
+# more paths have the constraints of each edge computed by combining those of its predecessors.
+Z3_MAX_PATHS = 64
+# Default maximum time in milliseconds for each z3 check, and for all z3 checks of a graph
+# (0 for no maximum)
+Z3_TIMEOUT = 0
+Z3_FUNCTION_TIMEOUT = 0
+
 
 class ControlFlowGraph:
     """A graph representing the control flow of a Python program."""
@@ -43,10 +52,36 @@ class ControlFlowGraph:
     z3_vars: Dict[str, ExprRef]
     # z3 enabled option
     z3_enabled: bool
+    # maximum number of paths whose z3 constraints are computed separately (0 for no maximum)
+    z3_max_paths: int
+    # maximum time in milliseconds for each z3 check (0 for no maximum)
+    z3_timeout: int
+    # maximum time in milliseconds for all z3 checks of this graph (0 for no maximum)
+    z3_function_timeout: int
+    # maximum memory in megabytes for each z3 check (0 for no maximum)
+    z3_max_memory: int
+    # number of z3 checks that were skipped or inconclusive because of the limits above
+    z3_skipped_checks: int
+    # total time in milliseconds taken by the z3 checks of this graph
+    _z3_time: float
 
-    def __init__(self, cfg_id: int = 0, z3_enabled: bool = False) -> None:
+    def __init__(
+        self,
+        cfg_id: int = 0,
+        z3_enabled: bool = False,
+        z3_max_paths: int = Z3_MAX_PATHS,
+        z3_timeout: int = Z3_TIMEOUT,
+        z3_function_timeout: int = Z3_FUNCTION_TIMEOUT,
+        z3_max_memory: int = 0,
+    ) -> None:
         self.block_count = 0
         self.cfg_id = cfg_id
+        self.z3_max_paths = z3_max_paths
+        self.z3_timeout = z3_timeout
+        self.z3_function_timeout = z3_function_timeout
+        self.z3_max_memory = z3_max_memory
+        self.z3_skipped_checks = 0
+        self._z3_time = 0
         self.unreachable_blocks = set()
         self.start = self.create_block()
         self.end = self.create_block()
@@ -177,20 +212,19 @@ class ControlFlowGraph:
 
         When only_feasible is True, only generate blocks feasible from start based on edge z3 constraints.
         """
-        yield from self._get_blocks(self.start, set(), only_feasible)
-
-    def _get_blocks(
-        self, block: CFGBlock, visited: Set[int], only_feasible: bool
-    ) -> Generator[CFGBlock, None, None]:
-        if block.id in visited:
-            return
-
-        yield block
-        visited.add(block.id)
-
-        for edge in block.successors:
-            if not only_feasible or edge.is_feasible:
-                yield from self._get_blocks(edge.target, visited, only_feasible)
+        visited = {self.start.id}
+        yield self.start
+        # Stack of the successors of the blocks being visited that have not been visited yet
+        stack = [iter(self.start.successors)]
+        while stack:
+            for edge in stack[-1]:
+                if (not only_feasible or edge.is_feasible) and edge.target.id not in visited:
+                    visited.add(edge.target.id)
+                    yield edge.target
+                    stack.append(iter(edge.target.successors))
+                    break
+            else:
+                stack.pop()
 
     def get_blocks_postorder(self, only_feasible: bool = False) -> Generator[CFGBlock, None, None]:
         """Return the sequence of all blocks in this graph in the order of
@@ -198,47 +232,57 @@ class ControlFlowGraph:
 
         When only_feasible is True, only generate blocks feasible from start based on edge z3 constraints.
         """
-        yield from self._get_blocks_postorder(self.start, set(), only_feasible)
-
-    def _get_blocks_postorder(
-        self, block: CFGBlock, visited: Set[int], only_feasible: bool
-    ) -> Generator[CFGBlock, None, None]:
-        if block.id in visited:
-            return
-
-        visited.add(block.id)
-        for succ in block.successors:
-            if not only_feasible or succ.is_feasible:
-                yield from self._get_blocks_postorder(succ.target, visited, only_feasible)
-
-        yield block
+        visited = {self.start.id}
+        # Stack of the blocks being visited, with their successors that have not been visited yet
+        stack = [(self.start, iter(self.start.successors))]
+        while stack:
+            block, successors = stack[-1]
+            for edge in successors:
+                if (not only_feasible or edge.is_feasible) and edge.target.id not in visited:
+                    visited.add(edge.target.id)
+                    stack.append((edge.target, iter(edge.target.successors)))
+                    break
+            else:
+                stack.pop()
+                yield block
 
     def get_edges(self) -> Generator[CFGEdge, None, None]:
         """Generate a sequence of all edges in this graph."""
-        yield from self._get_edges(self.start, set())
-
-    def _get_edges(self, block: CFGBlock, visited: Set[int]) -> Generator[CFGEdge, None, None]:
-        if block.id in visited:
-            return
-
-        visited.add(block.id)
+        visited = {self.start.id}
+        # Stack of the successors of the blocks being visited that have not been visited yet
+        stack = [iter(self.start.successors)]
+        while stack:
+            for edge in stack[-1]:
+                yield edge
+                if edge.target.id not in visited:
+                    visited.add(edge.target.id)
+                    stack.append(iter(edge.target.successors))
+                    break
+            else:
+                stack.pop()
 
-        for edge in block.successors:
-            yield edge
-            yield from self._get_edges(edge.target, visited)
+    def get_paths(self, limit: Optional[int] = None) -> List[List[CFGEdge]]:
+        """Get edges that represent paths from start to end node in depth-first order.
 
-    def get_paths(self) -> List[List[CFGEdge]]:
-        """Get edges that represent paths from start to end node in depth-first order."""
+        When limit is specified, stop searching for paths once more than limit paths are found.
+        """
         paths = []
-
-        def _dfs(
-            current_edge: CFGEdge,
-            current_path: List[CFGEdge],
-            visited_edges: Set[CFGEdge],
-            visited_nodes: Set[CFGBlock],
-        ):
+        current_path = []
+        visited_edges = set()
+        visited_nodes = set()
+        # Stack of the edges left to follow after each edge of current_path (and before the first)
+        stack = [iter(self.start.successors[:1])]
+        while stack and (limit is None or len(paths) <= limit):
+            current_edge = next(stack[-1], None)
+            if current_edge is None:
+                stack.pop()
+                if current_path:
+                    edge = current_path.pop()
+                    visited_edges.remove(edge)
+                    visited_nodes.remove(edge.source)
+                continue
             if current_edge in visited_edges:
-                return
+                continue
 
             visited_edges.add(current_edge)
             current_path.append(current_edge)
@@ -250,15 +294,12 @@ class ControlFlowGraph:
                 or set(current_edge.target.successors).issubset(visited_edges)
             ):
                 paths.append(current_path.copy())
+                current_path.pop()
+                visited_edges.remove(current_edge)
+                visited_nodes.remove(current_edge.source)
             else:
-                for edge in current_edge.target.successors:
-                    _dfs(edge, current_path, visited_edges, visited_nodes)
+                stack.append(iter(current_edge.target.successors))
 
-            current_path.pop()
-            visited_edges.remove(current_edge)
-            visited_nodes.remove(current_edge.source)
-
-        _dfs(self.start.successors[0], [], set(), set())
         return paths
 
     def update_block_reachability(self) -> None:
@@ -276,11 +317,21 @@ class ControlFlowGraph:
         - While conditions
 
         Constraints with reassigned variables are not included in subsequent edges.
+
+        If this graph has at most z3_max_paths paths (or z3_max_paths is 0), the constraints of
+        each path through an edge are stored separately, keyed by the index of the path.
+        Otherwise, the constraints of each edge are computed from those of the edges leading to it
+        and stored under the key 0, so that graphs with many paths are handled in linear time.
         """
         if not self.z3_enabled:
             return
 
-        for path_id, path in enumerate(self.get_paths()):
+        paths = self.get_paths(limit=self.z3_max_paths or None)
+        if self.z3_max_paths and len(paths) > self.z3_max_paths:
+            self._propagate_edge_z3_constraints()
+            return
+
+        for path_id, path in enumerate(paths):
             # starting a new path
             z3_environment = Z3Environment(self.z3_vars, self.precondition_constraints)
             for edge in path:
@@ -302,6 +353,71 @@ class ControlFlowGraph:
                     if isinstance(node, (Assign, AugAssign, AnnAssign)):
                         self._handle_variable_reassignment(node, z3_environment)
 
+    def _propagate_edge_z3_constraints(self) -> None:
+        """Add Z3 constraints on each edge by visiting the blocks in topological order.
+
+        The environment at the start of a block combines the environments of its incoming edges,
+        ignoring the edges that return to the start of a loop. Each edge is visited once, so its
+        constraints are those of any of the paths through it.
+        """
+        blocks, back_edges = self._get_blocks_topological_order()
+        edge_environments = {}
+        for block in blocks:
+            if block is self.start:
+                z3_environment = Z3Environment(self.z3_vars, self.precondition_constraints)
+            else:
+                z3_environment = Z3Environment.join(
+                    [
+                        edge_environments[edge]
+                        for edge in block.predecessors
+                        if edge in edge_environments and edge not in back_edges
+                    ]
+                )
+                for node in block.statements:
+                    if isinstance(node, (Assign, AugAssign, AnnAssign)):
+                        self._handle_variable_reassignment(node, z3_environment)
+
+            for edge in block.successors:
+                edge_environment = z3_environment.copy()
+                if edge.condition is not None and edge.negate is not None:
+                    condition_z3_constraint = edge_environment.parse_constraint(edge.condition)
+                    if condition_z3_constraint is not None:
+                        edge_environment.add_constraint(
+                            z3.Not(condition_z3_constraint)
+                            if edge.negate
+                            else condition_z3_constraint
+                        )
+
+                edge.z3_constraints = {0: edge_environment.update_constraints()}
+                edge_environments[edge] = edge_environment
+
+    def _get_blocks_topological_order(self) -> Tuple[List[CFGBlock], Set[CFGEdge]]:
+        """Return the blocks reachable from start in topological order, ignoring back edges,
+        together with the back edges (the edges that return to the start of a loop).
+        """
+        postorder = []
+        back_edges = set()
+        visited = {self.start.id}
+        on_stack = {self.start.id}
+        stack = [(self.start, iter(self.start.successors))]
+        while stack:
+            block, successors = stack[-1]
+            for edge in successors:
+                if edge.target.id in on_stack:
+                    back_edges.add(edge)
+                elif edge.target.id not in visited:
+                    visited.add(edge.target.id)
+                    on_stack.add(edge.target.id)
+                    stack.append((edge.target, iter(edge.target.successors)))
+                    break
+            else:
+                stack.pop()
+                on_stack.remove(block.id)
+                postorder.append(block)
+
+        postorder.reverse()
+        return postorder, back_edges
+
     def _handle_variable_reassignment(self, node: NodeNG, env: Z3Environment) -> None:
         """Check for reassignment statements and invoke Z3 environment"""
         if isinstance(node, Assign):
@@ -315,14 +431,45 @@ class ControlFlowGraph:
         """Traverse through edges in DFS order and update is_feasible
         attribute of each edge. Edges that are unreachable with the given
         set of Z3 constraints will have is_feasible set to False
+
+        A single solver is used for all edges: the constraints that a list of constraints shares
+        with the previously checked list are kept in the solver, and only the remaining constraints
+        are added (each in its own scope, so that they can be removed later). Each set of
+        constraints is only checked once.
+
+        Edges whose constraints cannot be checked within the z3 limits of this graph are feasible.
         """
         if not self.z3_enabled:
             return
 
+        solver = z3.Solver()
+        # ids of the constraints added to solver, in the order they were added
+        solver_constraint_ids = []
+        # map from sets of constraint ids to whether the constraints are unsatisfiable
+        unsat_results = {}
+
         def _check_unsat(constraints: List[ExprRef]) -> bool:
-            solver = z3.Solver()
-            solver.add(constraints)
-            return solver.check() == z3.unsat
+            constraint_ids = [constraint.get_id() for constraint in constraints]
+            key = frozenset(constraint_ids)
+            if key in unsat_results:
+                return unsat_results[key]
+
+            shared = 0
+            while (
+                shared < min(len(constraint_ids), len(solver_constraint_ids))
+                and constraint_ids[shared] == solver_constraint_ids[shared]
+            ):
+                shared += 1
+            if shared < len(solver_constraint_ids):
+                solver.pop(len(solver_constraint_ids) - shared)
+                del solver_constraint_ids[shared:]
+            for constraint, constraint_id in zip(constraints[shared:], constraint_ids[shared:]):
+                solver.push()
+                solver.add(constraint)
+                solver_constraint_ids.append(constraint_id)
+
+            unsat_results[key] = self.check_z3_unsat(solver)
+            return unsat_results[key]
 
         for edge in self.get_edges():
             if len(edge.z3_constraints) > 0:
@@ -330,6 +477,32 @@ class ControlFlowGraph:
                     _check_unsat(constraints) for constraints in edge.z3_constraints.values()
                 )
 
+    def check_z3_unsat(self, solver: Any) -> bool:
+        """Return whether the constraints added to the given z3 solver are unsatisfiable.
+
+        The check is limited by z3_timeout, z3_max_memory and the time remaining from
+        z3_function_timeout. If no time remains or the check is inconclusive, increment
+        z3_skipped_checks and return False.
+        """
+        timeout = self.z3_timeout
+        if self.z3_function_timeout:
+            remaining = self.z3_function_timeout - self._z3_time
+            if remaining < 1:
+                self.z3_skipped_checks += 1
+                return False
+            timeout = min(timeout, int(remaining)) if timeout else int(remaining)
+        if timeout:
+            solver.set("timeout", timeout)
+        if self.z3_max_memory:
+            solver.set("max_memory", self.z3_max_memory)
+
+        start = time.perf_counter()
+        result = solver.check()
+        self._z3_time += (time.perf_counter() - start) * 1000
+        if result == z3.unknown:
+            self.z3_skipped_checks += 1
+        return result == z3.unsat
+
 
 class CFGBlock:
     """A node in a control flow graph.
@@ -337,6 +510,8 @@ class CFGBlock:
     Represents a maximal block of code whose statements are guaranteed to execute in sequence.
     """
 
+    __slots__ = ("id", "statements", "predecessors", "successors", "reachable")
+
     # A unique identifier
     id: int
     # The statements in this block.
@@ -386,6 +561,16 @@ class CFGEdge:
     (when `negate` is False)
     """
 
+    __slots__ = (
+        "source",
+        "target",
+        "label",
+        "condition",
+        "negate",
+        "z3_constraints",
+        "is_feasible",
+    )
+
     source: CFGBlock
     target: CFGBlock
     label: Optional[str]
@@ -448,6 +633,60 @@ class Z3Environment:
         self.variables = variables
         self.constraints = constraints.copy()
 
+    def copy(self) -> Z3Environment:
+        """Return a copy of this environment"""
+        environment = Z3Environment(self.variables, self.constraints)
+        environment.variable_unassigned = self.variable_unassigned.copy()
+        return environment
+
+    @staticmethod
+    def join(environments: List[Z3Environment]) -> Z3Environment:
+        """Return an environment that holds when any of the given environments holds.
+
+        A variable is unassigned only if it is unassigned in all environments, and constraints
+        with variables that are reassigned are discarded. The remaining constraints shared by all
+        environments are kept as they are, and the others are combined into a single disjunction.
+
+        Precondition:
+            - len(environments) > 0
+            - all environments have the same variables
+        """
+        if len(environments) == 1:
+            return environments[0].copy()
+
+        from z3 import And, Or
+
+        environment = Z3Environment(environments[0].variables, [])
+        for variable in environment.variable_unassigned:
+            environment.variable_unassigned[variable] = all(
+                env.variable_unassigned[variable] for env in environments
+            )
+
+        env_constraints = []
+        for env in environments:
+            environment.constraints = env.constraints
+            env_constraints.append(environment.update_constraints())
+
+        common_ids = set.intersection(
+            *(
+                {constraint.get_id() for constraint in constraints}
+                for constraints in env_constraints
+            )
+        )
+        environment.constraints = [
+            constraint for constraint in env_constraints[0] if constraint.get_id() in common_ids
+        ]
+        other_constraints = [
+            [constraint for constraint in constraints if constraint.get_id() not in common_ids]
+            for constraints in env_constraints
+        ]
+        # The disjunction always holds if the constraints of some environment are all shared
+        if all(other_constraints):
+            environment.add_constraint(
+                Or(*(other[0] if len(other) == 1 else And(*other) for other in other_constraints))
+            )
+        return environment
+
     def assign(self, name: str) -> None:
         """Handle a variable assignment statement"""
         if name in self.variable_unassigned:
@@ -6,7 +6,13 @@ from astroid.exceptions import AstroidSyntaxError
 
 from python_ta.contracts import parse_assertions
 
-from .graph import CFGBlock, ControlFlowGraph
+from .graph import (
+    Z3_FUNCTION_TIMEOUT,
+    Z3_MAX_PATHS,
+    Z3_TIMEOUT,
+    CFGBlock,
+    ControlFlowGraph,
+)
 
 
 class CFGVisitor:
@@ -22,6 +28,21 @@ class CFGVisitor:
             This option specifies whether to restrict the creation of cfgs to just top-level
             function definitions or methods provided in this list. By default, it will create the
             cfg for the file as it normally would.
+      - "z3-max-paths": int
+            This option specifies the maximum number of paths in a function whose z3 constraints
+            are computed separately, when z3 is enabled. Functions with more paths have the z3
+            constraints of each edge computed by combining those of the edges leading to it.
+            If set to 0, there is no maximum. By default, it is Z3_MAX_PATHS.
+      - "z3-timeout": int
+            This option specifies the maximum time in milliseconds for each z3 check, when z3 is
+            enabled. If set to 0, there is no maximum. By default, it is Z3_TIMEOUT.
+      - "z3-function-timeout": int
+            This option specifies the maximum time in milliseconds for all z3 checks of a function,
+            when z3 is enabled. If set to 0, there is no maximum. By default, it is
+            Z3_FUNCTION_TIMEOUT.
+      - "z3-max-memory": int
+            This option specifies the maximum memory in megabytes for each z3 check, when z3 is
+            enabled. By default, it is 0 (no maximum).
 
     Private Attributes:
     _control_boundaries: A stack of the boundaries the visitor is currently in.
@@ -44,6 +65,10 @@ class CFGVisitor:
         self.options = {
             "separate-condition-blocks": False,
             "functions": [],
+            "z3-max-paths": Z3_MAX_PATHS,
+            "z3-timeout": Z3_TIMEOUT,
+            "z3-function-timeout": Z3_FUNCTION_TIMEOUT,
+            "z3-max-memory": 0,
         }
         if options is not None:
             self.options.update(options)
@@ -59,6 +84,17 @@ class CFGVisitor:
         else:
             raise AttributeError(f"'CFGVisitor' object has no attribute '{attr}'")
 
+    def _create_cfg(self) -> ControlFlowGraph:
+        """Return a new control flow graph configured with this visitor's options."""
+        return ControlFlowGraph(
+            self.cfg_count,
+            z3_enabled=self.z3_enabled,
+            z3_max_paths=self.options["z3-max-paths"],
+            z3_timeout=self.options["z3-timeout"],
+            z3_function_timeout=self.options["z3-function-timeout"],
+            z3_max_memory=self.options["z3-max-memory"],
+        )
+
     def visit_generic(self, node: nodes.NodeNG) -> None:
         """By default, add the expression to the end of the current block."""
         if self._current_block is not None:
@@ -74,7 +110,7 @@ class CFGVisitor:
                     child.accept(self)
             return
 
-        self.cfgs[module] = ControlFlowGraph(self.cfg_count, z3_enabled=self.z3_enabled)
+        self.cfgs[module] = self._create_cfg()
         self.cfg_count += 1
         self._current_cfg = self.cfgs[module]
         self._current_block = self._current_cfg.start
@@ -114,7 +150,7 @@ class CFGVisitor:
         previous_cfg = self._current_cfg
         previous_block = self._current_block
 
-        self.cfgs[func] = ControlFlowGraph(self.cfg_count, z3_enabled=self.z3_enabled)
+        self.cfgs[func] = self._create_cfg()
         self.cfg_count += 1
         self._current_cfg = self.cfgs[func]
 
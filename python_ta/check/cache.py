@@ -0,0 +1,156 @@
+"""Module to cache the results of checking files on disk.
+
+Each cache entry stores the messages reported for a single file, along with its module name and the
+linter stats from checking it, keyed by a hash of the file path and contents, the PythonTA version,
+the effective linter configuration and the messages config file. Unchanged files can then be
+reported without being linted again.
+
+Note that the messages for a file can also depend on the modules it imports; these are not part
+of the cache key.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+from typing import AnyStr, Optional
+
+from pylint.lint import PyLinter
+from pylint.message import Message
+from pylint.utils import LinterStats
+
+from python_ta import __version__
+
+from ..util.source import get_source_bundle
+
+# Extension of the files storing cache entries
+CACHE_ENTRY_EXTENSION = ".pickle"
+
+
+def get_cache_key(file_py: AnyStr, linter: PyLinter) -> str:
+    """Return the key of the cache entry for checking file_py with the given linter."""
+    source_hash = get_source_bundle(file_py).sha256
+
+    config_hash = hashlib.sha256(
+        json.dumps(vars(linter.config), sort_keys=True, default=repr).encode("utf-8")
+    ).hexdigest()
+
+    messages_config_hash = hashlib.sha256()
+    messages_config_paths = {
+        linter.config.messages_config_path,
+        linter._option_dicts["messages-config-path"]["default"],
+    }
+    for messages_config_path in sorted(messages_config_paths):
+        try:
+            with open(messages_config_path, "rb") as f:
+                messages_config_hash.update(f.read())
+        except OSError:
+            messages_config_hash.update(messages_config_path.encode("utf-8"))
+
+    # The path is part of the key since messages record the path and module name of the file
+    key = "\n".join(
+        [
+            os.path.abspath(os.path.expanduser(file_py)),
+            source_hash,
+            __version__,
+            config_hash,
+            messages_config_hash.hexdigest(),
+        ]
+    ).encode("utf-8")
+    return hashlib.sha256(key).hexdigest()
+
+
+def cache_entry_exists(cache_dir: str, key: str) -> bool:
+    """Return whether there is a cache entry with the given key, without reading it."""
+    return os.path.isfile(os.path.join(cache_dir, key + CACHE_ENTRY_EXTENSION))
+
+
+def load_cache_entry(
+    cache_dir: str, key: str
+) -> Optional[tuple[list[tuple[Message, Optional[str]]], str, LinterStats]]:
+    """Return the messages, module name and linter stats stored in the cache entry with the given
+    key, or None if there is no such entry (or it cannot be read).
+
+    Messages are stored as (message, snippet) pairs.
+    """
+    entry_path = os.path.join(cache_dir, key + CACHE_ENTRY_EXTENSION)
+    try:
+        with open(entry_path, "rb") as f:
+            entry = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        logging.debug(f"Could not read cache entry {entry_path}: {e}")
+        return None
+    if not isinstance(entry, tuple) or len(entry) != 3:
+        logging.debug(f"Could not read cache entry {entry_path}: unknown format")
+        return None
+
+    # Update the modification time, which is used to evict the least recently used entries
+    try:
+        os.utime(entry_path)
+    except OSError:
+        pass
+    return entry
+
+
+def store_cache_entry(
+    cache_dir: str,
+    key: str,
+    messages: list[tuple[Message, Optional[str]]],
+    module_name: str,
+    stats: LinterStats,
+) -> None:
+    """Store the given messages, module name and linter stats in the cache entry with the given key.
+
+    Messages are stored as (message, snippet) pairs. Failures to write the cache are logged
+    and otherwise ignored.
+    """
+    entry_path = os.path.join(cache_dir, key + CACHE_ENTRY_EXTENSION)
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump((messages, module_name, stats), f)
+        # Replace atomically, since several processes may write the same entry
+        os.replace(tmp_path, entry_path)
+    except (OSError, pickle.PicklingError) as e:
+        logging.debug(f"Could not write cache entry {entry_path}: {e}")
+
+
+def evict_cache_entries(cache_dir: str, max_size: int, max_age: int) -> None:
+    """Remove old cache entries from cache_dir.
+
+    Entries not used for more than max_age days are removed. Then the least recently used entries
+    are removed until the total size of the cache is at most max_size megabytes.
+    A value of 0 for max_size or max_age disables the corresponding limit.
+    """
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    for filename in os.listdir(cache_dir):
+        if not filename.endswith(CACHE_ENTRY_EXTENSION):
+            continue
+        entry_path = os.path.join(cache_dir, filename)
+        try:
+            stat = os.stat(entry_path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry_path))
+
+    now = time.time()
+    total_size = sum(size for _, size, _ in entries)
+    # Least recently used entries first
+    for mtime, size, entry_path in sorted(entries):
+        too_old = max_age > 0 and now - mtime > max_age * 24 * 60 * 60
+        too_large = max_size > 0 and total_size > max_size * 1024 * 1024
+        if not too_old and not too_large:
+            continue
+        try:
+            os.remove(entry_path)
+            total_size -= size
+        except OSError as e:
+            logging.debug(f"Could not remove cache entry {entry_path}: {e}")
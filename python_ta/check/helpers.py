@@ -4,11 +4,13 @@ modularizing core operations like file validation, linting, and result uploads.
 """
 
 import importlib.util
+import json
 import logging
 import os
 import re
 import sys
 import tokenize
+from collections import OrderedDict, defaultdict
 from configparser import Error as ConfigParserError
 from typing import IO, Any, AnyStr, Generator, Literal, Optional, Union
 
@@ -17,11 +19,14 @@ from pylint.config.config_file_parser import _RawConfParser
 from pylint.exceptions import UnknownMessageError
 from pylint.lint import PyLinter
 from pylint.lint.pylinter import _load_reporter_by_class
+from pylint.message import Message
 from pylint.reporters import BaseReporter, MultiReporter
+from pylint.utils import LinterStats, merge_stats
 from pylint.utils.pragma_parser import OPTION_PO
 
 from python_ta import __version__
 
+from ..checkers.static_type_checker import StaticTypeChecker, run_mypy_batch
 from ..config import (
     find_local_config,
     load_config,
@@ -29,12 +34,28 @@ from ..config import (
     override_config,
 )
 from ..patches import patch_all
+from ..reporters.core import NewMessage
 from ..upload import upload_to_server
 from ..util.autoformat import run_autoformat
+from ..util.files import get_mtime
+from ..util.source import discard_source_bundle, get_source_bundle
+from .cache import (
+    cache_entry_exists,
+    get_cache_key,
+    load_cache_entry,
+    store_cache_entry,
+)
 
 # Flag to determine if we've previously patched pylint
 PYLINT_PATCHED = False
 
+# Maximum number of fully initialised linters kept by get_linter
+LINTER_POOL_SIZE = 8
+
+# Pool of fully initialised linters, keyed by the resolved configuration they were built from.
+# Each value is a tuple of (linter, reporter class, messages config file modification time).
+_LINTER_POOL: OrderedDict[tuple, tuple[PyLinter, type, Optional[float]]] = OrderedDict()
+
 
 class PytaPyLinter(PyLinter):
     """Extension to PyLinter that blocks the default behavior of loading the output format"""
@@ -50,16 +71,21 @@ def setup_linter(
     output: Optional[Union[str, IO]],
 ) -> tuple[PyLinter, Union[BaseReporter, MultiReporter]]:
     """Set up the linter and reporter for the check."""
-    linter = reset_linter(config=local_config, load_default_config=load_default_config)
+    linter = get_linter(config=local_config, load_default_config=load_default_config)
     current_reporter = linter.reporter
     current_reporter.set_output(output)
     messages_config_path = linter.config.messages_config_path
 
+    patch_pylint()
+    return linter, current_reporter
+
+
+def patch_pylint() -> None:
+    """Apply PythonTA's patches to pylint, if they have not already been applied."""
     global PYLINT_PATCHED
     if not PYLINT_PATCHED:
         patch_all()
         PYLINT_PATCHED = True
-    return linter, current_reporter
 
 
 def check_file(
@@ -70,12 +96,13 @@ def check_file(
     is_any_file_checked: bool,
     current_reporter: Union[BaseReporter, MultiReporter],
     f_paths: list,
+    use_cache: bool = True,
 ) -> tuple[bool, PyLinter]:
     """Perform linting on a single Python file using the provided linter and configuration"""
-    # Load config file in user location. Construct new linter each
-    # time, so config options don't bleed to unintended files.
+    # Load config file in user location. Linters are only shared between files that resolve
+    # to the same configuration, so config options don't bleed to unintended files.
     # Reuse the same reporter each time to accumulate the results across different files.
-    linter = reset_linter(
+    linter = get_linter(
         config=local_config,
         file_linted=file_py,
         load_default_config=load_default_config,
@@ -83,6 +110,7 @@ def check_file(
 
     if autoformat:
         run_autoformat(file_py, linter.config.autoformat_options, linter.config.max_line_length)
+        discard_source_bundle(file_py)
 
     if not is_any_file_checked:
         prev_output = current_reporter.out
@@ -101,10 +129,7 @@ def check_file(
     # The current file was checked so update the flag
     is_any_file_checked = True
 
-    module_name = os.path.splitext(os.path.basename(file_py))[0]
-    if module_name in MANAGER.astroid_cache:  # Remove module from astroid cache
-        del MANAGER.astroid_cache[module_name]
-    linter.check([file_py])  # Lint !
+    lint_file(linter, file_py, use_cache)  # Lint !
     if linter.config.pyta_file_permission:
         f_paths.append(file_py)  # Appending paths for upload
     logging.debug(
@@ -118,6 +143,111 @@ def check_file(
     return is_any_file_checked, linter
 
 
+def lint_file(linter: PyLinter, file_py: AnyStr, use_cache: bool = True) -> None:
+    """Check a single Python file using the given linter, adding the messages to its reporter.
+
+    If use_cache is True and a cache directory is configured (pyta-cache-dir), the messages (and
+    linter stats) are loaded from the cache if file_py has been checked before with the same
+    configuration, and are stored in the cache otherwise.
+    """
+    cache_dir = linter.config.pyta_cache_dir if use_cache else ""
+    cache_key = None
+    if cache_dir:
+        cache_key = get_cache_key(file_py, linter)
+        cache_entry = load_cache_entry(cache_dir, cache_key)
+        if cache_entry is not None:
+            cached_messages, cached_module_name, cached_stats = cache_entry
+            linter.reporter.on_set_current_module(cached_module_name, file_py)
+            linter.reporter.messages[file_py] = messages_from_pairs(cached_messages)
+            # As when linting, where PyLinter.open resets the message counts
+            linter.stats.reset_message_count()
+            linter.stats = merge_stats([linter.stats, cached_stats])
+            logging.debug("File: {} was loaded from the cache: {}".format(file_py, cache_dir))
+            return
+
+    module_name = os.path.splitext(os.path.basename(file_py))[0]
+    if module_name in MANAGER.astroid_cache:  # Remove module from astroid cache
+        del MANAGER.astroid_cache[module_name]
+    if cache_key is None:
+        linter.check([file_py])
+        return
+
+    # Collect the stats of file_py separately, so that the cache entry does not include the stats
+    # accumulated before checking it (e.g. messages emitted while loading the configuration)
+    prev_stats = linter.stats
+    linter.stats = LinterStats()
+    linter.check([file_py])
+    file_stats = linter.stats
+    prev_stats.reset_message_count()
+    linter.stats = merge_stats([prev_stats, file_stats])
+
+    store_cache_entry(
+        cache_dir,
+        cache_key,
+        messages_to_pairs(linter.reporter.messages[file_py]),
+        linter.reporter.module_name,
+        file_stats,
+    )
+
+
+def prefetch_type_checks(
+    files: list[AnyStr],
+    local_config: Union[dict[str, Any], str],
+    load_default_config: bool,
+    use_cache: bool = True,
+) -> None:
+    """Run mypy once over the given files whose configuration enables the mypy-batch option,
+    so that the static type checker does not need to run mypy separately for each file.
+
+    Files that have an entry in the result cache, or that are checked without the
+    static type checker (because it is not loaded or all its messages are disabled), are skipped.
+    """
+    files_by_mypy_options = defaultdict(list)
+    for file_py in files:
+        linter = get_linter(
+            config=local_config, file_linted=file_py, load_default_config=load_default_config
+        )
+        if not linter.config.mypy_batch or not _static_type_checker_enabled(linter):
+            continue
+        cache_dir = linter.config.pyta_cache_dir if use_cache else ""
+        if cache_dir and cache_entry_exists(cache_dir, get_cache_key(file_py, linter)):
+            continue
+        files_by_mypy_options[tuple(linter.config.mypy_options)].append(file_py)
+
+    for mypy_options, filenames in files_by_mypy_options.items():
+        run_mypy_batch(filenames, list(mypy_options))
+
+
+def _static_type_checker_enabled(linter: PyLinter) -> bool:
+    """Return whether linter runs the static type checker, i.e., whether it is loaded and any of
+    its messages are enabled."""
+    return any(
+        checker.name == StaticTypeChecker.name
+        and any(linter.is_message_enabled(msgid) for msgid in checker.msgs)
+        for checker in linter.get_checkers()
+    )
+
+
+def messages_to_pairs(messages: list[Message]) -> list[tuple[Message, Optional[str]]]:
+    """Return the given messages as (message, snippet) pairs that can be pickled.
+
+    The snippet is None for messages that are not NewMessage objects. The astroid nodes of
+    NewMessage objects are discarded.
+    """
+    return [
+        (msg.message, msg.snippet) if isinstance(msg, NewMessage) else (msg, None)
+        for msg in messages
+    ]
+
+
+def messages_from_pairs(pairs: list[tuple[Message, Optional[str]]]) -> list[Message]:
+    """Return the messages represented by the given (message, snippet) pairs.
+
+    This is the inverse of messages_to_pairs, except that NewMessage objects have no astroid node.
+    """
+    return [msg if snippet is None else NewMessage(msg, None, snippet) for msg, snippet in pairs]
+
+
 def upload_linter_results(
     linter: PyLinter,
     current_reporter: Union[BaseReporter, MultiReporter],
@@ -261,6 +391,33 @@ def reset_linter(
                 "help": "List of command-line arguments for black",
             },
         ),
+        (
+            "pyta-cache-dir",
+            {
+                "default": "",  # If the value is empty, results are not cached.
+                "type": "string",
+                "metavar": "<cache_dir>",
+                "help": "Directory in which to cache the results of checking unchanged files",
+            },
+        ),
+        (
+            "pyta-cache-max-size",
+            {
+                "default": 100,  # If the value is 0, the cache size is not limited.
+                "type": "int",
+                "metavar": "<megabytes>",
+                "help": "Maximum size of the result cache, in megabytes",
+            },
+        ),
+        (
+            "pyta-cache-max-age",
+            {
+                "default": 30,  # If the value is 0, cache entries do not expire.
+                "type": "int",
+                "metavar": "<days>",
+                "help": "Number of days after which unused result cache entries are removed",
+            },
+        ),
     )
 
     parent_dir_path = os.path.dirname(os.path.dirname(__file__))
@@ -334,6 +491,84 @@ def reset_linter(
     return linter
 
 
+def get_linter(
+    config: Optional[Union[dict, str]] = None,
+    file_linted: Optional[AnyStr] = None,
+    load_default_config: bool = True,
+) -> PyLinter:
+    """Return a linter for the given configuration, reusing a previously constructed one if possible.
+
+    The configuration is resolved in the same way as reset_linter. Linters are pooled by the
+    resolved configuration (config file path and modification time, dict options and
+    load_default_config), so files that share a configuration share one fully initialised linter.
+    A pooled linter is given a fresh reporter and fresh stats every time it is returned.
+
+    Linters whose configuration could not be fingerprinted, or whose configuration produced
+    messages (e.g. parse errors), are never pooled so that those messages are reported every time.
+    Linters constructed before pylint has been patched are not pooled either, since the setendings
+    plugin captures the unpatched PyLinter.get_ast when it is registered.
+    """
+    key = _get_linter_pool_key(config, file_linted, load_default_config)
+    if key is not None and key in _LINTER_POOL:
+        linter, reporter_class, messages_config_mtime = _LINTER_POOL[key]
+        if get_mtime(linter.config.messages_config_path) == messages_config_mtime:
+            _LINTER_POOL.move_to_end(key)
+            linter.set_reporter(reporter_class())
+            linter.stats = LinterStats()
+            return linter
+        del _LINTER_POOL[key]
+
+    linter = reset_linter(
+        config=config, file_linted=file_linted, load_default_config=load_default_config
+    )
+    if key is not None and PYLINT_PATCHED and not linter.reporter.has_messages():
+        _LINTER_POOL[key] = (
+            linter,
+            type(linter.reporter),
+            get_mtime(linter.config.messages_config_path),
+        )
+        if len(_LINTER_POOL) > LINTER_POOL_SIZE:
+            _LINTER_POOL.popitem(last=False)
+    return linter
+
+
+def clear_linter_pool() -> None:
+    """Discard all linters pooled by get_linter."""
+    _LINTER_POOL.clear()
+
+
+def _get_linter_pool_key(
+    config: Optional[Union[dict, str]],
+    file_linted: Optional[AnyStr],
+    load_default_config: bool,
+) -> Optional[tuple]:
+    """Return the key identifying the resolved configuration of a linter, or None if the
+    configuration cannot be fingerprinted.
+
+    This mirrors how reset_linter chooses its configuration file.
+    """
+    if isinstance(config, str) and config != "":
+        config_file = config
+    elif file_linted:
+        config_file = find_local_config(file_linted)
+    else:
+        config_file = None
+
+    config_file_stamp = None
+    if config_file is not None:
+        config_file_mtime = get_mtime(config_file)
+        if config_file_mtime is None:
+            return None
+        config_file_stamp = (os.path.abspath(config_file), config_file_mtime)
+
+    try:
+        options = json.dumps(config if isinstance(config, dict) else {}, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+    return load_default_config, config_file_stamp, options
+
+
 def get_valid_files_to_check(module_name: Union[list[str], str]) -> Generator[AnyStr, None, None]:
     """A generator for all valid files to check."""
     # Allow call to check with empty args
@@ -407,17 +642,16 @@ def verify_pre_check(
         # trying to disable a check.
         if allow_pylint_comments:
             return True
-        with tokenize.open(os.path.expanduser(filepath)) as f:
-            for tok_type, content, _, _, _ in tokenize.generate_tokens(f.readline):
-                if tok_type != tokenize.COMMENT:
-                    continue
-                match = OPTION_PO.search(content)
-                if match is not None:
-                    logging.error(
-                        'String "pylint:" found in comment. '
-                        + "No check run on file `{}.`\n".format(filepath)
-                    )
-                    return False
+        for tok_type, content, _, _, _ in get_source_bundle(filepath).tokens:
+            if tok_type != tokenize.COMMENT:
+                continue
+            match = OPTION_PO.search(content)
+            if match is not None:
+                logging.error(
+                    'String "pylint:" found in comment. '
+                    + "No check run on file `{}.`\n".format(filepath)
+                )
+                return False
     except IndentationError as e:
         logging.error(
             "python_ta could not check your code due to an "
@@ -0,0 +1,182 @@
+"""Module to check files in parallel, using a pool of worker processes.
+
+Each worker process keeps its own pool of linters (see helpers.get_linter), so the linter for a
+given configuration is only constructed once per worker. The messages produced by the workers are
+merged back into a single reporter in the order the files were given.
+"""
+
+import itertools
+import math
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, AnyStr, Iterator, Optional, Union
+
+from pylint.lint import PyLinter
+from pylint.message import Message
+from pylint.reporters import BaseReporter, MultiReporter
+from pylint.utils import LinterStats, merge_stats
+
+from ..util.autoformat import run_autoformat
+from .helpers import (
+    get_linter,
+    lint_file,
+    messages_from_pairs,
+    messages_to_pairs,
+    patch_pylint,
+    prefetch_type_checks,
+)
+
+# Configuration used by the linters of the current worker process, set by _init_worker
+_worker_config: dict[str, Any] = {}
+
+
+def create_worker_pool(
+    jobs: int,
+    local_config: Union[dict[str, Any], str],
+    load_default_config: bool,
+    autoformat: Optional[bool],
+    use_cache: bool = True,
+) -> Executor:
+    """Return a pool of worker processes for checking files.
+
+    If jobs is 0, one worker is started for each available CPU.
+    """
+    return ProcessPoolExecutor(
+        max_workers=_get_worker_count(jobs),
+        initializer=_init_worker,
+        initargs=(local_config, load_default_config, autoformat, use_cache),
+    )
+
+
+def submit_files_to_pool(
+    pool: Executor, files: list[AnyStr], linter: PyLinter, jobs: int = 0
+) -> Iterator[tuple[dict[str, list[tuple[Message, Optional[str]]]], LinterStats, bool]]:
+    """Start checking all of the given files using the worker pool of jobs workers.
+
+    Return an iterator over the results of checking the files, in the order of files, to be merged
+    by check_files_in_pool. Each result is produced once its file has been checked.
+
+    If the mypy-batch option of linter is enabled, the files are split into one share of
+    consecutive files for each worker, and each worker runs mypy once over its share (see
+    helpers.prefetch_type_checks) before checking its files. Otherwise, the files are sent to the
+    workers one at a time.
+    """
+    if not files:
+        return iter([])
+    if linter.config.mypy_batch:
+        share_size = math.ceil(len(files) / _get_worker_count(jobs))
+        shares = [files[i : i + share_size] for i in range(0, len(files), share_size)]
+    else:
+        shares = [[file_py] for file_py in files]
+    return itertools.chain.from_iterable(pool.map(_check_files_in_worker, shares))
+
+
+def check_files_in_pool(
+    results: Iterator[tuple[dict[str, list[tuple[Message, Optional[str]]]], LinterStats, bool]],
+    files: list[AnyStr],
+    level: str,
+    is_any_file_checked: bool,
+    linter: PyLinter,
+    current_reporter: Union[BaseReporter, MultiReporter],
+    f_paths: list,
+) -> bool:
+    """Merge the results of checking the given files into current_reporter, taking them from the
+    results returned by submit_files_to_pool.
+
+    files must be the next files of those submitted whose results have not been merged yet.
+    Messages are merged (and printed) in the order of files, regardless of the order in which
+    the workers finish. Return whether any file has been checked, analogous to check_file.
+    """
+    if not files:
+        return is_any_file_checked
+
+    if not is_any_file_checked:
+        current_reporter.should_close_out = (
+            not linter.config.watch and current_reporter.should_close_out
+        )
+        # At this point, the only possible errors are those from parsing the config file
+        # so print them, if there are any.
+        if current_reporter.has_messages():
+            current_reporter.print_messages()
+
+    all_stats = [linter.stats]
+    # zip takes each file before its result, so no results of later files are taken
+    for file_py, (messages, stats, file_permission) in zip(files, results):
+        for path, msgs in messages.items():
+            # Messages for other paths (i.e., configuration files) are only reported once
+            if path != file_py and path in current_reporter.messages:
+                continue
+            current_reporter.messages[path].extend(messages_from_pairs(msgs))
+        all_stats.append(stats)
+        if file_permission:
+            f_paths.append(file_py)  # Appending paths for upload
+
+        current_reporter.current_file = file_py
+        current_reporter.print_messages(level)
+
+    linter.stats = merge_stats(all_stats)
+    return True
+
+
+def _get_worker_count(jobs: int) -> int:
+    """Return the number of worker processes used for the given jobs argument."""
+    return jobs or os.cpu_count() or 1
+
+
+def _init_worker(
+    local_config: Union[dict[str, Any], str],
+    load_default_config: bool,
+    autoformat: Optional[bool],
+    use_cache: bool,
+) -> None:
+    """Initialize a worker process: patch pylint and construct a linter for the configuration."""
+    _worker_config.update(
+        local_config=local_config,
+        load_default_config=load_default_config,
+        autoformat=autoformat,
+        use_cache=use_cache,
+    )
+    patch_pylint()
+    get_linter(config=local_config, load_default_config=load_default_config)
+
+
+def _check_files_in_worker(
+    files: list[AnyStr],
+) -> list[tuple[dict[str, list[tuple[Message, Optional[str]]]], LinterStats, bool]]:
+    """Check the given files in a worker process, returning the result of _check_file_in_worker
+    for each file.
+
+    The static type checks of the files whose configuration enables the mypy-batch option are
+    run together before the files are checked.
+    """
+    prefetch_type_checks(
+        files,
+        _worker_config["local_config"],
+        _worker_config["load_default_config"],
+        _worker_config["use_cache"],
+    )
+    return [_check_file_in_worker(file_py) for file_py in files]
+
+
+def _check_file_in_worker(
+    file_py: AnyStr,
+) -> tuple[dict[str, list[tuple[Message, Optional[str]]]], LinterStats, bool]:
+    """Check a single file in a worker process.
+
+    Return the messages reported for each path, the linter stats, and whether the file may be
+    uploaded. Messages are returned as (message, snippet) pairs rather than NewMessage objects,
+    since the astroid nodes of NewMessage objects are not sent back to the main process.
+    """
+    linter = get_linter(
+        config=_worker_config["local_config"],
+        file_linted=file_py,
+        load_default_config=_worker_config["load_default_config"],
+    )
+
+    if _worker_config["autoformat"]:
+        run_autoformat(file_py, linter.config.autoformat_options, linter.config.max_line_length)
+
+    lint_file(linter, file_py, _worker_config["use_cache"])
+
+    messages = {path: messages_to_pairs(msgs) for path, msgs in linter.reporter.messages.items()}
+    return messages, linter.stats, linter.config.pyta_file_permission
@@ -1,19 +1,36 @@
-"""Module to watch files for modifications and trigger PythonTA checks automatically."""
+"""Module to watch files for modifications and trigger PythonTA checks automatically.
 
+When a watched file is modified, only that file and the watched files that (directly or indirectly)
+import it are checked again. The linters and the astroid cache are kept between checks, except for
+the entries of the modules being checked again.
+"""
+
+import ast
 import logging
 import os
+import threading
 import time
-from typing import Any, Optional, Union
+from typing import Any, AnyStr, Optional, Union
 
+from astroid import MANAGER, modutils
 from pylint.lint import PyLinter
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from ..util.source import get_source_bundle
 from .helpers import check_file, upload_linter_results
 
+# Number of seconds to wait for further modifications before checking modified files, so that
+# a burst of modification events (e.g., from a single save in an editor) triggers a single check
+WATCH_DEBOUNCE_DELAY = 0.2
+
 
 class FileChangeHandler(FileSystemEventHandler):
-    """Internal class to handle file modifications."""
+    """Internal class to handle file modifications.
+
+    If debounce_delay is 0, modified files are checked immediately. Otherwise, they are checked
+    once no watched file has been modified for debounce_delay seconds.
+    """
 
     def __init__(
         self,
@@ -24,6 +41,7 @@ class FileChangeHandler(FileSystemEventHandler):
         autoformat: Optional[bool],
         level: str,
         f_paths: list[str],
+        debounce_delay: float = 0,
     ) -> None:
         self.files_to_watch = set(files_to_watch)
         self.linter = linter
@@ -32,32 +50,117 @@ class FileChangeHandler(FileSystemEventHandler):
         self.autoformat = autoformat
         self.level = level
         self.f_paths = f_paths
+        self.debounce_delay = debounce_delay
+        # Modified files waiting to be checked, in the order they were modified
+        self._pending_files: dict[str, None] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self._check_lock = threading.Lock()
+        # Module names and imported modules (with the modification time and size of the file
+        # they were computed from) of the watched files, used to find the dependents of a file
+        self._module_names: dict[str, str] = {}
+        self._imported_modules: dict[str, tuple[tuple[int, int], set[str]]] = {}
 
     def on_modified(self, event) -> None:
         """Trigger the callback when a watched file is modified."""
         if event.src_path not in self.files_to_watch:
             return
 
-        logging.info(f"File modified: {event.src_path}, re-running checks...")
+        if self.debounce_delay == 0:
+            self.check_modified_files([event.src_path])
+            return
+
+        with self._lock:
+            self._pending_files[event.src_path] = None
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_delay, self._check_pending_files)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _check_pending_files(self) -> None:
+        """Check the files modified since the last check."""
+        # Only one check runs at a time; files modified during a check are checked together next
+        with self._check_lock:
+            with self._lock:
+                modified_files = list(self._pending_files)
+                self._pending_files.clear()
+            if modified_files:
+                self.check_modified_files(modified_files)
+
+    def check_modified_files(self, modified_files: list[str]) -> None:
+        """Check the given modified files, and the watched files that depend on them."""
+        for file_py in modified_files:
+            logging.info(f"File modified: {file_py}, re-running checks...")
+        dependents = self._find_dependents(modified_files)
+        if dependents:
+            logging.info(f"Re-running checks on files that import them: {', '.join(dependents)}")
+
+        _invalidate_astroid_cache(modified_files + dependents)
 
         current_reporter = self.linter.reporter
-        if event.src_path in current_reporter.messages:
-            del current_reporter.messages[event.src_path]
-
-        _, self.linter = check_file(
-            file_py=event.src_path,
-            local_config=self.local_config,
-            load_default_config=self.load_default_config,
-            autoformat=self.autoformat,
-            is_any_file_checked=True,
-            current_reporter=current_reporter,
-            f_paths=[],
-        )
-        current_reporter = self.linter.reporter
-        current_reporter.print_messages(self.level)
-        self.linter.generate_reports()
+        for file_py in modified_files + dependents:
+            # Keep the file's position in the report
+            if file_py in current_reporter.messages:
+                current_reporter.messages[file_py] = []
+
+            check_file_kwargs = {}
+            if file_py in dependents:
+                # A dependent is unchanged, so its cached results may be out of date
+                check_file_kwargs["use_cache"] = False
+            _, self.linter = check_file(
+                file_py=file_py,
+                local_config=self.local_config,
+                load_default_config=self.load_default_config,
+                autoformat=self.autoformat,
+                is_any_file_checked=True,
+                current_reporter=current_reporter,
+                f_paths=[],
+                **check_file_kwargs,
+            )
+            current_reporter = self.linter.reporter
+            current_reporter.print_messages(self.level)
+
+        if not current_reporter.display_file_updates(modified_files + dependents):
+            self.linter.generate_reports()
         upload_linter_results(self.linter, current_reporter, self.f_paths, self.local_config)
 
+    def _find_dependents(self, modified_files: list[str]) -> list[str]:
+        """Return the watched files (other than modified_files) that import any of
+        modified_files, directly or through other watched files, sorted by path."""
+        dependents = set()
+        to_visit = list(modified_files)
+        while to_visit:
+            module_name = self._get_module_name(to_visit.pop())
+            for file_py in self.files_to_watch:
+                if file_py in dependents or file_py in modified_files:
+                    continue
+                if module_name in self._get_imported_modules(file_py):
+                    dependents.add(file_py)
+                    to_visit.append(file_py)
+        return sorted(dependents)
+
+    def _get_module_name(self, file_py: str) -> str:
+        """Return the name of the module defined by file_py."""
+        if file_py not in self._module_names:
+            self._module_names[file_py] = _get_module_name(file_py)
+        return self._module_names[file_py]
+
+    def _get_imported_modules(self, file_py: str) -> set[str]:
+        """Return the names of the modules that file_py may import, which are only computed
+        again when file_py is modified."""
+        try:
+            stat = os.stat(file_py)
+        except OSError:
+            return set()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        if file_py not in self._imported_modules or self._imported_modules[file_py][0] != signature:
+            self._imported_modules[file_py] = (
+                signature,
+                _get_imported_modules(file_py, self._get_module_name(file_py)),
+            )
+        return self._imported_modules[file_py][1]
+
 
 def watch_files(
     file_paths: set,
@@ -78,6 +181,7 @@ def watch_files(
         autoformat=autoformat,
         level=level,
         f_paths=f_paths,
+        debounce_delay=WATCH_DEBOUNCE_DELAY,
     )
     observer = Observer()
     for directory in directories_to_watch:
@@ -94,3 +198,50 @@ def watch_files(
         observer.stop()
 
     observer.join()
+
+
+def _get_module_name(file_py: AnyStr) -> str:
+    """Return the name of the module defined by file_py."""
+    try:
+        modpath = modutils.modpath_from_file(file_py)
+    except ImportError:
+        return os.path.splitext(os.path.basename(file_py))[0]
+    if modpath[-1] == "__init__":
+        modpath = modpath[:-1]
+    return ".".join(modpath)
+
+
+def _get_imported_modules(file_py: AnyStr, module_name: str) -> set[str]:
+    """Return the names of the modules that file_py, defining the module module_name, may import.
+
+    For "from x import y", both x and x.y are included, since y may be a submodule.
+    Return an empty set if file_py cannot be read or parsed.
+    """
+    try:
+        tree = ast.parse(get_source_bundle(file_py).data)
+    except (OSError, SyntaxError, ValueError):
+        return set()
+
+    package = module_name.split(".")
+    if os.path.basename(file_py) != "__init__.py":
+        package = package[:-1]
+    imported_modules = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported_modules.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = package[: len(package) - node.level + 1] if node.level > 0 else []
+            if node.module is not None:
+                base = base + node.module.split(".")
+            if base:
+                imported_modules.add(".".join(base))
+            imported_modules.update(".".join(base + [alias.name]) for alias in node.names)
+    return imported_modules
+
+
+def _invalidate_astroid_cache(paths: list[str]) -> None:
+    """Remove the modules defined by the given files from the astroid cache."""
+    abs_paths = {os.path.abspath(path) for path in paths}
+    for module_name, module in list(MANAGER.astroid_cache.items()):
+        if module.file is not None and os.path.abspath(module.file) in abs_paths:
+            del MANAGER.astroid_cache[module_name]
@@ -4,15 +4,20 @@ Check for redundant/impossible If or While conditions in functions based on z3 c
 
 from __future__ import annotations
 
+import logging
 from typing import TYPE_CHECKING, Any, Union
 
 from pylint.checkers import BaseChecker
 from pylint.checkers.utils import only_required_for_messages
 
+from ..cfg.graph import Z3_FUNCTION_TIMEOUT, Z3_MAX_PATHS, Z3_TIMEOUT
+
 if TYPE_CHECKING:
     from astroid import nodes
     from pylint.lint import PyLinter
 
+    from ..cfg.graph import ControlFlowGraph
+
     try:
         from z3 import ExprRef
 
@@ -44,6 +49,46 @@ class ConditionLogicChecker(BaseChecker):
                 "help": "Use Z3 to perform logical feasibility analysis in program control flow.",
             },
         ),
+        (
+            "z3-max-paths",
+            {
+                "default": Z3_MAX_PATHS,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Maximum number of paths in a function to analyse separately with Z3. "
+                "Functions with more paths are analysed faster but less precisely. "
+                "Set to 0 for no maximum.",
+            },
+        ),
+        (
+            "z3-timeout",
+            {
+                "default": Z3_TIMEOUT,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Maximum time in milliseconds for each Z3 check. Conditions that cannot be "
+                "checked in time are assumed to be possible. Set to 0 for no maximum.",
+            },
+        ),
+        (
+            "z3-function-timeout",
+            {
+                "default": Z3_FUNCTION_TIMEOUT,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Maximum time in milliseconds for all Z3 checks of a function. Set to 0 for "
+                "no maximum.",
+            },
+        ),
+        (
+            "z3-max-memory",
+            {
+                "default": 0,
+                "type": "int",
+                "metavar": "<int>",
+                "help": "Maximum memory in megabytes for each Z3 check. Set to 0 for no maximum.",
+            },
+        ),
     )
 
     @only_required_for_messages("redundant-condition", "impossible-condition")
@@ -77,32 +122,57 @@ class ConditionLogicChecker(BaseChecker):
             return
 
         node_block = node.cfg_block
+        cfg = node.frame().cfg
 
         # create node condition z3 constraint
         condition_node = node.test
-        env = Z3Environment(node.frame().cfg.z3_vars, [])
+        env = Z3Environment(cfg.z3_vars, [])
         z3_condition = env.parse_constraint(condition_node)
 
         if z3_condition is None:
             return
 
         if all(
-            self._check_unsat(z3.And(*constraints), z3.Not(z3_condition))
+            self._check_unsat(cfg, z3.And(*constraints), z3.Not(z3_condition))
             for edge in (pred for pred in node_block.predecessors if pred.is_feasible)
             for constraints in edge.z3_constraints.values()
         ):
             self.add_message("redundant-condition", node=node.test)
 
         if all(
-            self._check_unsat(z3.And(*constraints), z3_condition)
+            self._check_unsat(cfg, z3.And(*constraints), z3_condition)
             for edge in (pred for pred in node_block.predecessors if pred.is_feasible)
             for constraints in edge.z3_constraints.values()
         ):
             self.add_message("impossible-condition", node=node.test)
 
-    def _check_unsat(self, prev_constraints: ExprRef, node_constraint: ExprRef) -> bool:
-        """Check if the conjunction of the given constraints is unsatisfiable.
+    def leave_functiondef(self, node: nodes.FunctionDef) -> None:
+        """Log the number of Z3 checks of the function that exceeded the Z3 limits"""
+        self._log_skipped_checks(node)
+
+    def leave_module(self, node: nodes.Module) -> None:
+        """Log the number of Z3 checks of the module body that exceeded the Z3 limits"""
+        self._log_skipped_checks(node)
+
+    def _log_skipped_checks(self, node: Union[nodes.FunctionDef, nodes.Module]) -> None:
+        """Log the number of Z3 checks of the given function or module that were skipped or
+        inconclusive because they exceeded the Z3 limits."""
+        if not self.linter.config.z3 or not hasattr(node, "cfg"):
+            return
+
+        if node.cfg.z3_skipped_checks > 0:
+            logging.warning(
+                f"Z3 skipped {node.cfg.z3_skipped_checks} check(s) in {node.name} that exceeded "
+                "the z3-timeout, z3-function-timeout or z3-max-memory limits"
+            )
+
+    def _check_unsat(
+        self, cfg: ControlFlowGraph, prev_constraints: ExprRef, node_constraint: ExprRef
+    ) -> bool:
+        """Check if the conjunction of the given constraints is unsatisfiable, within the Z3
+        limits of the given control flow graph.
 
+        - cfg (ControlFlowGraph): The control flow graph containing the current node.
         - prev_constraints (z3.ExprRef): Constraints from previous nodes.
         - node_constraint (z3.ExprRef): The condition to check at the current node.
         """
@@ -111,7 +181,7 @@ class ConditionLogicChecker(BaseChecker):
 
         solver = z3.Solver()
         solver.add(z3.And(prev_constraints, node_constraint))
-        return solver.check() == z3.unsat
+        return cfg.check_z3_unsat(solver)
 
 
 def register(linter: PyLinter) -> None:
@@ -7,6 +7,8 @@ from typing import TYPE_CHECKING
 import pycodestyle
 from pylint.checkers import BaseRawFileChecker
 
+from python_ta.util.source import get_source_bundle
+
 if TYPE_CHECKING:
     from astroid import nodes
     from pylint.lint import PyLinter
@@ -38,7 +40,16 @@ class PycodestyleChecker(BaseRawFileChecker):
             reporter=JSONReport,
             ignore=self.linter.config.pycodestyle_ignore,
         )
-        report = style_guide.check_files()
+        try:
+            lines = get_source_bundle(node.file).lines
+        except (OSError, LookupError, SyntaxError, UnicodeError):
+            # Let pycodestyle read the file itself, falling back to its own decoding
+            report = style_guide.check_files()
+        else:
+            report = style_guide.options.report
+            report.start()
+            style_guide.input_file(node.file, lines=lines)
+            report.stop()
 
         for line_num, msg, code in report.get_file_results():
             self.add_message("pep8-errors", line=line_num, args=(code, msg))
@@ -1,10 +1,20 @@
+import logging
+import os
 import re
+from typing import Optional
 
 from astroid import nodes
 from mypy import api
 from pylint.checkers import BaseRawFileChecker
 from pylint.lint import PyLinter
 
+from python_ta.util.files import get_mtime
+
+# Mypy output of files that were checked together by run_mypy_batch, but not yet processed by
+# StaticTypeChecker.process_module. Maps (absolute file path, mypy arguments) to the modification
+# time of the file when mypy was run, and the lines of mypy output for the file.
+_MYPY_BATCH_RESULTS: dict[tuple[str, tuple[str, ...]], tuple[Optional[float], list[str]]] = {}
+
 
 class StaticTypeChecker(BaseRawFileChecker):
     """Checker for static type checking using Mypy."""
@@ -52,6 +62,15 @@ class StaticTypeChecker(BaseRawFileChecker):
                 "help": "List of configuration flags for mypy",
             },
         ),
+        (
+            "mypy-batch",
+            {
+                "default": False,
+                "type": "yn",
+                "metavar": "<yn>",
+                "help": "Run mypy once over all checked files instead of once per file",
+            },
+        ),
     )
 
     COMMON_PATTERN = (
@@ -81,16 +100,24 @@ class StaticTypeChecker(BaseRawFileChecker):
     }
 
     def process_module(self, node: nodes.Module) -> None:
-        """Run Mypy on the current file and handle type errors."""
-        filename = node.file
+        """Run Mypy on the current file and handle type errors.
 
-        mypy_options = ["--show-error-end"]
-        for arg in self.linter.config.mypy_options:
-            mypy_options.append("--" + arg)
+        If the file was checked by run_mypy_batch with the same options (and has not been modified
+        since), its output from that batch is used instead of running mypy again.
+        """
+        filename = node.file
+        mypy_options = get_mypy_args(self.linter.config.mypy_options)
 
-        result, _, _ = api.run([filename] + mypy_options)
+        batch_result = _MYPY_BATCH_RESULTS.pop(
+            (os.path.abspath(filename), tuple(mypy_options)), None
+        )
+        if batch_result is not None and batch_result[0] == get_mtime(filename):
+            lines = batch_result[1]
+        else:
+            result, _, _ = api.run([filename] + mypy_options)
+            lines = result.splitlines()
 
-        for line in result.splitlines():
+        for line in lines:
             common_match = re.match(self.COMMON_PATTERN, line)
             if not common_match:
                 continue
@@ -128,6 +155,41 @@ class StaticTypeChecker(BaseRawFileChecker):
         )
 
 
+def get_mypy_args(mypy_options: list[str]) -> list[str]:
+    """Return the command-line arguments for mypy corresponding to the mypy-options option."""
+    return ["--show-error-end"] + ["--" + arg for arg in mypy_options]
+
+
+def run_mypy_batch(filenames: list[str], mypy_options: list[str]) -> None:
+    """Run mypy once over all of the given files, storing the output for each file to be used by
+    StaticTypeChecker.process_module.
+
+    mypy_options is the value of the mypy-options option. If mypy cannot check the files together
+    (e.g., because two of them have the same module name), nothing is stored, and each file is
+    checked separately by process_module.
+    """
+    if not filenames:
+        return
+
+    mypy_args = get_mypy_args(mypy_options)
+    result, _, exit_status = api.run(list(filenames) + mypy_args)
+    # Exit status 2 indicates that mypy could not check the files
+    if exit_status not in {0, 1}:
+        logging.debug(f"Could not run mypy over all files together: {result}")
+        return
+
+    lines_by_file = {os.path.abspath(filename): [] for filename in filenames}
+    for line in result.splitlines():
+        common_match = re.match(StaticTypeChecker.COMMON_PATTERN, line)
+        if common_match:
+            file_lines = lines_by_file.get(os.path.abspath(common_match.group("file")))
+            if file_lines is not None:
+                file_lines.append(line)
+
+    for path, lines in lines_by_file.items():
+        _MYPY_BATCH_RESULTS[(path, tuple(mypy_args))] = (get_mtime(path), lines)
+
+
 def register(linter: PyLinter) -> None:
     """Register the static type checker with the PyLinter."""
     linter.register_checker(StaticTypeChecker(linter))
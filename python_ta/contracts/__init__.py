@@ -4,6 +4,10 @@ Representation invariants, preconditions, and postconditions are parsed, compile
 Below are some notes on how they are stored.
     - Representation invariants are stored in a class attribute __representation_invariants__
     as a list [(assertion, compiled)].
+    - The instance attributes each representation invariant depends on are stored in a class
+    attribute __invariant_dependencies__ as a list [dependencies] (in the same order as
+    __representation_invariants__), where dependencies is a frozenset of attribute names, or None if
+    the representation invariant may depend on any attribute.
     - Preconditions are stored in an attribute __preconditions__ of the function as a list
     [(assertion, compiled)].
     - Postconditions are stored in an attribute __postconditions__ of the function as a list
@@ -12,15 +16,29 @@ Below are some notes on how they are stored.
 
 from __future__ import annotations
 
+import ast
+import atexit
+import collections
+import contextlib
 import inspect
+import itertools
+import json
 import logging
+import random
 import sys
+import threading
+import time
+import types
 import typing
-from types import CodeType, FunctionType, ModuleType
+import weakref
+from inspect import isclass
+from types import CodeType, FrameType, FunctionType, ModuleType
 from typing import (
     Any,
     Callable,
+    Iterable,
     Optional,
+    TextIO,
     TypeVar,
     Union,
     get_args,
@@ -29,7 +47,11 @@ from typing import (
 )
 
 import wrapt
-from typeguard import CollectionCheckStrategy, TypeCheckError, check_type
+
+from ..util.lazy import lazy_import
+
+# typeguard takes a long time to import, and is only needed to check some type annotations
+typeguard = lazy_import("typeguard")
 
 # Configuration options
 
@@ -54,17 +76,140 @@ STRICT_NUMERIC_TYPES = True
 Set to False to allow more specific numeric types to be accepted by more general type annotations.
 """
 
+PROFILE_CONTRACTS = False
+"""
+Set to True to record the time spent checking contracts for each function (see
+print_contract_profile).
+"""
+
+ADAPTIVE_CONTRACT_CHECKING = False
+"""
+Set to True to check the contracts of a function less often once they have been satisfied
+ADAPTIVE_CHECK_THRESHOLD times for arguments of the same type shapes: from then on, the contracts are
+only checked on one in every ADAPTIVE_CHECK_SAMPLE_RATE calls with arguments of these type shapes.
+The type shape of an argument is its type, together with the type shapes of the first element of a
+list, set or frozenset, of the elements of a tuple, and of the first key and value of a dict (up to
+two levels of nesting). All calls are checked again after a contract violation.
+"""
+
+ADAPTIVE_CHECK_THRESHOLD = 1000
+"""
+The number of times the contracts of a function must be satisfied for arguments of the same types
+before they are checked less often, when ADAPTIVE_CONTRACT_CHECKING is True.
+"""
+
+ADAPTIVE_CHECK_SAMPLE_RATE = 100
+"""
+When ADAPTIVE_CONTRACT_CHECKING is True, the contracts of a function that are checked less often are
+checked on one in every ADAPTIVE_CHECK_SAMPLE_RATE calls.
+"""
+
+COLLECTION_CHECK_STRATEGY = "all"
+"""
+Set to choose which items of a collection (list, set, dict or variable-length tuple) are checked
+against the collection's type annotation:
+
+    - "all": check every item
+    - "first": check the first COLLECTION_CHECK_SIZE items of each collection
+    - "sample": check a random sample of COLLECTION_CHECK_SIZE items of each collection
+    - "budget": check items in order until COLLECTION_CHECK_SIZE items have been checked in total
+      for the argument or return value being checked
+
+Type annotations of class attributes are checked by typeguard, which checks only the first item of
+each collection with any strategy other than "all".
+"""
+
+COLLECTION_CHECK_SIZE = 100
+"""
+The number of items checked by the "first", "sample" and "budget" collection check strategies.
+"""
+
+_COLLECTION_CHECK_STRATEGIES = ("all", "first", "sample", "budget")
+
 _PYDEV_UMD_NAME = "pydev_umd"
 
 
 _DEFAULT_MAX_VALUE_LENGTH = 30
 FUNCTION_RETURN_VALUE = "$return_value"
 
+# Types for which check_type_strict first compares the type of a value to the expected type, leaving
+# values of subclasses (and the error messages) to _check_inner_type
+_EXACT_TYPES = {int, float, complex, bool, str, bytes, type(None)}
+_UNION_TYPES = {typing.Union, getattr(types, "UnionType", typing.Union)}
+
+# The number of levels of nested containers described by _type_shape, and the maximum number of
+# elements of a tuple it describes (see ADAPTIVE_CONTRACT_CHECKING)
+_TYPE_SHAPE_DEPTH = 2
+_TYPE_SHAPE_MAX_TUPLE_SIZE = 8
+# The types of the containers whose elements are described by _type_shape
+_SHAPED_TYPES = {list, tuple, set, frozenset, dict}
+
+# The kinds of contract checks recorded when PROFILE_CONTRACTS is True, with their descriptions
+_PROFILE_CATEGORIES = {
+    "parameter_types": "Parameter types",
+    "preconditions": "Preconditions",
+    "return_type": "Return type",
+    "postconditions": "Postconditions",
+    "attribute_types": "Attribute types",
+    "representation_invariants": "Invariants",
+}
+
+# The contract checking profile recorded when PROFILE_CONTRACTS is True, as a dictionary mapping
+# the full name of each function to a dictionary mapping "calls" to its number of calls and each
+# kind of contract check in _PROFILE_CATEGORIES to a list [number of checks, total time in seconds]
+_CONTRACT_PROFILE: dict[str, dict[str, Any]] = {}
+
+# The arguments of print_contract_profile when the program exits, set by the first call to
+# enable_contract_profiling (None before then), which registers _print_contract_profile_at_exit
+_PROFILE_AT_EXIT_ARGS: Optional[tuple[str, Optional[TextIO]]] = None
+
+# The resolved type hints of contract-checked classes, computed by _get_class_annotations
+_CLASS_ANNOTATIONS: weakref.WeakKeyDictionary[type, dict[str, Any]] = weakref.WeakKeyDictionary()
+
+
+class _ThreadState(threading.local):
+    """The state of contract checking that is specific to each thread.
+
+    Instance attributes:
+        - method_calls: the receivers of the calls to the instance methods of contract-checked
+          classes that have not returned in this thread, in the order they were called, with the
+          code object of each method
+        - deferred_instances: the instances of contract-checked classes whose attribute types and
+          representation invariants are checked at the end of the deferred_invariants block
+          running in this thread (None outside such blocks), keyed by the id of the instance and
+          the class whose contracts are checked
+        - initializing_instances: the number of calls to the __init__ method of each instance
+          (keyed by id) that have not returned in this thread
+    """
+
+    method_calls: list[tuple[Any, Optional[CodeType]]]
+    deferred_instances: Optional[dict[tuple[int, type], Any]]
+    initializing_instances: dict[int, int]
+
+    def __init__(self) -> None:
+        self.method_calls = []
+        self.deferred_instances = None
+        self.initializing_instances = {}
+
+
+_THREAD_STATE = _ThreadState()
+
+# The classes whose __init__ method is wrapped by _track_initialization, because it is defined or
+# inherited from a class whose contracts are not checked (see _track_untracked_initialization)
+_TRACKED_INIT_CLASSES: weakref.WeakSet[type] = weakref.WeakSet()
+
+# Fast type checks computed by _get_fast_type_check, keyed by type annotation
+_FAST_TYPE_CHECKS: dict[Any, tuple[Optional[frozenset[type]], Optional[Callable[[Any], bool]]]] = {}
+
 
 class PyTAContractError(Exception):
     """Error raised when a PyTA contract assertion is violated."""
 
 
+class _ItemTypeError(TypeError):
+    """Error raised when an item of a collection does not match the collection's type annotation."""
+
+
 def check_all_contracts(*mod_names: str, decorate_main: bool = True) -> None:
     """Automatically check contracts for all functions and classes in the given modules.
 
@@ -119,22 +264,46 @@ Class = TypeVar("Class", bound=type)
 
 @overload
 def check_contracts(
-    func: FunctionType, module_names: Optional[set[str]] = None
+    func: FunctionType,
+    module_names: Optional[set[str]] = None,
+    collection_check_strategy: Optional[str] = None,
+    collection_check_size: Optional[int] = None,
 ) -> FunctionType: ...
 
 
 @overload
-def check_contracts(func: Class, module_names: Optional[set[str]] = None) -> Class: ...
+def check_contracts(
+    func: Class,
+    module_names: Optional[set[str]] = None,
+    collection_check_strategy: Optional[str] = None,
+    collection_check_size: Optional[int] = None,
+) -> Class: ...
+
+
+@overload
+def check_contracts(
+    func: None = None,
+    module_names: Optional[set[str]] = None,
+    collection_check_strategy: Optional[str] = None,
+    collection_check_size: Optional[int] = None,
+) -> Callable[[Union[Class, FunctionType]], Union[Class, FunctionType]]: ...
 
 
 def check_contracts(
-    func_or_class: Union[Class, FunctionType], module_names: Optional[set[str]] = None
-) -> Union[Class, FunctionType]:
+    func_or_class: Union[Class, FunctionType, None] = None,
+    module_names: Optional[set[str]] = None,
+    collection_check_strategy: Optional[str] = None,
+    collection_check_size: Optional[int] = None,
+) -> Union[Class, FunctionType, Callable[[Union[Class, FunctionType]], Union[Class, FunctionType]]]:
     """A decorator to enable contract checking for a function or class.
 
     When used with a class, all methods defined within the class have contract checking enabled.
     If module_names is not None, only functions or classes defined in a module whose name is in module_names are checked.
 
+    collection_check_strategy and collection_check_size override COLLECTION_CHECK_STRATEGY and
+    COLLECTION_CHECK_SIZE for this function or class. When either is given, check_contracts must be
+    called with them to create the decorator, e.g. ``@check_contracts(collection_check_strategy="sample")``.
+
     Example:
 
         >>> from python_ta.contracts import check_contracts
@@ -147,12 +316,33 @@ def check_contracts(
         ...     \"\"\"
         ...     return x // y
     """
+    if collection_check_strategy is not None and (
+        collection_check_strategy not in _COLLECTION_CHECK_STRATEGIES
+    ):
+        raise ValueError(
+            f"collection_check_strategy must be one of {_COLLECTION_CHECK_STRATEGIES}, "
+            f"got {collection_check_strategy!r}"
+        )
+
+    if func_or_class is None:
+        return lambda func_or_class: check_contracts(
+            func_or_class,
+            module_names=module_names,
+            collection_check_strategy=collection_check_strategy,
+            collection_check_size=collection_check_size,
+        )
+
     if not ENABLE_CONTRACT_CHECKING:
         return func_or_class
 
+    if collection_check_strategy is not None or collection_check_size is not None:
+        _set_collection_check(func_or_class, (collection_check_strategy, collection_check_size))
+
     if module_names is not None and func_or_class.__module__ not in module_names:
         _debug(
-            f"Warning: skipping contract check for {func_or_class.__name__} defined in {func_or_class.__module__} because module is not included as an argument."
+            "Warning: skipping contract check for %s defined in %s because module is not included as an argument.",
+            func_or_class.__name__,
+            func_or_class.__module__,
         )
         return func_or_class
     elif inspect.isroutine(func_or_class):
@@ -165,6 +355,22 @@ def check_contracts(
         return func_or_class
 
 
+def _set_collection_check(
+    func_or_class: Any, collection_check: tuple[Optional[str], Optional[int]]
+) -> None:
+    """Store the collection check strategy and size for the given function, or for the given class
+    and its methods, in a __collection_check__ attribute."""
+    if inspect.isclass(func_or_class):
+        func_or_class.__collection_check__ = collection_check
+        for value in func_or_class.__dict__.values():
+            if inspect.isroutine(value):
+                _set_collection_check(value, collection_check)
+    else:
+        target = inspect.unwrap(getattr(func_or_class, "__func__", func_or_class))
+        if hasattr(target, "__dict__"):
+            target.__collection_check__ = collection_check
+
+
 def add_class_invariants(klass: type) -> None:
     """Modify the given class to check representation invariants and method contracts."""
     if not ENABLE_CONTRACT_CHECKING or "__representation_invariants__" in klass.__dict__:
@@ -174,7 +380,7 @@ def add_class_invariants(klass: type) -> None:
     _set_invariants(klass)
 
     klass_mod = _get_module(klass)
-    cls_annotations = None  # This is a cached value set the first time new_setattr is called
+    setattr_name = f"{klass.__module__}.{klass.__qualname__}.__setattr__"
 
     def new_setattr(self: klass, name: str, value: Any) -> None:
         """Set the value of the given attribute on self to the given value.
@@ -185,44 +391,54 @@ def add_class_invariants(klass: type) -> None:
             super(klass, self).__setattr__(name, value)
             return
 
-        nonlocal cls_annotations
-        if cls_annotations is None:
-            cls_annotations = typing.get_type_hints(klass, localns=klass_mod.__dict__)
+        cls_annotations = _get_class_annotations(klass)
 
+        profile_start = None
+        if PROFILE_CONTRACTS:
+            _get_function_profile(setattr_name)["calls"] += 1
+            profile_start = time.perf_counter()
         if name in cls_annotations:
             try:
-                _debug(f"Checking type of attribute {attr} for {klass.__qualname__} instance")
-                check_type(
-                    value,
-                    cls_annotations[name],
-                    collection_check_strategy=CollectionCheckStrategy.ALL_ITEMS,
-                )
-            except TypeCheckError:
+                _debug("Checking type of attribute %s for %s instance", name, klass.__qualname__)
+                _check_attribute_type(klass, value, cls_annotations[name])
+            except typeguard.TypeCheckError:
                 raise AssertionError(
                     f"Value {_display_value(value)} for attribute {name} did not match expected type "
                     f"{_display_annotation(cls_annotations[name])}"
                 ) from None
-        original_attr_value_exists = False
-        original_attr_value = None
-        if hasattr(self, name):
-            original_attr_value_exists = True
-            original_attr_value = super(klass, self).__getattribute__(name)
+        if profile_start is not None:
+            _record_profile(setattr_name, "attribute_types", profile_start)
+        caller_self = _get_caller_self(sys._getframe(1))
+        # Only validating if the attribute is not being set in a instance/class method
+        # AND caller_self is an instance of self's type
+        check_invariants = not isinstance(caller_self, type(self)) and klass_mod is not None
+        deferred_instances = _THREAD_STATE.deferred_instances
+        if check_invariants and deferred_instances is not None:
+            super(klass, self).__setattr__(name, value)
+            deferred_instances[(id(self), klass)] = self
+            return
+        if check_invariants:
+            try:
+                original_attr_value = super(klass, self).__getattribute__(name)
+                original_attr_value_exists = True
+            except AttributeError:
+                original_attr_value = None
+                original_attr_value_exists = False
         super(klass, self).__setattr__(name, value)
-        frame_locals = inspect.currentframe().f_back.f_locals
-        caller_self = frame_locals.get("self")
-        if not isinstance(caller_self, type(self)):
-            # Only validating if the attribute is not being set in a instance/class method
-            # AND caller_self is an instance of self's type
-            if klass_mod is not None:
-                try:
-                    _check_invariants(self, klass, klass_mod.__dict__)
-                except PyTAContractError as e:
-                    if original_attr_value_exists:
-                        super(klass, self).__setattr__(name, original_attr_value)
-                    else:
-                        super(klass, self).__delattr__(name)
-                    raise AssertionError(str(e)) from None
-        elif caller_self is not self:
+        if check_invariants:
+            if profile_start is not None:
+                profile_start = time.perf_counter()
+            try:
+                _check_invariants(self, klass, klass_mod.__dict__, changed_attr=name)
+            except PyTAContractError as e:
+                if original_attr_value_exists:
+                    super(klass, self).__setattr__(name, original_attr_value)
+                else:
+                    super(klass, self).__delattr__(name)
+                raise AssertionError(str(e)) from None
+            if profile_start is not None:
+                _record_profile(setattr_name, "representation_invariants", profile_start)
+        elif isinstance(caller_self, type(self)) and caller_self is not self:
             # Keep track of mutations to instances that are of the same type as caller_self (and are also not `self`)
             # to enforce RIs on them only after the caller function returns.
             caller_klass = type(caller_self)
@@ -231,6 +447,12 @@ def add_class_invariants(klass: type) -> None:
                 if self not in mutated_instances:
                     mutated_instances.append(self)
 
+    if klass in _TRACKED_INIT_CLASSES:
+        # The __init__ method of klass was wrapped when klass was created as a subclass of a
+        # contract-checked class; its calls are now tracked by _instance_method_wrapper
+        _TRACKED_INIT_CLASSES.discard(klass)
+        klass.__init__ = klass.__dict__["__init__"].__wrapped__
+
     for attr, value in klass.__dict__.items():
         if inspect.isroutine(value):
             if isinstance(value, (staticmethod, classmethod)):
@@ -239,29 +461,247 @@ def add_class_invariants(klass: type) -> None:
             else:
                 setattr(klass, attr, _instance_method_wrapper(value, klass))
 
+    _track_untracked_initialization(klass)
+    _track_subclass_initialization(klass)
+
     klass.__setattr__ = new_setattr
 
 
+def _track_untracked_initialization(klass: type) -> None:
+    """Wrap the __init__ method of klass with _track_initialization if it is defined in a class
+    whose contracts are not checked, so that the methods it calls do not check the contracts of the
+    instance being initialized."""
+    if not inspect.isfunction(klass.__init__):
+        return
+    init_klass = next(cls for cls in klass.__mro__ if "__init__" in cls.__dict__)
+    if (
+        "__representation_invariants__" not in init_klass.__dict__
+        and init_klass not in _TRACKED_INIT_CLASSES
+    ):
+        klass.__init__ = _track_initialization(klass.__init__)
+        _TRACKED_INIT_CLASSES.add(klass)
+
+
+def _track_subclass_initialization(klass: type) -> None:
+    """Track the initialization of the instances of the subclasses of klass whose contracts are not
+    checked, both existing and created later (see _track_untracked_initialization)."""
+    init_subclass = klass.__dict__.get("__init_subclass__")
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        if init_subclass is None:
+            super(klass, cls).__init_subclass__(**kwargs)
+        else:
+            init_subclass.__get__(None, cls)(**kwargs)
+        _track_untracked_initialization(cls)
+
+    klass.__init_subclass__ = classmethod(__init_subclass__)
+
+    subclasses = type.__subclasses__(klass)
+    while subclasses:
+        subclass = subclasses.pop()
+        _track_untracked_initialization(subclass)
+        subclasses.extend(type.__subclasses__(subclass))
+
+
+class _ContractPlan:
+    """The information needed to check the contracts of a function, computed on its first call.
+
+    Instance attributes:
+        - name: the full name of the function, used in contract checking profiles
+        - params: the names of the function's positional parameters, in order
+        - annotations: the function's resolved type hints, keyed by the class of the instance the
+          function is called on (or None, if it is not called on an instance)
+        - preconditions: the function's compiled preconditions, as in __preconditions__
+        - postconditions: the function's compiled postconditions, as in __postconditions__
+        - collection_check: the collection check strategy and size given to check_contracts for
+          the function, as in __collection_check__ (each is None if not given)
+        - passes: the number of times the function's contracts were satisfied for each tuple of
+          argument type shapes (see _type_shape), since the last contract violation (see ADAPTIVE_CONTRACT_CHECKING)
+        - unchecked_calls: the number of calls whose contracts were not checked since the last
+          call whose contracts were checked less often
+    """
+
+    __slots__ = (
+        "name",
+        "params",
+        "annotations",
+        "preconditions",
+        "postconditions",
+        "collection_check",
+        "passes",
+        "unchecked_calls",
+    )
+
+    name: str
+
+    params: tuple[str, ...]
+    annotations: dict[Optional[type], dict[str, Any]]
+    preconditions: list[tuple[str, CodeType]]
+    postconditions: list[tuple[str, CodeType, str]]
+    collection_check: tuple[Optional[str], Optional[int]]
+    passes: dict[tuple, int]
+    unchecked_calls: int
+
+    def __init__(self, wrapped: Callable, target: Callable) -> None:
+        self.name = f"{wrapped.__module__}.{wrapped.__qualname__}"
+        self.params = wrapped.__code__.co_varnames[: wrapped.__code__.co_argcount]
+        self.annotations = {}
+        self.collection_check = getattr(target, "__collection_check__", (None, None))
+        self.passes = {}
+        self.unchecked_calls = 0
+
+        if not hasattr(target, "__preconditions__"):
+            target.__preconditions__ = []
+            preconditions = parse_assertions(wrapped)
+            for precondition in preconditions:
+                try:
+                    compiled = compile(precondition, "<string>", "eval")
+                except:
+                    _debug(
+                        "Warning: precondition %s could not be parsed as a valid Python expression",
+                        precondition,
+                    )
+                    continue
+                target.__preconditions__.append((precondition, compiled))
+        self.preconditions = target.__preconditions__
+
+        if not hasattr(target, "__postconditions__"):
+            target.__postconditions__ = []
+            return_val_var_name = _get_legal_return_val_var_name(
+                {**wrapped.__globals__, **dict.fromkeys(self.params)}
+            )
+            postconditions = parse_assertions(wrapped, parse_token="Postcondition")
+            for postcondition in postconditions:
+                assertion = _replace_return_val_assertion(postcondition, return_val_var_name)
+                try:
+                    compiled = compile(assertion, "<string>", "eval")
+                except:
+                    _debug(
+                        "Warning: postcondition %s could not be parsed as a valid Python expression",
+                        postcondition,
+                    )
+                    continue
+                target.__postconditions__.append((postcondition, compiled, return_val_var_name))
+        self.postconditions = target.__postconditions__
+
+    def get_annotations(self, wrapped: Callable, instance: Any) -> dict[str, Any]:
+        """Return the type hints of wrapped when it is called on instance (or None), which are
+        only resolved on the first such call for each class of instance."""
+        klass = None if instance is None else type(instance)
+        if klass not in self.annotations:
+            if klass is not None:
+                klass_mod = _get_module(klass)
+                self.annotations[klass] = typing.get_type_hints(
+                    wrapped, globalns=klass_mod.__dict__
+                )
+            else:
+                self.annotations[klass] = typing.get_type_hints(wrapped)
+        return self.annotations[klass]
+
+
+def _get_contract_plan(wrapped: Callable) -> _ContractPlan:
+    """Return the contract plan of wrapped, creating it if it has not been created yet."""
+    # Check bounded function
+    if hasattr(wrapped, "__self__"):
+        target = wrapped.__func__
+    else:
+        target = wrapped
+
+    plan = getattr(target, "__contract_plan__", None)
+    if plan is None:
+        plan = _ContractPlan(wrapped, target)
+        target.__contract_plan__ = plan
+    return plan
+
+
+def clear_contract_plans(func_or_class: Any) -> None:
+    """Discard the type annotations and contracts stored for the given function, or for the given
+    class (its attribute type annotations) and its methods, when they were first checked.
+
+    They are computed again the next time the function or method is called. Call this function
+    after changing a function's type annotations or docstring, or redefining a type that one of its
+    type annotations refers to by name.
+    """
+    if inspect.isclass(func_or_class):
+        _CLASS_ANNOTATIONS.pop(func_or_class, None)
+        for value in func_or_class.__dict__.values():
+            if inspect.isroutine(value):
+                clear_contract_plans(value)
+        return
+
+    target = inspect.unwrap(getattr(func_or_class, "__func__", func_or_class))
+    for attr in ("__contract_plan__", "__preconditions__", "__postconditions__"):
+        if attr in getattr(target, "__dict__", {}):
+            delattr(target, attr)
+
+
 def _check_function_contracts(wrapped, instance, args, kwargs):
-    params = wrapped.__code__.co_varnames[: wrapped.__code__.co_argcount]
-    if instance is not None:
-        klass_mod = _get_module(type(instance))
-        annotations = typing.get_type_hints(wrapped, globalns=klass_mod.__dict__)
+    plan = _get_contract_plan(wrapped)
+    if not ADAPTIVE_CONTRACT_CHECKING:
+        return _check_planned_contracts(plan, wrapped, instance, args, kwargs)
+
+    arg_types = (
+        tuple(_type_shape(arg) for arg in args),
+        tuple((name, _type_shape(arg)) for name, arg in kwargs.items()),
+    )
+    if plan.passes.get(arg_types, 0) >= ADAPTIVE_CHECK_THRESHOLD:
+        plan.unchecked_calls += 1
+        if plan.unchecked_calls < ADAPTIVE_CHECK_SAMPLE_RATE:
+            return wrapped(*args, **kwargs)
+        plan.unchecked_calls = 0
+
+    try:
+        r = _check_planned_contracts(plan, wrapped, instance, args, kwargs)
+    except PyTAContractError:
+        plan.passes.clear()
+        raise
+    plan.passes[arg_types] = plan.passes.get(arg_types, 0) + 1
+    return r
+
+
+def _type_shape(value: Any, depth: int = _TYPE_SHAPE_DEPTH) -> Any:
+    """Return a hashable description of the type of value, which also describes the types of the
+    first element of a list, set or frozenset, of the elements of a tuple (up to
+    _TYPE_SHAPE_MAX_TUPLE_SIZE), and of the first key and value of a dict, up to depth levels of
+    nested containers.
+    """
+    value_type = type(value)
+    if depth == 0 or value_type not in _SHAPED_TYPES or not value:
+        return value_type
+    elif value_type is tuple:
+        return (value_type,) + tuple(
+            _type_shape(element, depth - 1) for element in value[:_TYPE_SHAPE_MAX_TUPLE_SIZE]
+        )
+    elif value_type is dict:
+        key, element = next(iter(value.items()))
+        return value_type, _type_shape(key, depth - 1), _type_shape(element, depth - 1)
     else:
-        annotations = typing.get_type_hints(wrapped)
+        return value_type, _type_shape(next(iter(value)), depth - 1)
+
+
+def _check_planned_contracts(plan: _ContractPlan, wrapped, instance, args, kwargs):
+    """Check the contracts of a call to wrapped, whose contract plan is plan."""
+    params = plan.params
+    annotations = plan.get_annotations(wrapped, instance)
     args_with_self = args if instance is None else (instance,) + args
+    profile_start = None
+    if PROFILE_CONTRACTS:
+        _get_function_profile(plan.name)["calls"] += 1
+        profile_start = time.perf_counter()
 
     # Check function parameter types
     for arg, param in zip(args_with_self, params):
         if param in annotations:
             try:
-                _debug(f"Checking type of parameter {param} in call to {wrapped.__qualname__}")
+                _debug("Checking type of parameter %s in call to %s", param, wrapped.__qualname__)
                 if STRICT_NUMERIC_TYPES:
-                    check_type_strict(param, arg, annotations[param])
+                    check_type_strict(param, arg, annotations[param], plan.collection_check)
                 else:
-                    check_type(arg, annotations[param])
-            except (TypeError, TypeCheckError):
+                    typeguard.check_type(arg, annotations[param])
+            except (TypeError, typeguard.TypeCheckError) as e:
                 additional_suggestions = _get_argument_suggestions(arg, annotations[param])
+                if isinstance(e, _ItemTypeError):
+                    additional_suggestions = str(e)
 
                 raise PyTAContractError(
                     f"Argument value {_display_value(arg)} for {wrapped.__name__} parameter {param} "
@@ -269,94 +709,271 @@ def _check_function_contracts(wrapped, instance, args, kwargs):
                     + (f"\n{additional_suggestions}" if additional_suggestions else "")
                 )
 
-    function_locals = dict(zip(params, args_with_self))
+    if profile_start is not None:
+        _record_profile(plan.name, "parameter_types", profile_start)
 
-    # Check bounded function
-    if hasattr(wrapped, "__self__"):
-        target = wrapped.__func__
-    else:
-        target = wrapped
+    function_locals = dict(zip(params, args_with_self))
 
     # Check function preconditions
-    if not hasattr(target, "__preconditions__"):
-        target.__preconditions__: list[tuple[str, CodeType]] = []
-        preconditions = parse_assertions(wrapped)
-        for precondition in preconditions:
-            try:
-                compiled = compile(precondition, "<string>", "eval")
-            except:
-                _debug(
-                    f"Warning: precondition {precondition} could not be parsed as a valid Python expression"
-                )
-                continue
-            target.__preconditions__.append((precondition, compiled))
-
     if ENABLE_CONTRACT_CHECKING:
-        _check_assertions(wrapped, function_locals)
+        if profile_start is not None:
+            profile_start = time.perf_counter()
+        _check_assertions(wrapped, function_locals, assertions=plan.preconditions)
+        if profile_start is not None:
+            _record_profile(plan.name, "preconditions", profile_start)
 
     # Check return type
     r = wrapped(*args, **kwargs)
+    if profile_start is not None:
+        profile_start = time.perf_counter()
     if "return" in annotations:
         return_type = annotations["return"]
         try:
-            _debug(f"Checking return type from call to {wrapped.__qualname__}")
+            _debug("Checking return type from call to %s", wrapped.__qualname__)
             if STRICT_NUMERIC_TYPES:
-                check_type_strict("return", r, return_type)
+                check_type_strict("return", r, return_type, plan.collection_check)
             else:
-                check_type(r, return_type)
-        except (TypeError, TypeCheckError):
+                typeguard.check_type(r, return_type)
+        except (TypeError, typeguard.TypeCheckError) as e:
             raise PyTAContractError(
                 f"Return value {_display_value(r)} for {wrapped.__name__} did not match "
                 f"expected type {_display_annotation(return_type)}"
+                + (f"\n{e}" if isinstance(e, _ItemTypeError) else "")
             )
+    if profile_start is not None:
+        _record_profile(plan.name, "return_type", profile_start)
 
     # Check function postconditions
-    if not hasattr(target, "__postconditions__"):
-        target.__postconditions__: list[tuple[str, CodeType, str]] = []
-        return_val_var_name = _get_legal_return_val_var_name(
-            {**wrapped.__globals__, **function_locals}
-        )
-        postconditions = parse_assertions(wrapped, parse_token="Postcondition")
-        for postcondition in postconditions:
-            assertion = _replace_return_val_assertion(postcondition, return_val_var_name)
-            try:
-                compiled = compile(assertion, "<string>", "eval")
-            except:
-                _debug(
-                    f"Warning: postcondition {postcondition} could not be parsed as a valid Python expression"
-                )
-                continue
-            target.__postconditions__.append((postcondition, compiled, return_val_var_name))
-
     if ENABLE_CONTRACT_CHECKING:
+        if profile_start is not None:
+            profile_start = time.perf_counter()
         _check_assertions(
             wrapped,
             function_locals,
             function_return_val=r,
             condition_type="postcondition",
+            assertions=plan.postconditions,
         )
+        if profile_start is not None:
+            _record_profile(plan.name, "postconditions", profile_start)
 
     return r
 
 
-def check_type_strict(argname: str, value: Any, expected_type: type) -> None:
+def _get_function_profile(name: str) -> dict[str, Any]:
+    """Return the contract checking profile of the function with the given full name."""
+    if name not in _CONTRACT_PROFILE:
+        _CONTRACT_PROFILE[name] = {"calls": 0, **{c: [0, 0.0] for c in _PROFILE_CATEGORIES}}
+    return _CONTRACT_PROFILE[name]
+
+
+def _record_profile(name: str, category: str, start: float) -> None:
+    """Record a contract check of the given category for the function with the given full name,
+    which started at time start (as returned by time.perf_counter)."""
+    record = _get_function_profile(name)[category]
+    record[0] += 1
+    record[1] += time.perf_counter() - start
+
+
+def get_contract_profile() -> dict[str, dict[str, Any]]:
+    """Return the contract checking profile recorded while PROFILE_CONTRACTS was True.
+
+    The profile is a dictionary mapping the full name of each function (or the __setattr__ method
+    of a class) to a dictionary with its number of "calls", and for each kind of contract check
+    ("parameter_types", "preconditions", "return_type", "postconditions", "attribute_types" and
+    "representation_invariants"), a dictionary with the number of "checks" and their total "time"
+    in seconds. Times are cumulative: they include the time spent checking the contracts of the
+    functions called while checking the contracts of a function (e.g., in a precondition).
+    """
+    return {
+        name: {
+            "calls": profile["calls"],
+            **{
+                category: {"checks": profile[category][0], "time": profile[category][1]}
+                for category in _PROFILE_CATEGORIES
+            },
+        }
+        for name, profile in _CONTRACT_PROFILE.items()
+    }
+
+
+def reset_contract_profile() -> None:
+    """Discard the contract checking profile recorded so far."""
+    _CONTRACT_PROFILE.clear()
+
+
+def print_contract_profile(output_format: str = "table", file: Optional[TextIO] = None) -> None:
+    """Print the contract checking profile recorded while PROFILE_CONTRACTS was True.
+
+    Args:
+        output_format: "table" to print a table of the time (in milliseconds) spent checking each
+            kind of contract for each function, sorted by total time, or "json" to print the
+            result of get_contract_profile as JSON.
+        file: the file to print to (sys.stderr by default).
+    """
+    if file is None:
+        file = sys.stderr
+    profile = get_contract_profile()
+    if output_format == "json":
+        print(json.dumps(profile, indent=4), file=file)
+        return
+    elif output_format != "table":
+        raise ValueError(f'output_format must be "table" or "json", got {output_format!r}')
+
+    rows = []
+    for name, function_profile in profile.items():
+        times = [function_profile[category]["time"] * 1000 for category in _PROFILE_CATEGORIES]
+        rows.append(
+            [name, str(function_profile["calls"])] + [f"{t:.2f}" for t in times] + [sum(times)]
+        )
+    rows.sort(key=lambda row: row[-1], reverse=True)
+    for row in rows:
+        row[-1] = f"{row[-1]:.2f}"
+
+    header = ["Function", "Calls", *_PROFILE_CATEGORIES.values(), "Total (ms)"]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print(
+            "  ".join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip(),
+            file=file,
+        )
+
+
+def enable_contract_profiling(output_format: str = "table", file: Optional[TextIO] = None) -> None:
+    """Set PROFILE_CONTRACTS to True, and print the contract checking profile when the program
+    exits (see print_contract_profile).
+
+    The profile is printed only once, with the arguments of the last call to this function.
+    """
+    global PROFILE_CONTRACTS, _PROFILE_AT_EXIT_ARGS
+    PROFILE_CONTRACTS = True
+    if _PROFILE_AT_EXIT_ARGS is None:
+        atexit.register(_print_contract_profile_at_exit)
+    _PROFILE_AT_EXIT_ARGS = (output_format, file)
+
+
+def _print_contract_profile_at_exit() -> None:
+    """Print the contract checking profile with the arguments of enable_contract_profiling."""
+    print_contract_profile(*_PROFILE_AT_EXIT_ARGS)
+
+
+def check_type_strict(
+    argname: str,
+    value: Any,
+    expected_type: type,
+    collection_check: tuple[Optional[str], Optional[int]] = (None, None),
+) -> None:
     """Ensure that `value` matches ``expected_type`` with strict type checking.
 
     This function enforces strict type distinctions within the numeric hierarchy (bool, int, float,
     complex), ensuring that the type of value is exactly the same as expected_type.
+
+    The items of collections are checked according to collection_check, a pair of a collection
+    check strategy and size that default to COLLECTION_CHECK_STRATEGY and COLLECTION_CHECK_SIZE
+    when None. If an item does not match its expected type, the TypeError raised describes where
+    the item is in value.
     """
     if not ENABLE_CONTRACT_CHECKING:
         return
+    item_selector = _ItemSelector(*collection_check)
+    if item_selector.strategy == "all":
+        fast_check = _get_fast_type_check(expected_type)[1]
+        if fast_check is not None and fast_check(value):
+            return
     try:
-        _check_inner_type(argname, value, expected_type)
-    except (TypeError, TypeCheckError):
-        raise TypeError(f"type of {argname} must be {expected_type}; got {value} instead")
+        _check_inner_type(argname, value, expected_type, item_selector)
+    except _ItemTypeError:
+        raise
+    except (TypeError, typeguard.TypeCheckError):
+        raise TypeError(
+            f"type of {argname} must be {expected_type}; got {_display_value(value)} instead"
+        )
+
+
+class _ItemSelector:
+    """Selects the items of collections to check against their type annotations when checking one
+    value, following a collection check strategy (see COLLECTION_CHECK_STRATEGY).
 
+    Instance attributes:
+        - strategy: the collection check strategy
+        - size: the collection check size
+        - remaining: the number of items that can still be checked, for the "budget" strategy
+    """
+
+    __slots__ = ("strategy", "size", "remaining")
+
+    strategy: str
+    size: int
+    remaining: int
+
+    def __init__(self, strategy: Optional[str] = None, size: Optional[int] = None) -> None:
+        self.strategy = COLLECTION_CHECK_STRATEGY if strategy is None else strategy
+        self.size = COLLECTION_CHECK_SIZE if size is None else size
+        self.remaining = self.size
+        if self.strategy not in _COLLECTION_CHECK_STRATEGIES:
+            raise ValueError(
+                f"COLLECTION_CHECK_STRATEGY must be one of {_COLLECTION_CHECK_STRATEGIES}, "
+                f"got {self.strategy!r}"
+            )
 
-def _check_inner_type(argname: str, value: Any, expected_type: type) -> None:
+    def select(self, collection: Iterable) -> Iterable[tuple[int, Any]]:
+        """Return the (index, item) pairs of the items of collection to check."""
+        if self.strategy == "first" and len(collection) > self.size:
+            return zip(range(self.size), collection)
+        elif self.strategy == "sample" and len(collection) > self.size:
+            indexes = sorted(random.sample(range(len(collection)), self.size))
+            if isinstance(collection, (list, tuple)):
+                return ((i, collection[i]) for i in indexes)
+            indexes = set(indexes)
+            return ((i, item) for i, item in enumerate(collection) if i in indexes)
+        elif self.strategy == "budget":
+            return self._select_within_budget(collection)
+        else:
+            return enumerate(collection)
+
+    def _select_within_budget(self, collection: Iterable) -> Iterable[tuple[int, Any]]:
+        """Yield the (index, item) pairs of collection, in order, while the budget is not spent."""
+        for index, item in enumerate(collection):
+            if self.remaining <= 0:
+                return
+            self.remaining -= 1
+            yield index, item
+
+
+def _check_item_type(
+    location: str, item: Any, expected_type: type, item_selector: _ItemSelector
+) -> None:
+    """Check that item, which is at the given location in a collection, matches expected_type.
+
+    Raise an _ItemTypeError describing the location of the innermost item that does not match.
+    """
+    try:
+        _check_inner_type(location, item, expected_type, item_selector)
+    except _ItemTypeError:
+        raise
+    except (TypeError, typeguard.TypeCheckError):
+        raise _ItemTypeError(
+            f"Value {_display_value(item)} at {location} did not match expected type "
+            f"{_display_annotation(expected_type)}"
+        ) from None
+
+
+def _check_inner_type(
+    argname: str,
+    value: Any,
+    expected_type: type,
+    item_selector: Optional[_ItemSelector] = None,
+) -> None:
     """Recursively checks if `value` matches `expected_type` for strict type validation, specifically supports checking
     collections (list[int], dicts[float]) and Union types (bool | int).
+
+    Only the items of collections selected by item_selector are checked (all items if it is None).
     """
+    if item_selector is None:
+        item_selector = _ItemSelector("all")
     inner_types = get_args(expected_type)
     outer_type = get_origin(expected_type)
     if outer_type is None:
@@ -369,45 +986,152 @@ def _check_inner_type(argname: str, value: Any, expected_type: type) -> None:
                 f"type of {argname} must be {expected_type}; got {type(value).__name__} instead"
             )
         else:
-            check_type(
-                value, expected_type, collection_check_strategy=CollectionCheckStrategy.ALL_ITEMS
+            typeguard.check_type(
+                value,
+                expected_type,
+                collection_check_strategy=typeguard.CollectionCheckStrategy.ALL_ITEMS,
             )
     elif outer_type is typing.Union:
         for inner_type in inner_types:
             try:
-                _check_inner_type(argname, value, inner_type)
+                _check_inner_type(argname, value, inner_type, item_selector)
                 return
-            except (TypeError, TypeCheckError):
+            except (TypeError, typeguard.TypeCheckError):
                 pass
-        raise TypeError(f"type of {argname} must be {expected_type}; got {value} instead")
+        raise TypeError(
+            f"type of {argname} must be {expected_type}; got {_display_value(value)} instead"
+        )
     elif outer_type in {list, set}:
         if isinstance(value, outer_type):
-            for item in value:
-                _check_inner_type(argname, item, inner_types[0])
+            for index, item in item_selector.select(value):
+                location = f"{argname}[{index}]" if outer_type is list else f"{argname} (set item)"
+                _check_item_type(location, item, inner_types[0], item_selector)
         else:
-            raise TypeError(f"type of {argname} must be {expected_type}; got {value} instead")
+            raise TypeError(
+                f"type of {argname} must be {expected_type}; got {_display_value(value)} instead"
+            )
     elif outer_type is dict:
         if isinstance(value, dict):
-            for key, item in value.items():
-                _check_inner_type(argname, key, inner_types[0])
-                _check_inner_type(argname, item, inner_types[1])
+            for _, (key, item) in item_selector.select(value.items()):
+                _check_item_type(f"{argname} (dict key)", key, inner_types[0], item_selector)
+                location = f"{argname}[{_display_value(key)}]"
+                _check_item_type(location, item, inner_types[1], item_selector)
         else:
-            raise TypeError(f"type of {argname} must be {expected_type}; got {value} instead")
+            raise TypeError(
+                f"type of {argname} must be {expected_type}; got {_display_value(value)} instead"
+            )
     elif outer_type is tuple:
         if isinstance(value, tuple) and len(inner_types) == 2 and inner_types[1] is Ellipsis:
-            for item in value:
-                _check_inner_type(argname, item, inner_types[0])
+            for index, item in item_selector.select(value):
+                _check_item_type(f"{argname}[{index}]", item, inner_types[0], item_selector)
         elif isinstance(value, tuple) and len(value) == len(inner_types):
-            for item, inner_type in zip(value, inner_types):
-                _check_inner_type(argname, item, inner_type)
+            for index, (item, inner_type) in enumerate(zip(value, inner_types)):
+                _check_item_type(f"{argname}[{index}]", item, inner_type, item_selector)
         else:
-            raise TypeError(f"type of {argname} must be {expected_type}; got {value} instead")
+            raise TypeError(
+                f"type of {argname} must be {expected_type}; got {_display_value(value)} instead"
+            )
     else:
-        check_type(
-            value, expected_type, collection_check_strategy=CollectionCheckStrategy.ALL_ITEMS
+        typeguard.check_type(
+            value,
+            expected_type,
+            collection_check_strategy=typeguard.CollectionCheckStrategy.ALL_ITEMS,
         )
 
 
+def _get_fast_type_check(
+    expected_type: Any,
+) -> tuple[Optional[frozenset[type]], Optional[Callable[[Any], bool]]]:
+    """Return a pair (exact_types, fast_check) used to check values against expected_type more
+    quickly than _check_inner_type.
+
+    If exact_types is not None, a value matches expected_type if its type is in exact_types.
+    If fast_check is not None, a value matches expected_type if fast_check returns True for it.
+    Otherwise (and in particular when fast_check returns False), the value must be checked using
+    _check_inner_type, which also reports why it does not match.
+
+    The result is computed once per type annotation and cached.
+    """
+    try:
+        return _FAST_TYPE_CHECKS[expected_type]
+    except KeyError:
+        result = _FAST_TYPE_CHECKS[expected_type] = _compile_fast_type_check(expected_type)
+        return result
+    except TypeError:
+        # expected_type is not hashable
+        return _compile_fast_type_check(expected_type)
+
+
+def _compile_fast_type_check(
+    expected_type: Any,
+) -> tuple[Optional[frozenset[type]], Optional[Callable[[Any], bool]]]:
+    """Compute the result of _get_fast_type_check for expected_type.
+
+    This follows the structure of _check_inner_type, but only accepts values that
+    _check_inner_type accepts. Collections whose items have exact types (e.g., list[int]) are
+    checked by comparing the set of the types of their items to the expected types.
+    """
+    if expected_type is Any:
+        return None, lambda value: True
+
+    inner_types = get_args(expected_type)
+    outer_type = get_origin(expected_type)
+    if outer_type is None:
+        if expected_type in _EXACT_TYPES:
+            exact_types = frozenset({expected_type})
+            return exact_types, lambda value: type(value) in exact_types
+        elif isclass(expected_type) and not any(
+            lookup(expected_type, (), ()) for lookup in typeguard.checker_lookup_functions
+        ):
+            # typeguard checks instances of this class using isinstance
+            return None, lambda value: isinstance(value, expected_type)
+    elif outer_type in _UNION_TYPES:
+        inner_checks = [_get_fast_type_check(inner_type) for inner_type in inner_types]
+        if all(exact_types is not None for exact_types, _ in inner_checks):
+            exact_types = frozenset().union(*(exact_types for exact_types, _ in inner_checks))
+            return exact_types, lambda value: type(value) in exact_types
+        fast_checks = [fast_check for _, fast_check in inner_checks if fast_check is not None]
+        if fast_checks:
+            return None, lambda value: any(fast_check(value) for fast_check in fast_checks)
+    elif (outer_type in {list, set} and len(inner_types) == 1) or (
+        outer_type is tuple and len(inner_types) == 2 and inner_types[1] is Ellipsis
+    ):
+        items_check = _compile_fast_items_check(inner_types[0])
+        if items_check is not None:
+            return None, lambda value: isinstance(value, outer_type) and items_check(value)
+    elif outer_type is dict and len(inner_types) == 2:
+        keys_check = _compile_fast_items_check(inner_types[0])
+        values_check = _compile_fast_items_check(inner_types[1])
+        if keys_check is not None and values_check is not None:
+            return None, lambda value: (
+                isinstance(value, dict)
+                and keys_check(value.keys())
+                and values_check(value.values())
+            )
+    elif outer_type is tuple:
+        inner_fast_checks = [_get_fast_type_check(inner_type)[1] for inner_type in inner_types]
+        if all(fast_check is not None for fast_check in inner_fast_checks):
+            return None, lambda value: (
+                isinstance(value, tuple)
+                and len(value) == len(inner_fast_checks)
+                and all(fast_check(item) for fast_check, item in zip(inner_fast_checks, value))
+            )
+
+    return None, None
+
+
+def _compile_fast_items_check(expected_type: Any) -> Optional[Callable[[Any], bool]]:
+    """Return a function that returns True if all items of a collection match expected_type,
+    or None if there is no fast check for expected_type."""
+    exact_types, fast_check = _get_fast_type_check(expected_type)
+    if exact_types is not None:
+        return lambda items: exact_types.issuperset(map(type, items))
+    elif fast_check is not None:
+        return lambda items: all(map(fast_check, items))
+    else:
+        return None
+
+
 def _get_argument_suggestions(arg: Any, annotation: type) -> str:
     """Returns potential suggestions for the given arg and its annotation"""
     try:
@@ -419,7 +1143,26 @@ def _get_argument_suggestions(arg: Any, annotation: type) -> str:
     return ""
 
 
+def _get_caller_self(frame: FrameType) -> Any:
+    """Return the value of the self variable of frame, or None if it has none.
+
+    When frame runs an instance method of a contract-checked class, its receiver is taken from
+    the method calls recorded for the current thread, and when frame's code has no self variable, None is returned: in both cases,
+    frame.f_locals (which is slow to compute) is not needed.
+    """
+    code = frame.f_code
+    method_calls = _THREAD_STATE.method_calls
+    if method_calls and method_calls[-1][1] is code:
+        return method_calls[-1][0]
+    elif "self" in code.co_varnames or "self" in code.co_cellvars or "self" in code.co_freevars:
+        return frame.f_locals.get("self")
+    else:
+        return None
+
+
 def _instance_method_wrapper(wrapped: Callable, klass: type) -> Callable:
+    method_code = getattr(inspect.unwrap(wrapped), "__code__", None)
+
     @wrapt.decorator
     def wrapper(wrapped, instance, args, kwargs):
         # Create an accumulator to store the instances mutated across this function call.
@@ -432,10 +1175,32 @@ def _instance_method_wrapper(wrapped: Callable, klass: type) -> Callable:
         setattr(instance_klass, "__mutated_instances__", [])
 
         try:
-            r = _check_function_contracts(wrapped, instance, args, kwargs)
+            method_calls = _THREAD_STATE.method_calls
+            method_calls.append((instance, method_code))
+            try:
+                if wrapped.__name__ == "__init__":
+                    with _initializing(instance):
+                        r = _check_function_contracts(wrapped, instance, args, kwargs)
+                else:
+                    r = _check_function_contracts(wrapped, instance, args, kwargs)
+            finally:
+                method_calls.pop()
             if _instance_init_in_callstack(instance):
                 return r
+            deferred_instances = _THREAD_STATE.deferred_instances
+            if deferred_instances is not None:
+                deferred_instances[(id(instance), klass)] = instance
+                for mutated_instance in getattr(instance_klass, "__mutated_instances__", []):
+                    deferred_instances[(id(mutated_instance), type(mutated_instance))] = (
+                        mutated_instance
+                    )
+                return r
+            profile_start = time.perf_counter() if PROFILE_CONTRACTS else None
             _check_class_type_annotations(klass, instance)
+            if profile_start is not None:
+                name = _get_contract_plan(wrapped).name
+                _record_profile(name, "attribute_types", profile_start)
+                profile_start = time.perf_counter()
             klass_mod = _get_module(klass)
             if klass_mod is not None and ENABLE_CONTRACT_CHECKING:
                 _check_invariants(instance, klass, klass_mod.__dict__)
@@ -453,6 +1218,8 @@ def _instance_method_wrapper(wrapped: Callable, klass: type) -> Callable:
                         mutated_instance_klass,
                         mutated_instance_klass_mod.__dict__,
                     )
+                if profile_start is not None:
+                    _record_profile(name, "representation_invariants", profile_start)
         except PyTAContractError as e:
             raise AssertionError(str(e)) from None
         else:
@@ -466,25 +1233,35 @@ def _instance_method_wrapper(wrapped: Callable, klass: type) -> Callable:
     return wrapper(wrapped)
 
 
+@contextlib.contextmanager
+def _initializing(instance: Any):
+    """A context manager recording that instance is being initialized by the current thread."""
+    initializing_instances = _THREAD_STATE.initializing_instances
+    key = id(instance)
+    initializing_instances[key] = initializing_instances.get(key, 0) + 1
+    try:
+        yield
+    finally:
+        depth = initializing_instances.pop(key) - 1
+        if depth > 0:
+            initializing_instances[key] = depth
+
+
+@wrapt.decorator
+def _track_initialization(wrapped, instance, args, kwargs):
+    """A decorator for __init__ methods that records that the instance is being initialized."""
+    with _initializing(instance):
+        return wrapped(*args, **kwargs)
+
+
 def _instance_init_in_callstack(instance: Any) -> bool:
-    """Return whether instance's init is part of the current callstack
+    """Return whether an __init__ method in the MRO of instance's type is running on instance
+    in the current thread.
 
-    Note: due to the nature of the check, externally defined __init__ functions with
-    'self' defined as the first parameter may pass this check.
+    The __init__ methods are tracked by their wrappers (see _initializing): those of contract-checked
+    classes by _instance_method_wrapper, and the others by _track_initialization.
     """
-    frame = inspect.currentframe().f_back
-    while frame:
-        frame_context_name = inspect.getframeinfo(frame).function
-        frame_context_self = frame.f_locals.get("self")
-        frame_context_vars = frame.f_code.co_varnames
-        if (
-            frame_context_name == "__init__"
-            and frame_context_self is instance
-            and frame_context_vars[0] == "self"
-        ):
-            return True
-        frame = frame.f_back
-    return False
+    return id(instance) in _THREAD_STATE.initializing_instances
 
 
 def _check_class_type_annotations(klass: type, instance: Any) -> None:
@@ -493,45 +1270,143 @@ def _check_class_type_annotations(klass: type, instance: Any) -> None:
     Precondition:
         - isinstance(instance, klass)
     """
-    klass_mod = _get_module(klass)
-    cls_annotations = typing.get_type_hints(klass, localns=klass_mod.__dict__)
+    cls_annotations = _get_class_annotations(klass)
 
     for attr, annotation in cls_annotations.items():
         value = getattr(instance, attr)
         try:
-            _debug(f"Checking type of attribute {attr} for {klass.__qualname__} instance")
-            check_type(
-                value, annotation, collection_check_strategy=CollectionCheckStrategy.ALL_ITEMS
-            )
-        except TypeCheckError:
+            _debug("Checking type of attribute %s for %s instance", attr, klass.__qualname__)
+            _check_attribute_type(klass, value, annotation)
+        except typeguard.TypeCheckError:
             raise AssertionError(
                 f"Value {_display_value(value)} for attribute {attr} did not match expected type "
                 f"{_display_annotation(annotation)}"
             )
 
 
-def _check_invariants(instance, klass: type, global_scope: dict) -> None:
-    """Check that the representation invariants for the instance are satisfied."""
+def _get_class_annotations(klass: type) -> dict[str, Any]:
+    """Return the type hints of klass, which are only resolved the first time they are needed."""
+    if klass not in _CLASS_ANNOTATIONS:
+        klass_mod = _get_module(klass)
+        _CLASS_ANNOTATIONS[klass] = typing.get_type_hints(klass, localns=klass_mod.__dict__)
+    return _CLASS_ANNOTATIONS[klass]
+
+
+@contextlib.contextmanager
+def deferred_invariants():
+    """A context manager that defers checking the attribute types and representation invariants of
+    instances of contract-checked classes until the end of the with block.
+
+    Inside the block, the instances whose attribute types and representation invariants would be
+    checked (after a method call or an attribute assignment) are recorded instead, and each is
+    checked once at the end of the block. This speeds up code that creates or modifies many
+    instances, at the cost of reporting violations later. The types of attributes assigned
+    directly are still checked when they are assigned, and attributes that violate representation
+    invariants keep their values. Nothing is checked if the block raises an error. Only the checks
+    made by the thread running the block are deferred.
+
+    Example:
+
+        >>> from python_ta.contracts import deferred_invariants
+        >>> with deferred_invariants():
+        ...     vertices = [_Vertex(item) for item in items]
+    """
+    if _THREAD_STATE.deferred_instances is not None:
+        # Instances are checked at the end of the outermost block
+        yield
+        return
+
+    _THREAD_STATE.deferred_instances = {}
+    try:
+        yield
+        deferred_instances = _THREAD_STATE.deferred_instances
+    finally:
+        _THREAD_STATE.deferred_instances = None
+
+    if not ENABLE_CONTRACT_CHECKING:
+        return
+    for (_, klass), instance in deferred_instances.items():
+        _check_class_type_annotations(klass, instance)
+        klass_mod = _get_module(klass)
+        if klass_mod is not None:
+            try:
+                _check_invariants(instance, klass, klass_mod.__dict__)
+            except PyTAContractError as e:
+                raise AssertionError(str(e)) from None
+
+
+def _check_attribute_type(klass: type, value: Any, annotation: Any) -> None:
+    """Check that value matches the type annotation of an attribute of klass, raising a
+    typeguard.TypeCheckError if it does not.
+
+    Values accepted by the fast type check of annotation (see _get_fast_type_check) are not checked
+    by typeguard, since typeguard accepts them too.
+    """
+    collection_check_strategy = _get_typeguard_collection_check_strategy(klass)
+    if collection_check_strategy is typeguard.CollectionCheckStrategy.ALL_ITEMS:
+        fast_check = _get_fast_type_check(annotation)[1]
+        if fast_check is not None and fast_check(value):
+            return
+    typeguard.check_type(value, annotation, collection_check_strategy=collection_check_strategy)
+
+
+def _get_typeguard_collection_check_strategy(klass: type) -> typeguard.CollectionCheckStrategy:
+    """Return the typeguard collection check strategy to use for the attributes of klass.
+
+    typeguard only supports checking all items or the first item of collections, so the first item
+    is checked unless the collection check strategy for klass is "all".
+    """
+    strategy = getattr(klass, "__collection_check__", (None, None))[0]
+    if strategy is None:
+        strategy = COLLECTION_CHECK_STRATEGY
+    if strategy == "all":
+        return typeguard.CollectionCheckStrategy.ALL_ITEMS
+    else:
+        return typeguard.CollectionCheckStrategy.FIRST_ITEM
+
+
+def _check_invariants(
+    instance, klass: type, global_scope: dict, changed_attr: Optional[str] = None
+) -> None:
+    """Check that the representation invariants for the instance are satisfied.
+
+    If changed_attr is not None, only check the representation invariants that may depend on the
+    instance attribute changed_attr.
+    """
+    rep_invariants = getattr(klass, "__representation_invariants__", [])
+    if not rep_invariants:
+        return
+    checkers = _get_invariant_checkers(klass, global_scope)
+    if changed_attr is not None:
+        dependencies = getattr(klass, "__invariant_dependencies__", None)
+        if dependencies is not None:
+            checkers = [
+                checker
+                for checker, invariant_dependencies in zip(checkers, dependencies)
+                if invariant_dependencies is None or changed_attr in invariant_dependencies
+            ]
+            if not checkers:
+                return
+
     if hasattr(instance, "__pyta_currently_checking"):
         # If already checking invariants for this instance, skip to avoid infinite recursion
         return
 
     super(type(instance), instance).__setattr__("__pyta_currently_checking", True)
 
-    rep_invariants = getattr(klass, "__representation_invariants__", set())
-
     try:
-        for invariant, compiled in rep_invariants:
+        for invariant, checker in checkers:
             try:
                 _debug(
-                    "Checking representation invariant for "
-                    f"{instance.__class__.__qualname__}: {invariant}"
+                    "Checking representation invariant for %s: %s",
+                    instance.__class__.__qualname__,
+                    invariant,
                 )
-                check = eval(compiled, {**global_scope, "self": instance})
+                check = checker(instance)
             except AssertionError as e:
                 raise AssertionError(str(e)) from None
             except:
-                _debug(f"Warning: could not evaluate representation invariant: {invariant}")
+                _debug("Warning: could not evaluate representation invariant: %s", invariant)
             else:
                 if not check:
                     curr_attributes = ", ".join(
@@ -551,6 +1426,69 @@ def _check_invariants(instance, klass: type, global_scope: dict) -> None:
         delattr(instance, "__pyta_currently_checking")
 
 
+def _get_invariant_checkers(
+    klass: type, global_scope: dict
+) -> list[tuple[str, Callable[[Any], Any]]]:
+    """Return a list of pairs (invariant, checker) for the representation invariants of klass,
+    where checker is a function that evaluates the invariant in global_scope for an instance.
+
+    The checkers are created once per class and global scope, and look up names in global_scope
+    itself rather than in a copy of it, so that each check does not copy global_scope.
+    """
+    rep_invariants = getattr(klass, "__representation_invariants__", [])
+    cached = klass.__dict__.get("__invariant_checkers__")
+    if cached is not None and cached[0] is global_scope and cached[1] is rep_invariants:
+        return cached[2]
+
+    checkers = []
+    for invariant, compiled in rep_invariants:
+        try:
+            checker = eval(
+                compile(f"lambda self: (\n{invariant}\n)", "<string>", "eval"), global_scope
+            )
+        except SyntaxError:
+            checker = lambda instance, compiled=compiled: eval(
+                compiled, {**global_scope, "self": instance}
+            )
+        checkers.append((invariant, checker))
+    setattr(klass, "__invariant_checkers__", (global_scope, rep_invariants, checkers))
+    return checkers
+
+
+def _get_invariant_dependencies(klass: type, invariant: str) -> Optional[frozenset[str]]:
+    """Return the names of the instance attributes that the given representation invariant of klass
+    depends on, or None if it may depend on any attribute.
+
+    The invariant depends on the attributes it accesses directly (as self.<attribute>). It may
+    depend on any attribute if it uses self in any other way (e.g., len(self)), or if it accesses
+    a method or property of klass, which may access other attributes. An invariant that does not
+    access any attribute is checked whenever any attribute changes.
+    """
+    try:
+        tree = ast.parse(invariant, mode="eval")
+    except SyntaxError:
+        return None
+
+    self_attributes = {
+        id(node.value): node.attr
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Attribute)
+        and isinstance(node.value, ast.Name)
+        and node.value.id == "self"
+    }
+    dependencies = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id == "self":
+            if id(node) not in self_attributes:
+                return None
+            attribute = self_attributes[id(node)]
+            class_value = inspect.getattr_static(klass, attribute, None)
+            if callable(class_value) or hasattr(class_value, "__get__"):
+                return None
+            dependencies.add(attribute)
+    return frozenset(dependencies) if dependencies else None
+
+
 def _get_legal_return_val_var_name(var_dict: dict) -> str:
     """
     Add '_' to the end of __function_return_value__ until a variable name that has not been used for any other
@@ -583,29 +1521,39 @@ def _check_assertions(
     function_locals: dict,
     condition_type: str = "precondition",
     function_return_val: Any = None,
+    assertions: Optional[list[tuple]] = None,
 ) -> None:
-    """Check that the given assertions are still satisfied."""
-    # Check bounded function
-    if hasattr(wrapped, "__self__"):
-        target = wrapped.__func__
-    else:
-        target = wrapped
-    assertions = []
-    if condition_type == "precondition":
-        assertions = target.__preconditions__
-    elif condition_type == "postcondition":
-        assertions = target.__postconditions__
+    """Check that the given assertions are still satisfied.
+
+    If assertions is None, check the preconditions or postconditions (depending on condition_type)
+    stored on wrapped.
+    """
+    if assertions is None:
+        # Check bounded function
+        if hasattr(wrapped, "__self__"):
+            target = wrapped.__func__
+        else:
+            target = wrapped
+        assertions = []
+        if condition_type == "precondition":
+            assertions = target.__preconditions__
+        elif condition_type == "postcondition":
+            assertions = target.__postconditions__
+    if not assertions:
+        return
+
+    # The namespace in which the assertions are evaluated
+    namespace = {**wrapped.__globals__, **function_locals}
     for assertion_str, compiled, *return_val_var_name in assertions:
-        return_val_dict = {}
         if condition_type == "postcondition":
-            return_val_dict = {return_val_var_name[0]: function_return_val}
+            namespace[return_val_var_name[0]] = function_return_val
         try:
-            _debug(f"Checking {condition_type} for {wrapped.__qualname__}: {assertion_str}")
-            check = eval(compiled, {**wrapped.__globals__, **function_locals, **return_val_dict})
+            _debug("Checking %s for %s: %s", condition_type, wrapped.__qualname__, assertion_str)
+            check = eval(compiled, namespace)
         except AssertionError as e:
             raise AssertionError(str(e)) from None
         except:
-            _debug(f"Warning: could not evaluate {condition_type}: {assertion_str}")
+            _debug("Warning: could not evaluate %s: %s", condition_type, assertion_str)
         else:
             if not check:
                 arg_string = ", ".join(
@@ -616,7 +1564,7 @@ def _check_assertions(
                 return_val_string = ""
 
                 if condition_type == "postcondition":
-                    return_val_string = f" and return value {function_return_val}"
+                    return_val_string = f" and return value {_display_value(function_return_val)}"
                 raise PyTAContractError(
                     f'{wrapped.__name__} {condition_type} "{assertion_str}" was '
                     f"violated for arguments {arg_string}{return_val_string}"
@@ -658,7 +1606,7 @@ def parse_assertions(obj: Any, parse_token: str = "Precondition") -> list[str]:
             if line.startswith("-"):
                 assertion = line[1:].strip()
                 if hasattr(obj, "__qualname__"):
-                    _debug(f"Adding assertion to {obj.__qualname__}: {assertion}")
+                    _debug("Adding assertion to %s: %s", obj.__qualname__, assertion)
                 assertions.append(assertion)
             elif line != "":
                 break
@@ -670,19 +1618,106 @@ def parse_assertions(obj: Any, parse_token: str = "Precondition") -> list[str]:
 def _display_value(value: Any, max_length: int = _DEFAULT_MAX_VALUE_LENGTH) -> str:
     """Return a human-friendly representation of the given value.
 
-    If DEBUG_CONTRACTS is False, truncate long strings to max_length characters.
+    If DEBUG_CONTRACTS is False, truncate long strings to max_length characters. Only the first
+    and last items of large containers are represented, so that the representation of a large
+    container is not computed just to be truncated.
 
     Preconditions:
         - max_length >= 5
     """
-    s = repr(value)
-    if not DEBUG_CONTRACTS and len(s) > max_length:
+    if DEBUG_CONTRACTS:
+        return repr(value)
+
+    s = _BoundedRepr(max_length).repr(value)
+    if len(s) > max_length:
         i = (max_length - 3) // 2
         return s[:i] + "..." + s[-i:]
     else:
         return s
 
 
+class _BoundedRepr:
+    """Compute representations of values in which the middle items of large lists, tuples, sets,
+    frozensets and dicts are replaced by "...".
+
+    Only the first and last max_items items of these containers are represented. Since each item
+    takes at least three characters (with its separator), a bounded representation is longer than
+    max_length, and starts and ends with the same (max_length - 3) // 2 characters as repr(value),
+    which are all that _display_value keeps. Values of other types are represented with repr.
+
+    Instance attributes:
+        - max_items: the number of items represented at each end of a large container
+        - _in_progress: the ids of the containers whose representation is being computed
+    """
+
+    max_items: int
+    _in_progress: set[int]
+
+    def __init__(self, max_length: int) -> None:
+        self.max_items = (max_length - 3) // 6 + 1
+        self._in_progress = set()
+
+    def repr(self, x: Any) -> str:
+        """Return the bounded representation of x."""
+        kind = type(x)
+        if kind not in _BOUNDED_REPR_DELIMITERS or not x:
+            return repr(x)
+        start, end = _BOUNDED_REPR_DELIMITERS[kind]
+        if id(x) in self._in_progress:
+            # Like repr, for lists, tuples and dicts that (indirectly) contain themselves
+            return start + "..." + end
+
+        self._in_progress.add(id(x))
+        try:
+            if kind is dict:
+                head, tail = self._bounded_items(x.items(), reversed(x.items()), len(x))
+                pieces = [f"{self.repr(key)}: {self.repr(item)}" for key, item in head]
+                tail_pieces = [f"{self.repr(key)}: {self.repr(item)}" for key, item in tail]
+            else:
+                head, tail = self._bounded_items(x, None, len(x))
+                pieces = [self.repr(item) for item in head]
+                tail_pieces = [self.repr(item) for item in tail]
+        finally:
+            self._in_progress.discard(id(x))
+
+        if len(head) < len(x):
+            pieces.append("...")
+            pieces.extend(tail_pieces)
+        elif kind is tuple and len(x) == 1:
+            end = "," + end
+        return start + ", ".join(pieces) + end
+
+    def _bounded_items(
+        self, items: Iterable, reversed_items: Optional[Iterable], size: int
+    ) -> tuple[list, list]:
+        """Return the first and last max_items of the given items (which has the given size).
+
+        If there are at most 2 * max_items items, return all of them and an empty list instead.
+        reversed_items iterates over the items in reverse order, if this is supported.
+        """
+        if size <= 2 * self.max_items:
+            return list(items), []
+        if isinstance(items, (list, tuple)):
+            return list(items[: self.max_items]), list(items[-self.max_items :])
+        head = list(itertools.islice(items, self.max_items))
+        if reversed_items is not None:
+            tail = list(itertools.islice(reversed_items, self.max_items))[::-1]
+        else:
+            tail = list(collections.deque(items, maxlen=self.max_items))
+        return head, tail
+
+
+# The text before and after the items in the representations of the types of containers whose
+# representations are bounded by _BoundedRepr
+_BOUNDED_REPR_DELIMITERS: dict[type, tuple[str, str]] = {
+    list: ("[", "]"),
+    tuple: ("(", ")"),
+    set: ("{", "}"),
+    frozenset: ("frozenset({", "})"),
+    dict: ("{", "}"),
+}
+
+
 def _display_annotation(annotation: Any) -> str:
     """Return a human-friendly representation of the given type annotation.
 
@@ -736,15 +1771,16 @@ def _get_module(obj: Any) -> ModuleType:
         return sys.modules[_PYDEV_UMD_NAME]
 
 
-def _debug(msg: str) -> None:
-    """Display a debugging message.
+def _debug(msg: str, *args: Any) -> None:
+    """Display a debugging message, formatted as msg % args.
 
-    Do nothing if DEBUG_CONTRACTS is False.
+    Do nothing if DEBUG_CONTRACTS is False. The message is only formatted when it is displayed,
+    so callers pass the values to display as args instead of formatting msg themselves.
     """
     if not DEBUG_CONTRACTS:
         return
     logging.basicConfig(format="[%(levelname)s] %(message)s", level=logging.DEBUG)
-    logging.debug(msg)
+    logging.debug(msg, *args)
 
 
 def _set_invariants(klass: type) -> None:
@@ -764,12 +1800,18 @@ def _set_invariants(klass: type) -> None:
                     compiled = compile(assertion, "<string>", "eval")
                 except:
                     _debug(
-                        f"Warning: representation invariant {assertion} could not be parsed as a valid Python expression"
+                        "Warning: representation invariant %s could not be parsed as a valid Python expression",
+                        assertion,
                     )
                     continue
                 rep_invariants.append((assertion, compiled))
 
     setattr(klass, "__representation_invariants__", rep_invariants)
+    setattr(
+        klass,
+        "__invariant_dependencies__",
+        [_get_invariant_dependencies(klass, invariant) for invariant, _ in rep_invariants],
+    )
 
 
 def validate_invariants(obj: object) -> None:
@@ -8,18 +8,27 @@ from typing import TextIO
 
 import click
 
-from . import check_all_contracts
+from . import check_all_contracts, enable_contract_profiling
 
 
 @click.command()
 @click.argument("file", type=click.File(mode="r"))
 @click.option("--extra-mod-name", "-e", multiple=True, help="Name of imported module to also check")
 @click.option("--no-decorate-main", is_flag=True, default=True, help="Disable decorating FILE")
-def check_contracts(file: TextIO, extra_mod_name: tuple, no_decorate_main: bool):
+@click.option(
+    "--profile",
+    type=click.Choice(["table", "json"]),
+    default=None,
+    help="Print the time spent checking contracts for each function when FILE exits",
+)
+def check_contracts(file: TextIO, extra_mod_name: tuple, no_decorate_main: bool, profile: str):
     """Run FILE as Python script with PythonTA's contract checking enabled.
 
     FILE the Python script as if you were to just run `python FILE`
     """
+    if profile is not None:
+        enable_contract_profiling(output_format=profile)
+
     contents = file.read()
     lines = contents.splitlines()
 
@@ -1,3 +1,28 @@
-from .accumulation_table import AccumulationTable
-from .recursion_table import RecursionTable
-from .snapshot_tracer import SnapshotTracer
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .accumulation_table import AccumulationTable
+    from .recursion_table import RecursionTable
+    from .snapshot_tracer import SnapshotTracer
+
+# The classes of this package, and the modules they are imported from when they are first used,
+# so that using one of them does not import the dependencies of the others
+_LAZY_ATTRIBUTES = {
+    "AccumulationTable": ".accumulation_table",
+    "RecursionTable": ".recursion_table",
+    "SnapshotTracer": ".snapshot_tracer",
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str) -> Any:
+    """Import the attributes in _LAZY_ATTRIBUTES when they are first accessed."""
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -5,15 +5,20 @@ for an accumulator loop
 
 from __future__ import annotations
 
-import copy
 import csv
 import inspect
+import io
+import json
 import sys
-from typing import TYPE_CHECKING, Any, Literal, Optional, Union
+from collections import deque
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional, TextIO, Union
 
 import astroid
 import tabulate
 
+from . import monitoring
+from .capture import ValueCapture
+
 if TYPE_CHECKING:
     import types
 
@@ -58,6 +63,147 @@ def get_loop_node(frame: types.FrameType) -> Union[astroid.For, astroid.While]:
             return statement
 
 
+def to_json_line(row: dict[str, Any]) -> str:
+    """Return row as a line of JSON, calling str on the values that are not JSON serializable
+    (e.g., sets, or dicts whose keys are not strings)"""
+    try:
+        return json.dumps(row, default=str) + "\n"
+    except (TypeError, ValueError):
+        serializable_row = {}
+        for name, value in row.items():
+            try:
+                json.dumps(value, default=str)
+            except (TypeError, ValueError):
+                value = str(value)
+            serializable_row[name] = value
+        return json.dumps(serializable_row, default=str) + "\n"
+
+
+class RowStream:
+    """
+    Class used to write the rows of an AccumulationTable to a file while the loop runs,
+    keeping at most a fixed number of rows in memory
+
+    Instance attributes:
+        file_io: the file the rows are written to
+        buffer_size: the maximum number of formatted rows kept in memory before being written
+        sample_every: only every sample_every-th row is sampled
+        sample_first: if not None, the number of sampled rows written as they are recorded
+        sample_last: if not None, the number of sampled rows written at the end, after the first
+            sample_first sampled rows (all the sampled rows are written if both are None)
+        _buffer: the formatted rows that have not been written yet
+        _last_rows: the last sample_last formatted sampled rows, or None if sample_last is None
+        _num_rows: the number of rows recorded so far
+        _num_sampled: the number of sampled rows recorded so far
+        _csv_line: the string buffer the csv rows are formatted into
+        _csv_writer: the writer used to format the csv rows, or None if the rows are NDJSON
+    """
+
+    file_io: TextIO
+    buffer_size: int
+    sample_every: int
+    sample_first: Optional[int]
+    sample_last: Optional[int]
+    _buffer: list[str]
+    _last_rows: Optional[deque[str]]
+    _num_rows: int
+    _num_sampled: int
+    _csv_line: io.StringIO
+    _csv_writer: Optional[csv.DictWriter]
+
+    def __init__(
+        self,
+        file_io: TextIO,
+        fieldnames: list[str],
+        output_format: Literal["csv", "ndjson"],
+        buffer_size: int = 100,
+        sample_every: int = 1,
+        sample_first: Optional[int] = None,
+        sample_last: Optional[int] = None,
+    ) -> None:
+        """Initialize a RowStream writing rows with the given fieldnames to file_io, and write the
+        csv header if output_format is "csv"."""
+        self.file_io = file_io
+        self.buffer_size = buffer_size
+        self.sample_every = sample_every
+        self.sample_first = sample_first
+        self.sample_last = sample_last
+        self._buffer = []
+        self._last_rows = deque(maxlen=sample_last) if sample_last is not None else None
+        self._num_rows = 0
+        self._num_sampled = 0
+        self._csv_line = io.StringIO()
+        if output_format == "csv":
+            self._csv_writer = csv.DictWriter(self._csv_line, fieldnames=fieldnames)
+            self._csv_writer.writeheader()
+            self._write(self._pop_csv_line())
+        else:
+            self._csv_writer = None
+
+    def is_sampled(self) -> bool:
+        """Return whether the next row recorded may be written."""
+        if self._num_rows % self.sample_every != 0:
+            return False
+        elif self.sample_first is None or self._num_sampled < self.sample_first:
+            return True
+        else:
+            return self.sample_last is not None
+
+    def record(self, row: Optional[dict[str, Any]]) -> None:
+        """Record the next row, which is None if it is not sampled."""
+        self._num_rows += 1
+        if row is None:
+            return
+
+        self._num_sampled += 1
+        line = self._format(row)
+        if self.sample_first is not None and self._num_sampled <= self.sample_first:
+            self._write(line)
+        elif self._last_rows is not None:
+            self._last_rows.append(line)
+        else:
+            self._write(line)
+
+    def close(self) -> None:
+        """Write all the rows that have not been written yet."""
+        if self._last_rows is not None:
+            self._buffer.extend(self._last_rows)
+            self._last_rows.clear()
+        self._flush()
+
+    def _format(self, row: dict[str, Any]) -> str:
+        """Return row formatted as a line of the output."""
+        if self._csv_writer is None:
+            return to_json_line(row)
+        self._csv_writer.writerow(row)
+        return self._pop_csv_line()
+
+    def _pop_csv_line(self) -> str:
+        """Return the contents of the csv line buffer and clear it."""
+        line = self._csv_line.getvalue()
+        self._csv_line.seek(0)
+        self._csv_line.truncate()
+        return line
+
+    def _write(self, line: str) -> None:
+        """Add line to the buffer, and write the buffer if it is full."""
+        self._buffer.append(line)
+        if len(self._buffer) >= self.buffer_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        """Write the buffered rows to the file."""
+        if self._buffer:
+            self.file_io.write("".join(self._buffer))
+            self._buffer = []
+        self.file_io.flush()
+
+
+def _no_copy(value: Any) -> Any:
+    """Return value itself."""
+    return value
+
+
 class AccumulationTable:
     """
     Class used as a form of print debugging to analyze different loop and
@@ -70,6 +216,13 @@ class AccumulationTable:
             values during each iteration
         _loop_lineno: the line number of the loop
         output_filepath: the filepath  where the table will be written if it is passed in, defaults to None
+        _capture: the ValueCapture used to copy the values of the variables at each iteration
+        _num_iterations: the number of iterations recorded so far
+        _stream: the RowStream each iteration is written to while the loop runs, if streaming
+        _stream_options: the arguments of the RowStream, or None if not streaming
+        _tool_id: the sys.monitoring tool id used to trace the loop, or None if the loop is traced
+            with sys.settrace
+        _loop_frame: the frame of the code containing the loop, while it is traced
     """
 
     loop_accumulators: dict[str, list]
@@ -79,37 +232,113 @@ class AccumulationTable:
     _loop_lineno: int
     output_filepath: Optional[str]
     output_format: str
+    _capture: ValueCapture
+    _num_iterations: int
+    _stream: Optional[RowStream]
+    _stream_options: Optional[dict[str, Any]]
+    _tool_id: Optional[int]
+    _loop_frame: Optional[types.FrameType]
 
     def __init__(
         self,
         accumulation_names: list[str],
         output: Union[None, str] = None,
-        format: Literal["table", "csv"] = "table",
+        format: Literal["table", "csv", "ndjson"] = "table",
+        max_capture_size: Optional[int] = None,
+        stream: bool = False,
+        buffer_size: int = 100,
+        sample_every: int = 1,
+        sample_first: Optional[int] = None,
+        sample_last: Optional[int] = None,
     ) -> None:
         """Initialize an AccumulationTable context manager for print-based loop debugging.
 
         Args:
             accumulation_names: a list of the loop accumulator variable names to display.
-
+            max_capture_size: the maximum number of elements of a list, tuple, dict or set value
+                that are recorded at each iteration. A larger value is recorded as an abbreviated
+                string instead. If None, values of any size are recorded.
+            stream: whether to write each iteration as soon as it is recorded, instead of when the
+                loop ends. Only supported for the "csv" and "ndjson" formats. When streaming,
+                loop_accumulators and loop_variables are not populated.
+            buffer_size: when streaming, the maximum number of rows kept in memory before being
+                written.
+            sample_every: when streaming, only write every sample_every-th iteration.
+            sample_first: when streaming, only write the first sample_first of the sampled
+                iterations (and the last sample_last, if sample_last is also given).
+            sample_last: when streaming, only write the last sample_last of the sampled
+                iterations (and the first sample_first, if sample_first is also given).
         """
+        if stream and format not in ("csv", "ndjson"):
+            raise ValueError('Streaming is only supported for the "csv" and "ndjson" formats')
+        if buffer_size < 1 or sample_every < 1:
+            raise ValueError("buffer_size and sample_every must be positive")
+
         self.loop_accumulators = {accumulator: [] for accumulator in accumulation_names}
         self.loop_variables = {}
         self._loop_lineno = 0
         self.output_filepath = output
         self.output_format = format
+        self._capture = ValueCapture(max_capture_size)
+        self._num_iterations = 0
+        self._stream = None
+        if stream:
+            self._stream_options = {
+                "buffer_size": buffer_size,
+                "sample_every": sample_every,
+                "sample_first": sample_first,
+                "sample_last": sample_last,
+            }
+        else:
+            self._stream_options = None
+        self._tool_id = None
+        self._loop_frame = None
 
     def _record_iteration(self, frame: types.FrameType) -> None:
         """Record the values of the accumulator variables and loop variables of an iteration"""
-        if self.loop_variables != {} and len(list(self.loop_variables.values())[0]) > 0:
-            for loop_var in self.loop_variables:
-                self.loop_variables[loop_var].append(copy.deepcopy(frame.f_locals[loop_var]))
-        else:
-            for loop_var in self.loop_variables:
-                self.loop_variables[loop_var].append(NO_VALUE)
-
+        if self._stream_options is None:
+            for loop_var, value in self._get_loop_values(frame, self._capture.capture).items():
+                self.loop_variables[loop_var].append(value)
+            for accumulator, value in self._get_accumulator_values(
+                frame, self._capture.capture
+            ).items():
+                self.loop_accumulators[accumulator].append(value)
+            self._capture.next_generation()
+        elif self._stream is not None and self._stream.is_sampled():
+            # The values are formatted as soon as they are recorded, so they are not copied
+            self._stream.record(
+                {
+                    "iteration": self._num_iterations,
+                    **self._get_loop_values(frame, _no_copy),
+                    **self._get_accumulator_values(frame, _no_copy),
+                }
+            )
+        elif self._stream is not None:
+            self._stream.record(None)
+
+        self._num_iterations += 1
+
+    def _get_loop_values(
+        self, frame: types.FrameType, capture: Callable[[Any], Any]
+    ) -> dict[str, Any]:
+        """Return the values of the loop variables in the current iteration, copied using capture"""
+        loop_values = {}
+        for loop_var in self.loop_variables:
+            if self._num_iterations > 0:
+                loop_values[loop_var] = capture(frame.f_locals[loop_var])
+            else:
+                loop_values[loop_var] = NO_VALUE
+        return loop_values
+
+    def _get_accumulator_values(
+        self, frame: types.FrameType, capture: Callable[[Any], Any]
+    ) -> dict[str, Any]:
+        """Return the values of the accumulator variables in the current iteration, copied using
+        capture"""
+        accumulator_values = {}
         for accumulator in self.loop_accumulators:
             if accumulator in frame.f_locals:
-                value = copy.deepcopy(frame.f_locals[accumulator])
+                value = capture(frame.f_locals[accumulator])
             elif accumulator in frame.f_code.co_varnames or accumulator in frame.f_code.co_names:
                 value = NO_VALUE
             else:
@@ -122,9 +351,11 @@ class AccumulationTable:
                     else:
                         raise
                 else:
-                    value = copy.deepcopy(value)
+                    value = capture(value)
 
-            self.loop_accumulators[accumulator].append(value)
+            accumulator_values[accumulator] = value
+
+        return accumulator_values
 
     def _create_iteration_dict(self) -> dict:
         """Return a dictionary that maps each accumulator
@@ -142,18 +373,23 @@ class AccumulationTable:
             **self.loop_accumulators,
         }
 
+    def _open_output(self) -> Optional[TextIO]:
+        """Return the file the table is written to, or None if it cannot be opened"""
+        if self.output_filepath is None:
+            return sys.stdout
+        try:
+            return open(self.output_filepath, "a", newline="")
+        except OSError as e:
+            print(f"Error opening output file: {e}")
+            return None
+
     def _tabulate_data(self) -> None:
         """Print the values of the accumulator and loop variables into a table"""
         iteration_dict = self._create_iteration_dict()
 
-        if self.output_filepath is None:
-            file_io = sys.stdout
-        else:
-            try:
-                file_io = open(self.output_filepath, "a", newline="")
-            except OSError as e:
-                print(f"Error opening output file: {e}")
-                return
+        file_io = self._open_output()
+        if file_io is None:
+            return
 
         try:
             if self.output_format == "table":
@@ -170,15 +406,29 @@ class AccumulationTable:
                 csv_preformat = [
                     dict(zip(iteration_dict.keys(), row)) for row in zip(*iteration_dict.values())
                 ]
-                writer = csv.DictWriter(file_io, fieldnames=iteration_dict.keys())
-                writer.writeheader()
-                writer.writerows(csv_preformat)
+                if self.output_format == "ndjson":
+                    file_io.writelines(to_json_line(row) for row in csv_preformat)
+                else:
+                    writer = csv.DictWriter(file_io, fieldnames=iteration_dict.keys())
+                    writer.writeheader()
+                    writer.writerows(csv_preformat)
         except OSError as e:
             print(f"Error writing data: {e}")
         finally:
             if self.output_filepath is not None:
                 file_io.close()
 
+    def _close_stream(self) -> None:
+        """Write the rows that have not been written yet and close the output file"""
+        try:
+            self._stream.close()
+        except OSError as e:
+            print(f"Error writing data: {e}")
+        finally:
+            if self.output_filepath is not None:
+                self._stream.file_io.close()
+            self._stream = None
+
     def _trace_loop(self, frame: types.FrameType, event: str, _arg: Any) -> None:
         """Trace through the loop and store the values of the
         accumulators and loop variable during each iteration
@@ -186,6 +436,17 @@ class AccumulationTable:
         if event == "line" and frame.f_lineno == self._loop_lineno:
             self._record_iteration(frame)
 
+    def _monitor_loop(self, code: types.CodeType, line_number: int) -> Any:
+        """sys.monitoring callback for the LINE events of the code containing the loop, which
+        records an iteration when the loop line is reached
+        """
+        if line_number != self._loop_lineno:
+            # Stop the events for this line, as only the loop line is needed
+            return monitoring.disable_location(self._tool_id)
+        frame = sys._getframe(1)
+        if frame is self._loop_frame:
+            self._record_iteration(frame)
+
     def _setup_table(self) -> None:
         """
         Get the frame of the code containing the with statement, cut down the source code
@@ -210,8 +471,26 @@ class AccumulationTable:
             self.loop_accumulators != {} or self.loop_variables != {}
         ), "The loop accumulator and loop variables cannot be both empty"
 
-        func_frame.f_trace = self._trace_loop
-        sys.settrace(lambda *_args: None)
+        if self._stream_options is not None:
+            file_io = self._open_output()
+            if file_io is not None:
+                fieldnames = ["iteration", *self.loop_variables, *self.loop_accumulators]
+                self._stream = RowStream(
+                    file_io, fieldnames, self.output_format, **self._stream_options
+                )
+
+        self._tool_id = monitoring.acquire_tool_id()
+        if self._tool_id is None:
+            func_frame.f_trace = self._trace_loop
+            sys.settrace(lambda *_args: None)
+        else:
+            self._loop_frame = func_frame
+            sys.monitoring.register_callback(
+                self._tool_id, sys.monitoring.events.LINE, self._monitor_loop
+            )
+            sys.monitoring.set_local_events(
+                self._tool_id, func_frame.f_code, sys.monitoring.events.LINE
+            )
 
     def __enter__(self) -> AccumulationTable:
         """Set up and return the accumulation table for the accumulator loop"""
@@ -219,7 +498,19 @@ class AccumulationTable:
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Exit the accumulator loop, set the frame to none and print the table"""
-        sys.settrace(None)
-        inspect.getouterframes(inspect.currentframe())[1].frame.f_trace = None
-        self._tabulate_data()
+        """Exit the accumulator loop, set the frame to none and print the table
+
+        When streaming, the rows that have not been written yet are written, including when the
+        loop raised an exception.
+        """
+        if self._tool_id is None:
+            sys.settrace(None)
+            inspect.getouterframes(inspect.currentframe())[1].frame.f_trace = None
+        else:
+            monitoring.release_tool_id(self._tool_id, [self._loop_frame.f_code])
+            self._tool_id = None
+            self._loop_frame = None
+        if self._stream_options is None:
+            self._tabulate_data()
+        elif self._stream is not None:
+            self._close_stream()
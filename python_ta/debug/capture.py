@@ -0,0 +1,163 @@
+"""
+Copying of the values recorded by the print-based debuggers (AccumulationTable and RecursionTable)
+"""
+
+from __future__ import annotations
+
+import copy
+import reprlib
+from typing import Any, Optional
+
+# Types of the values that are recorded without being copied, as they are immutable
+_IMMUTABLE_TYPES = {int, float, complex, bool, str, bytes, type(None), range}
+
+# Types of the containers whose copies are shared between captures while they are unchanged
+_CONTAINER_TYPES = {list, tuple, dict, set, frozenset}
+
+
+class _CycleFound(Exception):
+    """Raised when a container contains itself, so that it is copied with copy.deepcopy instead."""
+
+
+class ValueCapture:
+    """Copies values so that they can be recorded, like copy.deepcopy, except that the copies of
+    lists, tuples, dicts, sets and frozensets (and their elements) are reused as long as the
+    containers have not changed since they were last captured.
+
+    For example, when a list accumulator grows by one element in each iteration of a loop, each
+    capture only copies the new elements: the copies of the elements that were already in the list
+    are shared between the recorded values. As a result, the recorded values must not be mutated.
+
+    The copies are only reused from one generation of captures to the next (e.g. from one row of a
+    table to the next): next_generation must be called after each generation, so that the
+    containers that are no longer captured are not kept alive.
+
+    Instance attributes:
+        max_size: the maximum number of elements of a container that are captured. A container
+            with more elements is recorded as an abbreviated string representation instead.
+            If None, containers of any size are captured.
+        _copies: a mapping from the ids of the containers that have been captured in the current
+            generation to a tuple (container, ids of its elements, copies of its elements, copy of
+            the container) from their last capture, where the copies of the elements are None if
+            the elements did not need to be copied. The containers are kept alive so that their ids
+            are not reused.
+        _previous_copies: the same mapping as _copies, for the previous generation
+        _repr: the representation used for the containers with more than max_size elements
+    """
+
+    max_size: Optional[int]
+    _copies: dict[int, tuple[Any, list[int], Optional[list], Any]]
+    _previous_copies: dict[int, tuple[Any, list[int], Optional[list], Any]]
+    _repr: reprlib.Repr
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        """Initialize a ValueCapture that captures at most max_size elements of a container."""
+        self.max_size = max_size
+        self._copies = {}
+        self._previous_copies = {}
+        self._repr = reprlib.Repr()
+        if max_size is not None:
+            self._repr.maxlist = self._repr.maxtuple = self._repr.maxdeque = max_size
+            self._repr.maxset = self._repr.maxfrozenset = self._repr.maxdict = max_size
+
+    def capture(self, value: Any) -> Any:
+        """Return a copy of value that is not affected by later mutations of value."""
+        try:
+            return self._capture(value, {}, set())
+        except _CycleFound:
+            return copy.deepcopy(value)
+
+    def next_generation(self) -> None:
+        """Start a new generation of captures, forgetting the copies of the containers that were
+        not captured in the current generation."""
+        self._previous_copies = self._copies
+        self._copies = {}
+
+    def _capture(self, value: Any, memo: dict[int, Any], in_progress: set[int]) -> Any:
+        """Return a copy of value, using memo to copy each object reachable from value only once.
+
+        in_progress contains the ids of the containers being captured, which contain value.
+        """
+        value_type = type(value)
+        if value_type in _IMMUTABLE_TYPES:
+            return value
+
+        previous = self._copies.get(id(value))
+        if previous is None:
+            previous = self._previous_copies.get(id(value))
+        if previous is not None and previous[0] is value and previous[2] is None:
+            # Check first whether the elements are the same immutable values as in the last capture
+            if value_type is dict:
+                element_ids = [*map(id, value), *map(id, value.values())]
+            else:
+                element_ids = list(map(id, value))
+            if previous[1] == element_ids:
+                self._copies[id(value)] = previous
+                return previous[3]
+
+        if id(value) in memo:
+            return memo[id(value)]
+        if id(value) in in_progress:
+            raise _CycleFound
+        if value_type not in _CONTAINER_TYPES:
+            return copy.deepcopy(value, memo)
+        if self.max_size is not None and len(value) > self.max_size:
+            return self._repr.repr(value)
+
+        if value_type is dict:
+            elements = [*value, *value.values()]
+        else:
+            elements = list(value)
+        element_ids = list(map(id, elements))
+
+        if _IMMUTABLE_TYPES.issuperset(map(type, elements)):
+            # The elements are immutable, so they do not need to be copied
+            value_copy = _build_container(value, elements)
+            self._copies[id(value)] = (value, element_ids, None, value_copy)
+            memo[id(value)] = value_copy
+            return value_copy
+
+        in_progress.add(id(value))
+        element_copies = [
+            (
+                element
+                if type(element) in _IMMUTABLE_TYPES
+                else self._capture(element, memo, in_progress)
+            )
+            for element in elements
+        ]
+        in_progress.remove(id(value))
+
+        if (
+            previous is not None
+            and previous[0] is value
+            and previous[2] is not None
+            and previous[1] == element_ids
+            and all(map(_is, previous[2], element_copies))
+        ):
+            value_copy = previous[3]
+            self._copies[id(value)] = previous
+        else:
+            value_copy = _build_container(value, element_copies)
+            self._copies[id(value)] = (value, element_ids, element_copies, value_copy)
+
+        memo[id(value)] = value_copy
+        return value_copy
+
+
+def _is(a: Any, b: Any) -> bool:
+    """Return whether a and b are the same object."""
+    return a is b
+
+
+def _build_container(value: Any, element_copies: list) -> Any:
+    """Return a container of the same type as value, containing element_copies (the keys followed
+    by the values if value is a dict)."""
+    value_type = type(value)
+    if value_type is dict:
+        return dict(zip(element_copies[: len(value)], element_copies[len(value) :]))
+    elif value_type is tuple and all(map(_is, value, element_copies)):
+        # Like copy.deepcopy, do not copy a tuple whose elements do not need to be copied
+        return value
+    else:
+        return value_type(element_copies)
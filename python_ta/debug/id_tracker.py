@@ -8,17 +8,22 @@ class IDTracker:
         tracker: Dictionary mapping object IDs to their assigned unique IDs. This allows for long-term tracking of
             objects across multiple snapshots.
         current_snapshot_objects : A set of object IDs that are currently being tracked in the current snapshot.
+        json_entries: Dictionary mapping object IDs to the objects and their entries in the last snapshot
+            converted by snapshot_to_json, so that the entries of unchanged objects can be reused in the
+            next snapshot. The objects are kept alive until the next snapshot, so that their IDs are not reused.
     """
 
     id_counter: int
     tracker: dict[int, int]
     current_snapshot_objects: set[int]
+    json_entries: dict[int, tuple[Any, Any, dict, bool]]
 
     def __init__(self) -> None:
         """Initialize internal counters and containers for tracking object IDs."""
         self.id_counter = 0
         self.tracker = {}
         self.current_snapshot_objects = set()
+        self.json_entries = {}
 
     def __getitem__(self, obj: Any) -> int:
         """Retrieve the unique ID for an object, or none if not tracked."""
@@ -0,0 +1,71 @@
+"""
+Support for tracing the code being debugged with sys.monitoring (PEP 669), which is available in
+Python 3.12 and later.
+
+Unlike sys.settrace, sys.monitoring only calls the callbacks of the events registered for the code
+objects being debugged, so the rest of the program runs at full speed.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+if TYPE_CHECKING:
+    import types
+
+# Whether the debuggers (AccumulationTable, RecursionTable and SnapshotTracer) use sys.monitoring.
+# If False, or if sys.monitoring has no free tool ids, they use sys.settrace instead.
+USE_SYS_MONITORING = sys.version_info >= (3, 12)
+
+# The name of the tool registered with sys.monitoring
+TOOL_NAME = "python_ta"
+
+# The tool ids whose events were disabled at some code locations by a PythonTA debugger (see
+# disable_location). These events stay disabled after the tool id is released.
+_DISABLED_TOOL_IDS: set[int] = set()
+
+
+def acquire_tool_id() -> Optional[int]:
+    """Return a sys.monitoring tool id reserved for a PythonTA debugger, or None if
+    sys.monitoring should not be used or all the tool ids suitable for a debugger are in use.
+
+    The tool id must be released with release_tool_id once the debugger stops tracing.
+
+    If a PythonTA debugger disabled events for the returned tool id before, they are re-enabled
+    with sys.monitoring.restart_events. This also re-enables the events disabled by the other
+    tools (e.g. coverage tools), which then receive them again until they disable them again.
+    """
+    if not USE_SYS_MONITORING or not hasattr(sys, "monitoring"):
+        return None
+
+    # Tool ids 3 and 4 are not reserved by convention for another kind of tool
+    for tool_id in (sys.monitoring.DEBUGGER_ID, 3, 4):
+        if sys.monitoring.get_tool(tool_id) is None:
+            sys.monitoring.use_tool_id(tool_id, TOOL_NAME)
+            if tool_id in _DISABLED_TOOL_IDS:
+                _DISABLED_TOOL_IDS.clear()
+                sys.monitoring.restart_events()
+            return tool_id
+    return None
+
+
+def release_tool_id(tool_id: int, code_objects: Iterable[types.CodeType] = ()) -> None:
+    """Stop the events of tool_id, both global and local to code_objects, unregister its
+    callbacks, and free it.
+    """
+    events = sys.monitoring.events
+    sys.monitoring.set_events(tool_id, events.NO_EVENTS)
+    for code in code_objects:
+        sys.monitoring.set_local_events(tool_id, code, events.NO_EVENTS)
+    for event in (events.LINE, events.PY_START, events.PY_RETURN, events.PY_UNWIND):
+        sys.monitoring.register_callback(tool_id, event, None)
+    sys.monitoring.free_tool_id(tool_id)
+
+
+def disable_location(tool_id: int) -> Any:
+    """Return sys.monitoring.DISABLE, to be returned by a callback of tool_id to stop the event
+    at the current code location, and record that tool_id has disabled events.
+    """
+    _DISABLED_TOOL_IDS.add(tool_id)
+    return sys.monitoring.DISABLE
@@ -14,19 +14,24 @@ import tabulate
 
 from python_ta.util.tree import Tree
 
+from . import monitoring
+from .capture import ValueCapture
+
 if TYPE_CHECKING:
     import types
 
 DEFAULT_FUNCTION_STRING = "N/A"
 
 
-def clean_frame_variables(frame: types.FrameType) -> dict[str, Any]:
+def clean_frame_variables(
+    frame: types.FrameType, capture: Callable[[Any], Any] = copy.deepcopy
+) -> dict[str, Any]:
     """Remove the local variables from the frame's locals and keep only the
-    parameters.
+    parameters, copied using capture.
     """
     raw_variables = frame.f_locals
     parameters = inspect.getargvalues(frame).args
-    cleaned_variables = {param: copy.deepcopy(raw_variables[param]) for param in parameters}
+    cleaned_variables = {param: capture(raw_variables[param]) for param in parameters}
     return cleaned_variables
 
 
@@ -41,19 +46,36 @@ class RecursionTable:
         function_name: name of the function to be traced
         _trees: mapping of the frames to the corresponding tree
             representing the function call
+        _capture: the ValueCapture used to copy the inputs and return values
+        _tool_id: the sys.monitoring tool id used to trace the function, or None if the function
+            is traced with sys.settrace
+        _code_objects: the code objects of the functions named function_name that have been
+            called while tracing with sys.monitoring
     """
 
     frames_data: dict[types.FrameType, dict[str, Any]]
     function_name: str
     _trees: dict[types.FrameType, Tree]
+    _capture: ValueCapture
+    _tool_id: Optional[int]
+    _code_objects: set[types.CodeType]
 
-    def __init__(self, function_name: str) -> None:
+    def __init__(self, function_name: str, max_capture_size: Optional[int] = None) -> None:
         """Initialize a RecursionTable context manager for print-based recursive debugging
         of <function_name>.
+
+        Args:
+            function_name: the name of the recursive function to trace.
+            max_capture_size: the maximum number of elements of a list, tuple, dict or set input
+                or return value that are recorded. A larger value is recorded as an abbreviated
+                string instead. If None, values of any size are recorded.
         """
         self.function_name = function_name
         self.frames_data = {}
         self._trees = {}
+        self._capture = ValueCapture(max_capture_size)
+        self._tool_id = None
+        self._code_objects = set()
 
     def _get_root(self) -> Optional[Tree]:
         """Return the root node of the tree."""
@@ -84,7 +106,7 @@ class RecursionTable:
         """Update the state of the table representation after a function call is detected."""
         current_frame_data = {}
         caller_frame = frame.f_back
-        current_frame_variables = clean_frame_variables(frame)
+        current_frame_variables = clean_frame_variables(frame, self._capture.capture)
 
         # add the inputs to the dict
         for variable in current_frame_variables:
@@ -102,12 +124,13 @@ class RecursionTable:
 
         self.frames_data[frame] = current_frame_data
         self._insert_to_tree(current_func_string, frame, caller_frame)
+        self._capture.next_generation()
 
     def _record_return(self, frame: types.FrameType, return_value: Any) -> None:
         """Update the state of the table representation after a function return is detected.
         Note: the frame must already have been seen as returns are done 'on the way out'.
         """
-        self.frames_data[frame]["return value"] = copy.deepcopy(return_value)
+        self.frames_data[frame]["return value"] = self._capture.capture(return_value)
         current_node = self._trees[frame]
         current_node.value.append(return_value)
 
@@ -156,12 +179,55 @@ class RecursionTable:
         # return the function to continue tracing
         return self._trace_recursion
 
+    def _monitor_start(self, code: types.CodeType, _instruction_offset: int) -> Any:
+        """sys.monitoring callback for the PY_START events, which records the calls of the
+        functions named self.function_name.
+        """
+        if code.co_name != self.function_name:
+            # Stop the events for this code object, so that other functions run at full speed
+            return monitoring.disable_location(self._tool_id)
+        if code not in self._code_objects:
+            self._code_objects.add(code)
+            sys.monitoring.set_local_events(self._tool_id, code, sys.monitoring.events.PY_RETURN)
+        self._record_call(sys._getframe(1))
+
+    def _monitor_return(self, code: types.CodeType, _instruction_offset: int, retval: Any) -> None:
+        """sys.monitoring callback for the PY_RETURN events of the traced functions."""
+        frame = sys._getframe(1)
+        # Like sys.settrace, ignore the calls that started before the tracing
+        if frame in self.frames_data:
+            self._record_return(frame, retval)
+
+    def _monitor_unwind(
+        self, code: types.CodeType, _instruction_offset: int, _exception: BaseException
+    ) -> None:
+        """sys.monitoring callback for the PY_UNWIND events, which records a return value of None
+        for the traced functions that exit with an exception, like sys.settrace.
+        """
+        frame = sys._getframe(1)
+        if code in self._code_objects and frame in self.frames_data:
+            self._record_return(frame, None)
+
     def __enter__(self) -> RecursionTable:
         """Set up and return the recursion table for the recursive function."""
-        sys.settrace(self._trace_recursion)
+        self._tool_id = monitoring.acquire_tool_id()
+        if self._tool_id is None:
+            sys.settrace(self._trace_recursion)
+        else:
+            events = sys.monitoring.events
+            sys.monitoring.register_callback(self._tool_id, events.PY_START, self._monitor_start)
+            sys.monitoring.register_callback(self._tool_id, events.PY_RETURN, self._monitor_return)
+            sys.monitoring.register_callback(self._tool_id, events.PY_UNWIND, self._monitor_unwind)
+            # PY_UNWIND events cannot be local to code objects, but only occur for exceptions
+            sys.monitoring.set_events(self._tool_id, events.PY_START | events.PY_UNWIND)
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
         """Exit the recursive execution, stop tracing function execution and print the table."""
-        sys.settrace(None)
+        if self._tool_id is None:
+            sys.settrace(None)
+        else:
+            monitoring.release_tool_id(self._tool_id, self._code_objects)
+            self._tool_id = None
+            self._code_objects = set()
         self._tabulate_data()
@@ -21,6 +21,10 @@ from .id_tracker import IDTracker
 if TYPE_CHECKING:
     from types import FrameType
 
+# Types of the values that snapshot_to_json represents by their value alone. These values are
+# immutable, so their entries can be reused in every snapshot.
+_PRIMITIVE_TYPES = {int, float, complex, bool, str, bytes, type(None)}
+
 
 def get_filtered_global_variables(frame: FrameType) -> dict:
     """
@@ -118,40 +122,56 @@ def snapshot(
 
     if save:
         json_compatible_vars = snapshot_to_json(variables, id_tracker=id_tracker)
+        run_memory_viz(json_compatible_vars, memory_viz_args, memory_viz_version)
 
-        # Set up command
-        command = ["npx", f"memory-viz@{memory_viz_version}", "--width", "800"]
+    return variables
 
-        if memory_viz_version == "latest":
-            memory_viz_version_parsed = None
-        else:
-            memory_viz_version_parsed = parse(memory_viz_version)
-
-        # Ensure valid memory_viz version
-        if memory_viz_version_parsed and memory_viz_version_parsed < Version("0.3.1"):
-            logging.warning("PythonTA only supports MemoryViz versions 0.3.1 and later.")
-
-        # Update CLI flags for MemoryViz >= 0.7.0
-        if memory_viz_version == "latest" or memory_viz_version_parsed >= Version("0.7.0"):
-            command.extend(["--no-interactive"])
-
-        if memory_viz_args:
-            command.extend(memory_viz_args)
-
-        # Create a child to call the MemoryViz CLI
-        npx_path = shutil.which("npx")
-        subprocess.run(
-            command,
-            input=json.dumps(json_compatible_vars),
-            executable=npx_path,
-            stdout=sys.stdout,
-            stderr=sys.stderr,
-            encoding="utf-8",
-            text=True,
-            check=True,
-        )
 
-    return variables
+def run_memory_viz(
+    json_data: list[dict],
+    memory_viz_args: Optional[list[str]] = None,
+    memory_viz_version: str = "0.7.0",
+    capture_output: bool = False,
+) -> subprocess.CompletedProcess:
+    """Call the MemoryViz CLI to create a memory model diagram of json_data, a snapshot in the
+    format returned by snapshot_to_json.
+
+    memory_viz_args and memory_viz_version are used as in the snapshot function.
+    If capture_output is True, the output of MemoryViz is stored in the returned CompletedProcess
+    (or in the CalledProcessError raised if MemoryViz fails) instead of being written to
+    sys.stdout and sys.stderr.
+    """
+    # Set up command
+    command = ["npx", f"memory-viz@{memory_viz_version}", "--width", "800"]
+
+    if memory_viz_version == "latest":
+        memory_viz_version_parsed = None
+    else:
+        memory_viz_version_parsed = parse(memory_viz_version)
+
+    # Ensure valid memory_viz version
+    if memory_viz_version_parsed and memory_viz_version_parsed < Version("0.3.1"):
+        logging.warning("PythonTA only supports MemoryViz versions 0.3.1 and later.")
+
+    # Update CLI flags for MemoryViz >= 0.7.0
+    if memory_viz_version == "latest" or memory_viz_version_parsed >= Version("0.7.0"):
+        command.extend(["--no-interactive"])
+
+    if memory_viz_args:
+        command.extend(memory_viz_args)
+
+    # Create a child to call the MemoryViz CLI
+    npx_path = shutil.which("npx")
+    return subprocess.run(
+        command,
+        input=json.dumps(json_data),
+        executable=npx_path,
+        stdout=subprocess.PIPE if capture_output else sys.stdout,
+        stderr=subprocess.PIPE if capture_output else sys.stderr,
+        encoding="utf-8",
+        text=True,
+        check=True,
+    )
 
 
 def snapshot_to_json(
@@ -163,6 +183,10 @@ def snapshot_to_json(
     function to handle recursive processing of data types.
 
     id_tracker can be used to ensure that each value is assigned a unique ID, across multiple snapshots.
+    When id_tracker is used across multiple snapshots, the entries of the values that have not changed
+    since the previous snapshot are reused (and shared between the returned lists) instead of being
+    computed again, and the elements of the compound values whose elements are all primitive and
+    unchanged are not processed again.
     """
     if id_tracker is None:
         id_tracker = IDTracker()
@@ -184,58 +208,46 @@ def snapshot_to_json(
 
         if id_tracker.is_snapshot_object(val):
             return id_tracker[val]
+
+        value_id_diagram = id_tracker.add(val)
+        cached = id_tracker.json_entries.get(id(val))
+        if cached is not None and cached[0] is not val:
+            cached = None
+
+        if type(val) in _PRIMITIVE_TYPES:
+            # The entry of a primitive value never changes
+            if cached is None:
+                cached = (val, None, _primitive_entry(val, value_id_diagram), True)
+                id_tracker.json_entries[id(val)] = cached
+            value_entries.append(cached[2])
+            return value_id_diagram
+
+        elements = _get_elements(val)
+        if elements is None:
+            # Other values may be mutable, so their entries are always computed again
+            value_entries.append(_primitive_entry(val, value_id_diagram))
+            return value_id_diagram
+
+        signature = (type(val), elements[0], list(map(id, elements[1])))
+        if cached is not None and cached[1] == signature and cached[3]:
+            # The elements are the same primitive values as in the previous snapshot, so they are
+            # already tracked and their entries can be reused without processing them again
+            snapshot_objects = id_tracker.current_snapshot_objects
+            for element_id in signature[2]:
+                if element_id not in snapshot_objects:
+                    snapshot_objects.add(element_id)
+                    value_entries.append(id_tracker.json_entries[element_id][2])
+            value_entries.append(cached[2])
+            return value_id_diagram
+
+        element_ids = [process_value(element) for element in elements[1]]
+        if cached is not None and cached[1] == signature:
+            value_entry = cached[2]
         else:
-            value_id_diagram = id_tracker.add(val)
-
-            # Handle compound built-in data types
-            if isinstance(val, (list, set, tuple)):
-                element_ids = [process_value(element) for element in val]
-                value_entry = {
-                    "type": type(val).__name__,
-                    "id": value_id_diagram,
-                    "value": element_ids,
-                }
-            elif isinstance(val, dict):
-                dict_ids = {}
-                for key, v in val.items():
-                    key_id = process_value(key)
-                    val_id = process_value(v)
-                    dict_ids[key_id] = val_id
-                value_entry = {
-                    "type": "dict",
-                    "id": value_id_diagram,
-                    "value": dict_ids,
-                }
-            # Handle user-defined classes
-            elif hasattr(val, "__dict__"):  # Check if val is a user-defined class instance
-                attr_ids = {}
-                for attr_name, attr_val in vars(val).items():
-                    attr_id = process_value(attr_val)
-                    attr_ids[attr_name] = attr_id
-                value_entry = {
-                    "type": ".class",
-                    "name": type(val).__name__,
-                    "id": value_id_diagram,
-                    "value": attr_ids,
-                }
-            elif val is None:
-                value_entry = {
-                    "type": "NoneType",
-                    "id": value_id_diagram,
-                    "value": "None",
-                }
-            else:  # Handle primitives and other types
-                try:
-                    json.dumps(val)
-                    jsonable_val = val
-                except TypeError:
-                    jsonable_val = repr(val)
-                value_entry = {
-                    "type": type(val).__name__,
-                    "id": value_id_diagram,
-                    "value": jsonable_val,
-                }
-            value_entries.append(value_entry)
+            value_entry = _compound_entry(val, value_id_diagram, elements[0], element_ids)
+        only_primitive_elements = all(type(element) in _PRIMITIVE_TYPES for element in elements[1])
+        id_tracker.json_entries[id(val)] = (val, signature, value_entry, only_primitive_elements)
+        value_entries.append(value_entry)
 
         return value_id_diagram
 
@@ -255,5 +267,78 @@ def snapshot_to_json(
             json_data.append(json_object_frame)
 
     json_data.extend(value_entries)
+    # Only keep the entries of the values in this snapshot, so that the values that are no longer
+    # snapshotted are not kept alive
+    json_entries = id_tracker.json_entries
+    for obj_id in json_entries.keys() - id_tracker.current_snapshot_objects:
+        del json_entries[obj_id]
     id_tracker.clear_snapshot_objects()
     return json_data
+
+
+def _primitive_entry(val: Any, value_id_diagram: int) -> dict:
+    """Return the snapshot_to_json entry of the primitive value val, whose ID is value_id_diagram."""
+    if val is None:
+        return {
+            "type": "NoneType",
+            "id": value_id_diagram,
+            "value": "None",
+        }
+
+    try:
+        json.dumps(val)
+        jsonable_val = val
+    except TypeError:
+        jsonable_val = repr(val)
+    return {
+        "type": type(val).__name__,
+        "id": value_id_diagram,
+        "value": jsonable_val,
+    }
+
+
+def _get_elements(val: Any) -> Optional[tuple[Optional[tuple], list]]:
+    """Return the elements of the compound value val processed by snapshot_to_json,
+    as a tuple (names, elements), or None if val is not a compound value.
+
+    For a dict, elements alternates between its keys and values. For an instance of a user-defined
+    class, elements contains its attribute values and names contains its attribute names.
+    """
+    if isinstance(val, (list, set, tuple)):
+        return None, list(val)
+    elif isinstance(val, dict):
+        return None, [item for key_value in val.items() for item in key_value]
+    elif hasattr(val, "__dict__"):
+        attrs = vars(val)
+        return tuple(attrs), list(attrs.values())
+    else:
+        return None
+
+
+def _compound_entry(
+    val: Any, value_id_diagram: int, names: Optional[tuple], element_ids: list[int]
+) -> dict:
+    """Return the snapshot_to_json entry of the compound value val, whose ID is value_id_diagram,
+    given the names and IDs of its elements (as returned by _get_elements).
+    """
+    # Handle compound built-in data types
+    if isinstance(val, (list, set, tuple)):
+        return {
+            "type": type(val).__name__,
+            "id": value_id_diagram,
+            "value": element_ids,
+        }
+    elif isinstance(val, dict):
+        return {
+            "type": "dict",
+            "id": value_id_diagram,
+            "value": dict(zip(element_ids[::2], element_ids[1::2])),
+        }
+    # Handle user-defined classes
+    else:
+        return {
+            "type": ".class",
+            "name": type(val).__name__,
+            "id": value_id_diagram,
+            "value": dict(zip(names, element_ids)),
+        }
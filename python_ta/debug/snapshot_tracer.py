@@ -5,19 +5,22 @@ import inspect
 import json
 import logging
 import os
+import subprocess
 import sys
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Optional
-
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Any, Optional, Union
 
+from . import monitoring
 from .id_tracker import IDTracker
-from .snapshot import snapshot
+from .snapshot import run_memory_viz, snapshot, snapshot_to_json
 
 if TYPE_CHECKING:
     import types
 
+    from bs4 import BeautifulSoup
+
 
 class SnapshotTracer:
     """
@@ -27,15 +30,21 @@ class SnapshotTracer:
         output_directory: The directory where the memory model diagrams will be saved. Defaults to the current directory.
         webstepper: Opens the web-based visualizer.
         _snapshots: A list of dictionaries that maps the code line number and the snapshot number.
+        _snapshot_data: A list of the line numbers and JSON data of the snapshots that have not been rendered yet.
         _snapshot_args: A dictionary of keyword arguments to pass to the `snapshot` function.
         _first_line: Line number of the first line in the `with` block.
+        _tool_id: The sys.monitoring tool id used to trace the `with` block, or None if it is traced with sys.settrace.
+        _func_frame: The frame of the function containing the `with` block, while it is traced.
     """
 
     output_directory: Optional[str]
     webstepper: bool
     _snapshots: list[dict[int, int]]
+    _snapshot_data: list[tuple[int, list[dict]]]
     _snapshot_args: dict[str, Any]
     _first_line: int
+    _tool_id: Optional[int]
+    _func_frame: Optional[types.FrameType]
 
     def __init__(
         self,
@@ -59,35 +68,90 @@ class SnapshotTracer:
                 "Use the output_directory parameter to specify a different output path."
             )
         self._snapshots = []
+        self._snapshot_data = []
         self._snapshot_args = kwargs
         self._snapshot_args["memory_viz_args"] = copy.deepcopy(kwargs.get("memory_viz_args", []))
         self._snapshot_args["exclude_frames"] = copy.deepcopy(kwargs.get("exclude_frames", []))
-        self._snapshot_args["exclude_frames"].append("_trace_func")
+        self._snapshot_args["exclude_frames"].extend(["_trace_func", "_monitor_line"])
         self.output_directory = os.path.abspath(output_directory if output_directory else ".")
         self.id_tracker = IDTracker()
         Path(self.output_directory).mkdir(parents=True, exist_ok=True)
 
         self.webstepper = webstepper
         self._first_line = float("inf")
+        self._tool_id = None
+        self._func_frame = None
 
     def _trace_func(self, frame: types.FrameType, event: str, _arg: Any) -> None:
-        """Take a snapshot of the variables in the functions specified in `self.include`"""
+        """Take a snapshot of the variables in the functions specified in `self.include`.
+
+        The memory model diagrams of the snapshots are only rendered when the `with` block exits.
+        """
         if self._first_line == float("inf"):
             self._first_line = frame.f_lineno
         if event == "line":
-            filename = os.path.join(
-                self.output_directory,
-                f"snapshot-{len(self._snapshots)}.svg",
+            variables = snapshot(id_tracker=self.id_tracker, **self._snapshot_args)
+            self._snapshot_data.append(
+                (frame.f_lineno, snapshot_to_json(variables, id_tracker=self.id_tracker))
             )
-            self._snapshot_args["memory_viz_args"].extend(["--output", filename])
 
-            snapshot(
-                id_tracker=self.id_tracker,
-                save=True,
-                **self._snapshot_args,
-            )
+    def _monitor_line(self, code: types.CodeType, line_number: int) -> None:
+        """sys.monitoring callback for the LINE events of the function containing the `with` block."""
+        frame = sys._getframe(1)
+        if frame is self._func_frame:
+            self._trace_func(frame, "line", None)
 
-            self._add_svg_to_map(filename, frame.f_lineno)
+    def _render_snapshots(self) -> None:
+        """Render the memory model diagrams of the snapshots taken, and add them to self._snapshots.
+
+        Each diagram is rendered by a separate MemoryViz process. The first diagram is rendered on
+        its own, so that npx installs MemoryViz (if it is not installed yet) before the other
+        processes run concurrently. The output of each process is written once it finishes, in the
+        order of the snapshots.
+
+        If any diagram cannot be rendered, the first error is raised once the other diagrams
+        have been rendered and added to self._snapshots.
+        """
+        filenames = [
+            os.path.join(self.output_directory, f"snapshot-{len(self._snapshots) + i}.svg")
+            for i in range(len(self._snapshot_data))
+        ]
+        json_data = [data for _, data in self._snapshot_data]
+        results = [self._render_snapshot(json_data[0], filenames[0])] if json_data else []
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            results.extend(executor.map(self._render_snapshot, json_data[1:], filenames[1:]))
+
+        error = None
+        for (line, _), filename, result in zip(self._snapshot_data, filenames, results):
+            if isinstance(result, OSError):
+                error = error or result
+                continue
+            sys.stdout.write(result.stdout or "")
+            sys.stderr.write(result.stderr or "")
+            if isinstance(result, subprocess.CalledProcessError):
+                error = error or result
+            else:
+                self._add_svg_to_map(filename, line)
+        self._snapshot_data = []
+        if error is not None:
+            raise error
+
+    def _render_snapshot(
+        self, json_data: list[dict], filename: str
+    ) -> Union[subprocess.CompletedProcess, subprocess.CalledProcessError, OSError]:
+        """Render the memory model diagram of json_data to filename.
+
+        Return the MemoryViz process, with its captured output, or the error raised when running it.
+        """
+        memory_viz_kwargs = {
+            "memory_viz_args": self._snapshot_args["memory_viz_args"] + ["--output", filename]
+        }
+        if "memory_viz_version" in self._snapshot_args:
+            memory_viz_kwargs["memory_viz_version"] = self._snapshot_args["memory_viz_version"]
+        try:
+            return run_memory_viz(json_data, capture_output=True, **memory_viz_kwargs)
+        except (subprocess.CalledProcessError, OSError) as e:
+            return e
 
     def _add_svg_to_map(self, filename: str, line: int) -> None:
         """Add the SVG in filename to self._snapshots"""
@@ -103,21 +167,48 @@ class SnapshotTracer:
     def __enter__(self):
         """Set up the trace function to take snapshots at each line of code."""
         func_frame = inspect.getouterframes(inspect.currentframe())[1].frame
-        func_frame.f_trace = self._trace_func
-        sys.settrace(lambda *_args: None)
+        self._tool_id = monitoring.acquire_tool_id()
+        if self._tool_id is None:
+            func_frame.f_trace = self._trace_func
+            sys.settrace(lambda *_args: None)
+        else:
+            self._func_frame = func_frame
+            sys.monitoring.register_callback(
+                self._tool_id, sys.monitoring.events.LINE, self._monitor_line
+            )
+            sys.monitoring.set_local_events(
+                self._tool_id, func_frame.f_code, sys.monitoring.events.LINE
+            )
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Remove the trace function. If webstepper=True, open a Webstepper webpage."""
-        sys.settrace(None)
+        """Remove the trace function and render the memory model diagrams of the snapshots.
+        If webstepper=True, open a Webstepper webpage."""
         func_frame = inspect.getouterframes(inspect.currentframe())[1]
-        func_frame.frame.f_trace = None
+        if self._tool_id is None:
+            sys.settrace(None)
+            func_frame.frame.f_trace = None
+        else:
+            monitoring.release_tool_id(self._tool_id, [func_frame.frame.f_code])
+            self._tool_id = None
+            self._func_frame = None
+        if exc_type is None:
+            self._render_snapshots()
+        else:
+            # Only log the errors rendering the diagrams, so that they do not replace the error
+            # raised in the with block
+            try:
+                self._render_snapshots()
+            except (subprocess.CalledProcessError, OSError) as e:
+                logging.error(f"Could not render all memory model diagrams: {e}")
         if self.webstepper:
             self._build_result_html(func_frame.frame)
             self._open_html()
 
     def _build_result_html(self, func_frame: types.FrameType) -> None:
         """Build and write the Webstepper html to the output directory"""
+        from bs4 import BeautifulSoup
+
         snapshot_tracer_dir = os.path.dirname(os.path.abspath(__file__))
 
         html_content = self._read_original_html(snapshot_tracer_dir)
@@ -146,6 +237,8 @@ class SnapshotTracer:
 
     def _insert_data(self, soup: BeautifulSoup, func_frame: types.FrameType) -> None:
         """Insert the SVG array and code string into the Webstepper index HTML."""
+        from bs4 import BeautifulSoup
+
         insert_script = (
             f"<script>window.codeText=`{self._get_code(func_frame)}` </script>\n"
             + f"<script>window.svgArray={json.dumps(self._snapshots)}</script>\n"
@@ -2,6 +2,7 @@
 
 from .checkers import patch_checkers
 from .messages import patch_messages
+from .tokens import patch_tokenize_module
 from .transforms import patch_ast_transforms
 
 
@@ -10,3 +11,4 @@ def patch_all():
     patch_checkers()
     patch_ast_transforms()
     patch_messages()
+    patch_tokenize_module()
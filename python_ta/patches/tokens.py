@@ -0,0 +1,26 @@
+"""Patch pylint to reuse the tokens of the module being checked."""
+
+from pylint.utils import utils
+
+from ..util.source import get_source_bundle
+
+
+def patch_tokenize_module():
+    """Patch pylint's tokenize_module to return the tokens of the module's source bundle,
+    rather than tokenizing the module again.
+    """
+    old_tokenize_module = utils.tokenize_module
+
+    def new_tokenize_module(node):
+        if node.file is None:
+            return old_tokenize_module(node)
+        try:
+            source = get_source_bundle(node.file)
+        except OSError:
+            return old_tokenize_module(node)
+        # Only use the bundle that the module was parsed from (see setendings.register)
+        if source.module is not node:
+            return old_tokenize_module(node)
+        return list(source.tokens)
+
+    utils.tokenize_module = new_tokenize_module
@@ -4,6 +4,7 @@ import logging
 
 from pylint.lint import PyLinter
 
+from ..cfg.graph import Z3_FUNCTION_TIMEOUT, Z3_MAX_PATHS, Z3_TIMEOUT
 from ..cfg.visitor import CFGVisitor
 
 
@@ -28,7 +29,16 @@ def patch_ast_transforms():
         # Run the CFGVisitor
         try:
             if runtime_z3:
-                ast.accept(CFGVisitor(options={"separate-condition-blocks": True}, z3_enabled=True))
+                options = {
+                    "separate-condition-blocks": True,
+                    "z3-max-paths": getattr(self.config, "z3_max_paths", Z3_MAX_PATHS),
+                    "z3-timeout": getattr(self.config, "z3_timeout", Z3_TIMEOUT),
+                    "z3-function-timeout": getattr(
+                        self.config, "z3_function_timeout", Z3_FUNCTION_TIMEOUT
+                    ),
+                    "z3-max-memory": getattr(self.config, "z3_max_memory", 0),
+                }
+                ast.accept(CFGVisitor(options=options, z3_enabled=True))
             else:
                 ast.accept(CFGVisitor())
         except Exception as e:
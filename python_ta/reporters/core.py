@@ -7,10 +7,11 @@ import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import IO, TYPE_CHECKING, Optional, Union
+from typing import IO, TYPE_CHECKING, Collection, Optional, Union
 
 from pylint.reporters import BaseReporter
 
+from ..util.source import get_source_bundle
 from .node_printers import LineType, render_message
 
 if TYPE_CHECKING:
@@ -171,6 +172,15 @@ class PythonTaReporter(BaseReporter):
         been aggregated.
         """
 
+    def display_file_updates(self, paths: Collection[str]) -> bool:
+        """Display the messages for the given files, which have been checked again in watch mode,
+        without displaying the messages for the other files.
+
+        Return whether the messages were displayed. By default, this is not supported and False
+        is returned, in which case the whole report is generated again.
+        """
+        return False
+
     # Rendering
     def _build_snippet(self, msg: Message, node: NodeNG) -> str:
         """Return a code snippet for the given Message object, formatted appropriately according
@@ -271,8 +281,7 @@ class PythonTaReporter(BaseReporter):
         if self.current_file not in self.messages:
             self.messages[self.current_file] = []
 
-        with open(filepath, encoding="utf-8") as f:
-            self.source_lines = [line.rstrip("\r\n") for line in f.readlines()]
+        self.source_lines = [line.rstrip("\r\n") for line in get_source_bundle(filepath).lines]
 
     def on_close(self, stats, previous_stats):
         """Hook called when a module finished analyzing.
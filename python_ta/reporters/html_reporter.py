@@ -1,12 +1,15 @@
+import json
 import os
 import socket
 import sys
+from typing import Collection
 
 from jinja2 import Environment, FileSystemLoader
 from pygments import highlight
 from pygments.formatters import HtmlFormatter
 from pygments.lexers import PythonLexer
 from pylint.lint import PyLinter
+from pylint.message import Message
 from pylint.reporters.ureports.nodes import BaseLayout
 
 from ..util.servers.one_shot_server import open_html_in_browser
@@ -14,6 +17,9 @@ from ..util.servers.persistent_server import PersistentHTMLServer
 from .core import PythonTaReporter
 
 TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+# Templates for the parts of the default template describing a single file
+FILE_TOC_TEMPLATE = "file_toc.html.jinja"
+FILE_SECTION_TEMPLATE = "file_section.html.jinja"
 
 
 class HTMLReporter(PythonTaReporter):
@@ -48,6 +54,8 @@ class HTMLReporter(PythonTaReporter):
     OUTPUT_FILENAME = "pyta_report.html"
     port = None
     persistent_server = None
+    # The paths of the files in the report, in the order they were last rendered
+    _report_paths: list[str] = []
 
     def print_messages(self, level="all"):
         """Do nothing to print messages, since all are displayed in a single HTML file."""
@@ -65,17 +73,8 @@ class HTMLReporter(PythonTaReporter):
         grouped_messages = {
             path: self.group_messages(msgs) for path, msgs in self.gather_messages().items()
         }
+        self._report_paths = list(grouped_messages)
 
-        template_f = self.linter.config.pyta_template_file
-        template_f = (
-            template_f if template_f != "" else os.path.join(TEMPLATES_DIR, "template.html.jinja")
-        )
-        path = os.path.abspath(template_f)
-        filename, file_parent_directory = os.path.basename(path), os.path.dirname(path)
-
-        template = Environment(loader=FileSystemLoader(file_parent_directory)).get_template(
-            filename
-        )
         if not self.port:
             self.port = (
                 _find_free_port()
@@ -85,20 +84,7 @@ class HTMLReporter(PythonTaReporter):
         if not self.persistent_server:
             self.persistent_server = PersistentHTMLServer(self.port)
 
-        # Embed resources so the output html can go anywhere, independent of assets.
-        # with open(os.path.join(TEMPLATES_DIR, 'pyta_logo_markdown.png'), 'rb+') as image_file:
-        #     # Encode img binary to base64 (+33% size), decode to remove the "b'"
-        #     pyta_logo_base64_encoded = b64encode(image_file.read()).decode()
-
-        # Render the jinja template
-        rendered_template = template.render(
-            date_time=self._generate_report_date_time(),
-            port=self.port,
-            reporter=self,
-            grouped_messages=grouped_messages,
-            os=os,
-            enumerate=enumerate,
-        )
+        rendered_template = self._render_report(grouped_messages, self._generate_report_date_time())
 
         # If a filepath was specified, write to the file
         if self.out is not sys.stdout:
@@ -120,6 +106,90 @@ class HTMLReporter(PythonTaReporter):
                     file=sys.stderr,
                 )
 
+    def display_file_updates(self, paths: Collection[str]) -> bool:
+        """Send the messages for the given files to the report open in the web browser, without
+        rendering or reloading the rest of the report.
+
+        This is only possible when the report is served by the persistent server using the default
+        template, and the files in the report have not changed since it was last rendered.
+        """
+        if (
+            self.persistent_server is None
+            or not self.persistent_server.server_started
+            or self.out is not sys.stdout
+            or self.linter.config.pyta_template_file != ""
+        ):
+            return False
+
+        grouped_messages = {
+            path: self.group_messages(msgs) for path, msgs in self.gather_messages().items()
+        }
+        if list(grouped_messages) != self._report_paths:
+            return False
+
+        environment = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+        toc_template = environment.get_template(FILE_TOC_TEMPLATE)
+        section_template = environment.get_template(FILE_SECTION_TEMPLATE)
+        files = []
+        for filenum, (filename, messages) in enumerate(grouped_messages.items()):
+            if filename not in paths:
+                continue
+            context = {
+                "filenum": filenum,
+                "filename": filename,
+                "messages": messages,
+                "limit": self.linter.config.pyta_number_of_messages,
+                "reporter": self,
+                "os": os,
+            }
+            files.append(
+                {
+                    "index": filenum,
+                    "toc": toc_template.render(context),
+                    "section": section_template.render(context),
+                }
+            )
+
+        date_time = self._generate_report_date_time()
+        update = json.dumps({"dateTime": date_time, "files": files})
+        # The whole report is only rendered again when it is next requested from the server
+        self.persistent_server.send_file_updates(
+            update, lambda: self._render_report(grouped_messages, date_time).encode("utf8")
+        )
+        return True
+
+    def _render_report(
+        self,
+        grouped_messages: dict[str, tuple[dict[str, list[Message]], dict[str, list[Message]]]],
+        date_time: str,
+    ) -> str:
+        """Render the report template for the given grouped messages."""
+        template_f = self.linter.config.pyta_template_file
+        template_f = (
+            template_f if template_f != "" else os.path.join(TEMPLATES_DIR, "template.html.jinja")
+        )
+        path = os.path.abspath(template_f)
+        filename, file_parent_directory = os.path.basename(path), os.path.dirname(path)
+
+        template = Environment(loader=FileSystemLoader(file_parent_directory)).get_template(
+            filename
+        )
+
+        # Embed resources so the output html can go anywhere, independent of assets.
+        # with open(os.path.join(TEMPLATES_DIR, 'pyta_logo_markdown.png'), 'rb+') as image_file:
+        #     # Encode img binary to base64 (+33% size), decode to remove the "b'"
+        #     pyta_logo_base64_encoded = b64encode(image_file.read()).decode()
+
+        # Render the jinja template
+        return template.render(
+            date_time=date_time,
+            port=self.port,
+            reporter=self,
+            grouped_messages=grouped_messages,
+            os=os,
+            enumerate=enumerate,
+        )
+
     @classmethod
     def _colourify(cls, colour_class: str, text: str) -> str:
         """Return a colourized version of text, using colour_class."""
@@ -53,22 +53,26 @@ document.body.addEventListener("click", (event) => {
   }
 })
 
-document.querySelectorAll(".sidebar button").forEach((button) => {
-  button.addEventListener("click", () => {
-    let collapsible = button.closest(".collapsible")
-
-    if (collapsible) {
-      const ul = collapsible.querySelector("ul")
-      if (ul) {
-        ul.style.display = ul.style.display === "none" ? "block" : "none"
-      }
-    }
+// Listen on the sidebar itself, since its entries are replaced when files are updated
+document.querySelector(".sidebar").addEventListener("click", (event) => {
+  const button = event.target.closest("button")
+  if (!button) {
+    return
+  }
+
+  let collapsible = button.closest(".collapsible")
 
-    const svg = button.querySelector("svg")
-    if (svg) {
-      svg.classList.toggle("collapsed")
+  if (collapsible) {
+    const ul = collapsible.querySelector("ul")
+    if (ul) {
+      ul.style.display = ul.style.display === "none" ? "block" : "none"
     }
-  })
+  }
+
+  const svg = button.querySelector("svg")
+  if (svg) {
+    svg.classList.toggle("collapsed")
+  }
 })
 
 /* Function for animating a collapsible element, adapted from
@@ -118,5 +122,32 @@ const socket = new WebSocket("ws://localhost:{{ port }}/ws")
 socket.onmessage = (event) => {
   if (event.data === "reload") {
     window.location.reload()
+    return
   }
+
+  // Otherwise, the message contains the new contents of the files that were updated
+  const update = JSON.parse(event.data)
+  const time = document.querySelector("header time")
+  if (time) {
+    time.textContent = update.dateTime
+  }
+
+  const tocEntries = document.querySelectorAll(".sidebar > ul > li")
+  update.files.forEach((file) => {
+    const tocEntry = tocEntries[file.index]
+    const section = document.getElementById(String(file.index))
+    if (!tocEntry || !section) {
+      window.location.reload()
+      return
+    }
+    replaceElement(tocEntry, file.toc)
+    replaceElement(section, file.section)
+  })
+}
+
+/* Replace elem with the element described by html. */
+function replaceElement(elem, html) {
+  const template = document.createElement("template")
+  template.innerHTML = html.trim()
+  elem.replaceWith(template.content)
 }
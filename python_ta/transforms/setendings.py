@@ -31,6 +31,8 @@ https://github.com/PyCQA/astroid/blob/master/astroid/transforms.py
 from astroid import nodes
 from astroid.transforms import TransformVisitor
 
+from ..util.source import get_source_bundle
+
 CONSUMABLES = " \n\t\\"
 
 
@@ -652,9 +654,12 @@ def register(linter):
     def new_get_ast(filepath, modname, data):
         ast = old_get_ast(filepath, modname, data)
         if ast is not None:
-            with open(filepath, encoding="utf-8") as f:
-                source_code = f.readlines()
-            ending_transformer = init_register_ending_setters(source_code)
+            source = get_source_bundle(filepath)
+            if data is None:
+                source.module = ast
+                # Let pylint's raw and token checkers read the source from memory
+                ast.file_bytes = source.data
+            ending_transformer = init_register_ending_setters(source.lines)
             ending_transformer.visit(ast)
         return ast
 
@@ -0,0 +1,14 @@
+"""Helpers for the files read by PythonTA."""
+
+from __future__ import annotations
+
+import os
+from typing import AnyStr, Optional
+
+
+def get_mtime(path: AnyStr) -> Optional[float]:
+    """Return the modification time of the file at path, or None if it cannot be accessed."""
+    try:
+        return os.path.getmtime(path)
+    except (OSError, TypeError):
+        return None
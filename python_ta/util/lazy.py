@@ -0,0 +1,28 @@
+"""Lazy imports of modules that take a long time to import.
+
+A module imported with lazy_import is only executed when one of its attributes is first accessed,
+so that entry points of PythonTA that do not use it do not pay for importing it.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Return the module with the given name, which is executed when one of its attributes is first
+    accessed (unless it has already been imported)."""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
@@ -4,6 +4,7 @@ import asyncio
 import logging
 import threading
 import webbrowser
+from typing import Callable
 
 from aiohttp import WSMsgType, web
 
@@ -16,12 +17,17 @@ class PersistentHTMLServer:
     def __init__(self, port: int):
         self.port = port
         self.latest_html = LOADING_HTML
+        # If set, a function rendering the HTML content that replaces latest_html when next served
+        self.render_html = None
         self.websockets = set()
         self.server_started = False
         self.loop = asyncio.get_event_loop()
 
     async def handle_report(self, request: web.Request) -> web.Response:
         """Serve the current HTML content at the root endpoint ('/')."""
+        if self.render_html is not None:
+            self.latest_html = self.render_html()
+            self.render_html = None
         return web.Response(body=self.latest_html, content_type="text/html")
 
     async def handle_websocket(self, request: web.Request) -> web.WebSocketResponse:
@@ -41,11 +47,25 @@ class PersistentHTMLServer:
     async def update_report(self, new_html: bytes) -> None:
         """Update the served HTML content and notify connected WebSocket clients to reload."""
         self.latest_html = new_html
+        self.render_html = None
+        await self._notify_clients("reload")
 
+    async def update_files(self, update: str, render_html: Callable[[], bytes]) -> None:
+        """Send an update of some of the files in the report to connected WebSocket clients.
+
+        `update` is a JSON string describing the updated files. The served HTML content is
+        rendered by `render_html` the next time it is requested, rather than immediately.
+        """
+        self.render_html = render_html
+        await self._notify_clients(update)
+
+    async def _notify_clients(self, message: str) -> None:
+        """Send message to the connected WebSocket clients, or open the report in a web browser
+        if there are none."""
         active = [ws for ws in self.websockets if not ws.closed]
         if active:
             for ws in active:
-                await ws.send_str("reload")
+                await ws.send_str(message)
         else:
             webbrowser.open(f"http://localhost:{self.port}", new=2)
 
@@ -60,6 +80,11 @@ class PersistentHTMLServer:
         else:
             asyncio.run_coroutine_threadsafe(self.update_report(initial_html), self.loop)
 
+    def send_file_updates(self, update: str, render_html: Callable[[], bytes]) -> None:
+        """Send an update of some of the files in the report from another thread.
+        The server must already be running."""
+        asyncio.run_coroutine_threadsafe(self.update_files(update, render_html), self.loop)
+
     async def run_server(self) -> None:
         """Launch the aiohttp web server on the specified port with routes for HTML and WebSocket."""
         app = web.Application()
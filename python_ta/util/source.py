@@ -0,0 +1,115 @@
+"""Shared access to the source of the files being checked.
+
+Several stages of checking a file need its source code: verify_pre_check tokenizes it, the
+setendings transforms and the reporters need its lines, the pycodestyle checker checks its lines,
+and pylint parses and tokenizes it. A SourceBundle reads a file once and computes each of these
+forms at most once, so that they are shared by every stage rather than recomputed by each.
+
+Bundles are cached by get_source_bundle and are discarded when the file is modified.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import os
+import tokenize
+from collections import OrderedDict
+from functools import cached_property
+from typing import TYPE_CHECKING, AnyStr, Optional
+
+if TYPE_CHECKING:
+    from astroid import nodes
+
+# Maximum number of source bundles kept by get_source_bundle
+SOURCE_BUNDLE_CACHE_SIZE = 64
+
+# Cache of source bundles, keyed by absolute file path
+_SOURCE_BUNDLES: OrderedDict[str, SourceBundle] = OrderedDict()
+
+
+class SourceBundle:
+    """The source code of a file, in the forms used to check it.
+
+    Instance attributes:
+        - path: the absolute path of the file
+        - signature: the modification time and size of the file when it was read
+        - data: the contents of the file
+        - module: the astroid module parsed from the file, once it has been parsed
+
+    The encoding, lines, tokens and hash of the file are computed when first accessed.
+    """
+
+    path: str
+    signature: tuple[int, int]
+    data: bytes
+    module: Optional[nodes.Module]
+
+    def __init__(self, path: str, signature: tuple[int, int], data: bytes) -> None:
+        self.path = path
+        self.signature = signature
+        self.data = data
+        self.module = None
+
+    @cached_property
+    def encoding(self) -> str:
+        """The encoding of the file, as detected by tokenize.detect_encoding."""
+        encoding, _ = tokenize.detect_encoding(io.BytesIO(self.data).readline)
+        return encoding
+
+    @cached_property
+    def lines(self) -> list[str]:
+        """The lines of the file, including line endings, as returned by tokenize.open.
+
+        Line endings are normalized to "\\n".
+        """
+        return io.StringIO(self.data.decode(self.encoding), newline=None).readlines()
+
+    @cached_property
+    def tokens(self) -> list[tokenize.TokenInfo]:
+        """The tokens of the file, as returned by tokenize.tokenize (starting with the
+        ENCODING token).
+
+        Raises tokenize.TokenError or SyntaxError if the file cannot be tokenized.
+        """
+        return list(tokenize.tokenize(io.BytesIO(self.data).readline))
+
+    @cached_property
+    def sha256(self) -> str:
+        """The SHA-256 hash of the contents of the file, as a hexadecimal string."""
+        return hashlib.sha256(self.data).hexdigest()
+
+
+def get_source_bundle(filepath: AnyStr) -> SourceBundle:
+    """Return the source bundle for the file at filepath.
+
+    The file is only read again if it has been modified since its bundle was created.
+    Raises OSError if the file cannot be read.
+    """
+    path = os.path.abspath(os.path.expanduser(filepath))
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    bundle = _SOURCE_BUNDLES.get(path)
+    if bundle is not None and bundle.signature == signature:
+        _SOURCE_BUNDLES.move_to_end(path)
+        return bundle
+
+    with open(path, "rb") as f:
+        data = f.read()
+    bundle = SourceBundle(path, signature, data)
+    _SOURCE_BUNDLES[path] = bundle
+    _SOURCE_BUNDLES.move_to_end(path)
+    while len(_SOURCE_BUNDLES) > SOURCE_BUNDLE_CACHE_SIZE:
+        _SOURCE_BUNDLES.popitem(last=False)
+    return bundle
+
+
+def discard_source_bundle(filepath: AnyStr) -> None:
+    """Discard the source bundle for the file at filepath, if there is one."""
+    _SOURCE_BUNDLES.pop(os.path.abspath(os.path.expanduser(filepath)), None)
+
+
+def clear_source_bundles() -> None:
+    """Discard all source bundles."""
+    _SOURCE_BUNDLES.clear()
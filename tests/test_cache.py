@@ -0,0 +1,225 @@
+"""
+Contains tests for caching the results of python_ta.check_all on disk (the pyta-cache-dir option).
+"""
+
+import io
+import os
+import time
+
+from pylint.lint import PyLinter
+
+import python_ta
+from python_ta.check.cache import CACHE_ENTRY_EXTENSION, evict_cache_entries
+from python_ta.reporters.core import PythonTaReporter
+
+SOURCE = """def foo(x):\n    return x\n"""
+
+
+def _check(file_path: str, cache_dir: str, **kwargs) -> tuple[PythonTaReporter, str]:
+    """Check the given file with the given cache directory, returning the reporter and output."""
+    output = io.StringIO()
+    reporter = python_ta.check_all(
+        file_path,
+        config={
+            "output-format": "pyta-json",
+            "pyta-cache-dir": cache_dir,
+            "pyta-error-permission": "no",
+            "pyta-file-permission": "no",
+        },
+        output=output,
+        **kwargs,
+    )
+    return reporter, output.getvalue()
+
+
+def _cache_entries(cache_dir: str) -> list[str]:
+    """Return the cache entries in the given cache directory."""
+    if not os.path.isdir(cache_dir):
+        return []
+    return [f for f in os.listdir(cache_dir) if f.endswith(CACHE_ENTRY_EXTENSION)]
+
+
+def test_cache_reports_same_messages_without_linting(tmp_path, mocker) -> None:
+    """Test that an unchanged file is reported from the cache, with the same messages and snippets,
+    without being linted again."""
+    file_path = str(tmp_path / "foo.py")
+    cache_dir = str(tmp_path / ".pyta_cache")
+    with open(file_path, "w") as f:
+        f.write(SOURCE)
+
+    _, first_output = _check(file_path, cache_dir)
+    assert len(_cache_entries(cache_dir)) == 1
+
+    spy = mocker.spy(PyLinter, "check")
+    reporter, second_output = _check(file_path, cache_dir)
+
+    spy.assert_not_called()
+    assert first_output == second_output
+    assert "missing-function-docstring" in {msg.symbol for msg in reporter.messages[file_path]}
+
+
+def test_cache_prefetch_reads_entries_once(tmp_path, mocker) -> None:
+    """Test that a cached file is neither type checked ahead of linting nor read from the cache
+    more than once when the mypy-batch option is enabled."""
+    file_path = str(tmp_path / "foo.py")
+    cache_dir = str(tmp_path / ".pyta_cache")
+    with open(file_path, "w") as f:
+        f.write(SOURCE)
+    config = {"output-format": "pyta-json", "pyta-cache-dir": cache_dir, "mypy-batch": True}
+    python_ta.check_all(file_path, config=config, output=io.StringIO())
+
+    load_spy = mocker.spy(python_ta.check.helpers, "load_cache_entry")
+    mypy_spy = mocker.spy(python_ta.check.helpers, "run_mypy_batch")
+    python_ta.check_all(file_path, config=config, output=io.StringIO())
+
+    assert load_spy.call_count == 1
+    mypy_spy.assert_not_called()
+
+
+def test_cache_restores_module_and_stats(tmp_path) -> None:
+    """Test that a file reported from the cache has the same module name and linter stats as when
+    it was linted."""
+    file_paths = [str(tmp_path / "foo.py"), str(tmp_path / "bar.py")]
+    cache_dir = str(tmp_path / ".pyta_cache")
+    for file_path in file_paths:
+        with open(file_path, "w") as f:
+            f.write(SOURCE)
+
+    results = []
+    for _ in range(2):
+        module_names = []
+        for file_path in file_paths:
+            linter = python_ta.check.helpers.get_linter(
+                config={"pyta-cache-dir": cache_dir}, file_linted=file_path
+            )
+            python_ta.check.helpers.lint_file(linter, file_path)
+            module_names.append(linter.reporter.module_name)
+        results.append((module_names, linter.stats.by_msg, linter.stats.convention))
+
+    assert len(_cache_entries(cache_dir)) == 2
+    assert results[0] == results[1]
+    assert results[1][0] == ["foo", "bar"]
+
+
+def test_cache_stats_exclude_config_messages(tmp_path) -> None:
+    """Test that the messages emitted while loading a configuration file are not stored in the
+    cache, so they are not counted again when a file is reported from the cache."""
+    file_path = str(tmp_path / "foo.py")
+    cache_dir = str(tmp_path / ".pyta_cache")
+    config_path = str(tmp_path / "test.pylintrc")
+    with open(file_path, "w") as f:
+        f.write(SOURCE)
+    with open(config_path, "w") as f:
+        f.write(f"[CUSTOM PYTA OPTIONS]\npyta-cache-dir = {cache_dir}\n\n")
+        f.write("[MESSAGES CONTROL]\ndisable = ooga\n")
+
+    results = []
+    for _ in range(2):
+        linter = python_ta.check.helpers.get_linter(config=config_path, file_linted=file_path)
+        assert linter.stats.by_msg
+        python_ta.check.helpers.lint_file(linter, file_path)
+        results.append(linter.stats.by_msg)
+
+    assert len(_cache_entries(cache_dir)) == 1
+    assert results[0] == results[1]
+
+
+def test_cache_rechecks_modified_file(tmp_path) -> None:
+    """Test that a file is checked again after it has been modified."""
+    file_path = str(tmp_path / "foo.py")
+    cache_dir = str(tmp_path / ".pyta_cache")
+    with open(file_path, "w") as f:
+        f.write(SOURCE)
+    _check(file_path, cache_dir)
+
+    with open(file_path, "w") as f:
+        f.write('"""Module docstring."""\n' + SOURCE)
+    reporter, _ = _check(file_path, cache_dir)
+
+    assert len(_cache_entries(cache_dir)) == 2
+    assert "missing-module-docstring" not in {msg.symbol for msg in reporter.messages[file_path]}
+
+
+def test_cache_rechecks_with_different_config(tmp_path) -> None:
+    """Test that a file is checked again when the configuration changes."""
+    file_path = str(tmp_path / "foo.py")
+    cache_dir = str(tmp_path / ".pyta_cache")
+    with open(file_path, "w") as f:
+        f.write(SOURCE)
+    _check(file_path, cache_dir)
+
+    output = io.StringIO()
+    reporter = python_ta.check_all(
+        file_path,
+        config={
+            "output-format": "pyta-json",
+            "pyta-cache-dir": cache_dir,
+            "disable": ["missing-function-docstring"],
+        },
+        output=output,
+    )
+
+    assert len(_cache_entries(cache_dir)) == 2
+    assert "missing-function-docstring" not in {msg.symbol for msg in reporter.messages[file_path]}
+
+
+def test_no_cache(tmp_path, mocker) -> None:
+    """Test that the cache is neither read nor written when use_cache is False."""
+    file_path = str(tmp_path / "foo.py")
+    cache_dir = str(tmp_path / ".pyta_cache")
+    with open(file_path, "w") as f:
+        f.write(SOURCE)
+
+    _check(file_path, cache_dir, use_cache=False)
+    assert _cache_entries(cache_dir) == []
+
+    _check(file_path, cache_dir)
+    spy = mocker.spy(PyLinter, "check")
+    _check(file_path, cache_dir, use_cache=False)
+
+    spy.assert_called_once()
+
+
+def test_cache_parallel(tmp_path) -> None:
+    """Test that results cached by worker processes are reused by a sequential check."""
+    file_paths = [str(tmp_path / f"foo{i}.py") for i in range(3)]
+    cache_dir = str(tmp_path / ".pyta_cache")
+    for file_path in file_paths:
+        with open(file_path, "w") as f:
+            f.write(SOURCE)
+
+    _, parallel_output = _check(str(tmp_path), cache_dir, jobs=2)
+    assert len(_cache_entries(cache_dir)) == len(file_paths)
+
+    _, sequential_output = _check(str(tmp_path), cache_dir)
+    assert parallel_output == sequential_output
+
+
+def test_evict_cache_entries_by_age(tmp_path) -> None:
+    """Test that cache entries older than the maximum age are removed."""
+    old_entry = tmp_path / ("old" + CACHE_ENTRY_EXTENSION)
+    new_entry = tmp_path / ("new" + CACHE_ENTRY_EXTENSION)
+    old_entry.write_bytes(b"old")
+    new_entry.write_bytes(b"new")
+    old_time = time.time() - 3 * 24 * 60 * 60
+    os.utime(old_entry, (old_time, old_time))
+
+    evict_cache_entries(str(tmp_path), max_size=0, max_age=2)
+
+    assert _cache_entries(str(tmp_path)) == [new_entry.name]
+
+
+def test_evict_cache_entries_by_size(tmp_path) -> None:
+    """Test that the least recently used cache entries are removed when the cache is too large."""
+    now = time.time()
+    for i in range(3):
+        entry = tmp_path / (f"entry{i}" + CACHE_ENTRY_EXTENSION)
+        entry.write_bytes(b"x" * 400 * 1024)
+        os.utime(entry, (now - 10 * (3 - i), now - 10 * (3 - i)))
+
+    evict_cache_entries(str(tmp_path), max_size=1, max_age=0)
+
+    assert sorted(_cache_entries(str(tmp_path))) == [
+        "entry1" + CACHE_ENTRY_EXTENSION,
+        "entry2" + CACHE_ENTRY_EXTENSION,
+    ]
@@ -1,6 +1,8 @@
+from typing import Any, Optional
 from unittest.mock import patch
 
 import astroid
+import z3
 
 from python_ta.cfg import CFGVisitor, ControlFlowGraph
 from python_ta.transforms.z3_visitor import Z3Visitor
@@ -334,6 +336,71 @@ def test_variable_reassignment() -> None:
     )
 
 
+def test_feasibility_shared_solver(mocker) -> None:
+    src = """
+    def func(x: int, y: int) -> None:
+        '''
+        Preconditions:
+            - x > 0
+        '''
+        if y > 0:
+            print(y)
+        else:
+            print(x)
+        if x < 0:
+            print("unreachable")
+    """
+    check_spy = mocker.spy(z3.Solver, "check")
+    solver_spy = mocker.spy(z3, "Solver")
+    cfg = _create_cfg(src, "func")
+
+    constraint_sets = {
+        frozenset(constraint.get_id() for constraint in constraints)
+        for edge in cfg.get_edges()
+        for constraints in edge.z3_constraints.values()
+    }
+    assert solver_spy.call_count == 1
+    constraint_lists_count = sum(len(edge.z3_constraints) for edge in cfg.get_edges())
+    # Each set of constraints is checked at most once
+    assert check_spy.call_count <= len(constraint_sets) < constraint_lists_count
+    assert [edge.is_feasible for edge in cfg.get_edges()].count(False) == 2
+
+
+def test_feasible_timeout() -> None:
+    src = """
+    def func(x: int, y: int, z: int) -> None:
+        '''
+        Preconditions:
+            - x > 0 and y > 0 and z > 0
+            - x ** 3 + y ** 3 == z ** 3
+        '''
+        if x > 1:
+            print(x)
+    """
+    cfg = _create_cfg(src, "func", {"z3-timeout": 50, "z3-function-timeout": 0})
+    assert all(edge.is_feasible for edge in cfg.get_edges())
+    assert cfg.z3_skipped_checks > 0
+
+
+def test_feasible_function_timeout() -> None:
+    src = """
+    def func(x: int, y: int, z: int) -> None:
+        '''
+        Preconditions:
+            - x > 0 and y > 0 and z > 0
+            - x ** 3 + y ** 3 == z ** 3
+        '''
+        if x > 1:
+            print(x)
+        if x < 0:
+            print(x)
+    """
+    cfg = _create_cfg(src, "func", {"z3-timeout": 0, "z3-function-timeout": 50})
+    # The checks after the first one are skipped, including the check of x < 0
+    assert all(edge.is_feasible for edge in cfg.get_edges())
+    assert cfg.z3_skipped_checks > 0
+
+
 @patch.dict("sys.modules", {"z3": None})
 def test_z3_dependency_uninstalled() -> None:
     src = """
@@ -358,14 +425,14 @@ def test_z3_dependency_uninstalled() -> None:
     assert all(edge.is_feasible for edge in cfg.get_edges())
 
 
-def _create_cfg(src: str, name: str) -> ControlFlowGraph:
+def _create_cfg(src: str, name: str, options: Optional[dict[str, Any]] = None) -> ControlFlowGraph:
     """
     Return the control flow graph of given function
     generated from the source code
     """
     z3v = Z3Visitor()
     mod = z3v.visitor.visit(astroid.parse(src))
-    visitor = CFGVisitor(z3_enabled=True)
+    visitor = CFGVisitor(options=options, z3_enabled=True)
     mod.accept(visitor)
 
     # find the function definition node
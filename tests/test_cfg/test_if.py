@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import sys
+
 import astroid
 
 from python_ta.cfg import CFGVisitor, ControlFlowGraph
@@ -194,3 +196,17 @@ def test_nested_if_with_separate_conditions() -> None:
         ["print('bye')"],
     ]
     assert _extract_blocks(build_cfg_separate_conditions(src)) == expected_blocks
+
+
+def test_many_if_statements() -> None:
+    """Test that the blocks and edges of a graph deeper than the recursion limit can be traversed."""
+    src = "\n".join(f"if x > {i}:\n    print({i})" for i in range(sys.getrecursionlimit()))
+    cfg = build_cfg(src)
+
+    blocks = list(cfg.get_blocks())
+    # Each if statement has a block for its condition and a block for its body, plus the end block
+    assert len(blocks) == 2 * sys.getrecursionlimit() + 1
+    assert blocks[0] is cfg.start
+    assert set(cfg.get_blocks_postorder()) == set(blocks)
+    assert list(cfg.get_blocks_postorder())[0] is cfg.end
+    assert len(list(cfg.get_edges())) == 3 * sys.getrecursionlimit()
@@ -1,3 +1,5 @@
+from typing import Any, Optional
+
 import astroid
 import z3
 
@@ -675,14 +677,93 @@ def test_ignored_while_condition() -> None:
     assert all(value == expected for value in edge_values)
 
 
-def _create_cfg(src: str, name: str) -> ControlFlowGraph:
+def test_max_paths_exceeded() -> None:
+    src = """
+    def func(x: int, y: int) -> None:
+        '''
+        Preconditions:
+            - x > 0
+        '''
+        if y > 5:
+            print(x)
+        else:
+            print(y)
+        print(x + y)
+    """
+    cfg = _create_cfg(src, "func", {"z3-max-paths": 1})
+    x = z3.Int("x")
+    y = z3.Int("y")
+    assert cfg.end.predecessors[0].z3_constraints == {
+        0: [z3.simplify(x > 0), z3.Or(y > 5, z3.Not(y > 5))]
+    }
+
+
+def test_max_paths_exceeded_reassignment() -> None:
+    src = """
+    def func(x: int, y: int) -> None:
+        '''
+        Preconditions:
+            - x > 0
+            - y > 0
+        '''
+        if y > 5:
+            x = 0
+        print(x)
+        if x > 0:
+            print(y)
+    """
+    cfg = _create_cfg(src, "func", {"z3-max-paths": 1})
+    y = z3.Int("y")
+    # x is reassigned on one of the paths, so constraints with x are discarded after the if
+    x_edge = next(
+        edge
+        for edge in cfg.get_edges()
+        if edge.condition is not None and edge.condition.as_string() == "x > 0"
+    )
+    assert x_edge.z3_constraints == {0: [z3.simplify(y > 0), z3.Or(y > 5, z3.Not(y > 5))]}
+
+
+def test_max_paths_not_exceeded() -> None:
+    src = """
+    def func(x: int, y: int) -> None:
+        if y > 5:
+            print(x)
+        else:
+            print(y)
+        print(x + y)
+    """
+    cfg = _create_cfg(src, "func", {"z3-max-paths": 2})
+    assert len(cfg.end.predecessors[0].z3_constraints) == 2
+
+
+def test_many_branches() -> None:
+    branches = "\n".join(f"        if x > {i}:\n            print({i})" for i in range(30))
+    src = f"""
+    def func(x: int) -> None:
+        '''
+        Preconditions:
+            - x > 0
+        '''
+{branches}
+        if x < 0:
+            print(x)
+    """
+    cfg = _create_cfg(src, "func")
+    x = z3.Int("x")
+    assert all(list(edge.z3_constraints) == [0] for edge in cfg.get_edges())
+    assert all(edge.z3_constraints[0][0] == z3.simplify(x > 0) for edge in cfg.get_edges())
+    # The False branch of x > 0, and the True branch of x < 0 and the edge leaving it
+    assert [edge.is_feasible for edge in cfg.get_edges()].count(False) == 3
+
+
+def _create_cfg(src: str, name: str, options: Optional[dict[str, Any]] = None) -> ControlFlowGraph:
     """
     Return the control flow graph of given function
     generated from the source code
     """
     z3v = Z3Visitor()
     mod = z3v.visitor.visit(astroid.parse(src))
-    visitor = CFGVisitor(z3_enabled=True)
+    visitor = CFGVisitor(options=options, z3_enabled=True)
     mod.accept(visitor)
 
     # find the function definition node
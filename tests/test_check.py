@@ -19,6 +19,7 @@ from subprocess import Popen
 import pytest
 
 import python_ta
+from python_ta.check import parallel
 
 INPUTS = {
     "test_check_on_file": [
@@ -277,6 +278,24 @@ def test_check_error_raise(input_file: str | list[str]) -> None:
         )
 
 
+def test_check_error_raise_after_previous_files(tmp_path: Path) -> None:
+    """Test that setting on_verify_fail='raise' reports the messages of the files checked before
+    the file that cannot be checked."""
+    (tmp_path / "valid.py").write_text("def f() -> None:\n    x = 1\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "invalid.py").write_text("x = (\n")
+    output = io.StringIO()
+
+    with pytest.raises(tokenize.TokenError):
+        python_ta.check_all(
+            str(tmp_path),
+            config={"output-format": "pyta-plain"},
+            output=output,
+            on_verify_fail="raise",
+        )
+    assert "unused-variable" in output.getvalue()
+
+
 @pytest.mark.parametrize("input_file", INPUTS["test_check_error_log"])
 def test_check_error_log(input_file: str | list[str]) -> None:
     """Test that setting on_verify_fail='log' preserves default behaviour when inputting an invalid file."""
@@ -289,6 +308,153 @@ def test_check_error_log(input_file: str | list[str]) -> None:
     )
 
 
+def test_check_parallel_matches_sequential() -> None:
+    """Test that checking files with several worker processes reports the same messages, in the
+    same order, as checking them one at a time."""
+    config = {
+        "output-format": "pyta-json",
+        "pyta-error-permission": "no",
+        "pyta-file-permission": "no",
+    }
+    outputs = []
+    reported_messages = []
+    for jobs in (1, 2):
+        output = io.StringIO()
+        reporter = python_ta.check_all(
+            ["tests/fixtures/sample_dir", "examples/nodes/const.py"],
+            config=config,
+            output=output,
+            jobs=jobs,
+        )
+        outputs.append(output.getvalue())
+        reported_messages.append(
+            {
+                filename: [(msg.msg_id, msg.line, msg.snippet) for msg in messages]
+                for filename, messages in reporter.gather_messages().items()
+            }
+        )
+
+    assert reported_messages[0] == reported_messages[1]
+    assert outputs[0] == outputs[1]
+
+
+def test_check_parallel_dispatches_all_files_once(mocker) -> None:
+    """Test that the files from every location given to check_all are sent to the worker pool
+    together, rather than one location at a time."""
+    spy = mocker.spy(python_ta, "submit_files_to_pool")
+    file_paths = [
+        "examples/nodes/const.py",
+        "examples/nodes/name.py",
+        "examples/nodes/pass.py",
+    ]
+    python_ta.check_all(
+        file_paths,
+        config={
+            "output-format": "pyta-json",
+            "pyta-error-permission": "no",
+            "pyta-file-permission": "no",
+        },
+        output=io.StringIO(),
+        jobs=2,
+    )
+
+    spy.assert_called_once()
+    assert spy.call_args.args[1] == file_paths
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_check_uploads_each_location(monkeypatch, tmp_path: Path, jobs: int) -> None:
+    """Test that the results of each location given to check_all are uploaded separately, and
+    that the results of a location with a file that cannot be checked are not uploaded."""
+    uploads = []
+    monkeypatch.setattr(
+        python_ta,
+        "upload_linter_results",
+        lambda linter, reporter, f_paths, config: uploads.append(list(f_paths)),
+    )
+    file_paths = [str(tmp_path / "a.py"), str(tmp_path / "b.py")]
+    for file_path in file_paths:
+        with open(file_path, "w") as f:
+            f.write("def f() -> None:\n    x = 1\n")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "invalid.py").write_text("x = (\n")
+
+    with pytest.raises(tokenize.TokenError):
+        python_ta.check_all(
+            file_paths + [str(tmp_path / "sub")],
+            config={
+                "output-format": "pyta-plain",
+                "pyta-error-permission": "no",
+                "pyta-file-permission": "yes",
+            },
+            output=io.StringIO(),
+            on_verify_fail="raise",
+            jobs=jobs,
+        )
+
+    assert uploads == [[file_paths[0]], [file_paths[1]]]
+
+
+def test_check_files_in_worker_mypy_batch(monkeypatch) -> None:
+    """Test that a worker process runs mypy once over its share of the files when the mypy-batch
+    option is enabled."""
+    batches = []
+    monkeypatch.setattr(
+        python_ta.check.helpers, "run_mypy_batch", lambda files, options: batches.append(files)
+    )
+    monkeypatch.setattr(parallel, "_worker_config", {})
+    directory = "examples/custom_checkers/static_type_checker_examples"
+    file_paths = [
+        os.path.join(directory, "e9951_incompatible_argument_type.py"),
+        os.path.join(directory, "e9952_incompatible_assignment.py"),
+    ]
+    parallel._init_worker({"mypy-batch": True}, True, False, False)
+
+    results = parallel._check_files_in_worker(file_paths)
+
+    assert batches == [file_paths]
+    assert len(results) == len(file_paths)
+
+
+def test_check_mypy_batch_matches_separate_runs() -> None:
+    """Test that running mypy once over all files reports the same messages as running mypy
+    separately for each file."""
+    outputs = []
+    for mypy_batch in (False, True):
+        output = io.StringIO()
+        python_ta.check_all(
+            "examples/custom_checkers/static_type_checker_examples",
+            config={
+                "output-format": "pyta-json",
+                "mypy-batch": mypy_batch,
+                "pyta-error-permission": "no",
+                "pyta-file-permission": "no",
+            },
+            output=output,
+        )
+        outputs.append(output.getvalue())
+
+    assert "incompatible-assignment" in outputs[0]
+    assert outputs[0] == outputs[1]
+
+
+@pytest.mark.parametrize("disable", [[], ["static_type_checker"]])
+def test_prefetch_type_checks_skips_disabled_checker(monkeypatch, disable: list[str]) -> None:
+    """Test that mypy is only run ahead of checking files when the static type checker is enabled."""
+    batches = []
+    monkeypatch.setattr(
+        python_ta.check.helpers, "run_mypy_batch", lambda files, options: batches.append(files)
+    )
+    file_path = (
+        "examples/custom_checkers/static_type_checker_examples/e9951_incompatible_argument_type.py"
+    )
+    python_ta.check.helpers.prefetch_type_checks(
+        [file_path], {"mypy-batch": True, "disable": disable}, True, use_cache=False
+    )
+
+    assert batches == ([] if disable else [[file_path]])
+
+
 def test_check_watch_enabled() -> None:
     """Test PythonTA's watch mode to ensure it detects changes correctly."""
     reset_watch_fixture()
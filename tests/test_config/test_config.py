@@ -5,14 +5,21 @@ Test suite for checking whether configuration worked correctly with user-inputte
 import io
 import json
 import os
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 import pytest
 from pylint import lint
 
 import python_ta
-from python_ta.check.helpers import reset_linter, verify_pre_check
+from python_ta.check import helpers
+from python_ta.check.helpers import (
+    clear_linter_pool,
+    get_linter,
+    reset_linter,
+    verify_pre_check,
+)
 from python_ta.config import load_messages_config, override_config
+from python_ta.util.source import SourceBundle
 
 TEST_CONFIG = {
     "pyta-number-of-messages": 10,
@@ -40,6 +47,15 @@ def configure_linter_load_default():
     yield linter
 
 
+@pytest.fixture
+def linter_pool(monkeypatch):
+    """Start from an empty linter pool, with pooling enabled as it is once pylint has been patched."""
+    monkeypatch.setattr(helpers, "PYLINT_PATCHED", True)
+    clear_linter_pool()
+    yield
+    clear_linter_pool()
+
+
 @pytest.fixture
 def configure_linter_no_default():
     """Create a linter without loading the default PythonTA config settings and override using the
@@ -304,7 +320,8 @@ def test_allow_pylint_comments() -> None:
     set to True
     """
 
-    with patch("python_ta.check.helpers.tokenize.open", mock_open(read_data="# pylint: disable")):
+    source = SourceBundle("", (0, 0), b"# pylint: disable")
+    with patch("python_ta.check.helpers.get_source_bundle", return_value=source):
         result = verify_pre_check("", allow_pylint_comments=True)
 
     assert result is True
@@ -315,7 +332,63 @@ def test_disallows_pylint_comments() -> None:
     is set to False
     """
 
-    with patch("python_ta.check.helpers.tokenize.open", mock_open(read_data="# pylint: disable")):
+    source = SourceBundle("", (0, 0), b"# pylint: disable")
+    with patch("python_ta.check.helpers.get_source_bundle", return_value=source):
         result = verify_pre_check("", allow_pylint_comments=False)
 
     assert result is False
+
+
+def test_get_linter_reuses_linter_for_same_config(linter_pool) -> None:
+    """Test that get_linter returns the same linter object for the same configuration, with a fresh
+    reporter each time."""
+    linter1 = get_linter(config=TEST_CONFIG)
+    reporter1 = linter1.reporter
+    linter2 = get_linter(config=dict(TEST_CONFIG))
+
+    assert linter1 is linter2
+    assert linter2.reporter is not reporter1
+    assert linter2.config.max_line_length == 120
+
+
+def test_get_linter_isolates_different_configs(linter_pool) -> None:
+    """Test that get_linter does not share linters between different configurations."""
+    linter1 = get_linter(config=TEST_CONFIG)
+    linter2 = get_linter(config={**TEST_CONFIG, "max-line-length": 80})
+    linter3 = get_linter(config=TEST_CONFIG, load_default_config=False)
+
+    assert linter1 is not linter2
+    assert linter1 is not linter3
+    assert linter1.config.max_line_length == 120
+    assert linter2.config.max_line_length == 80
+
+
+def test_get_linter_reloads_modified_config_file(linter_pool, tmp_path) -> None:
+    """Test that get_linter constructs a new linter when the config file has been modified."""
+    config = tmp_path / ".pylintrc"
+    config.write_text("[FORMAT]\nmax-line-length = 90\n")
+    linter1 = get_linter(config=str(config))
+
+    config.write_text("[FORMAT]\nmax-line-length = 70\n")
+    mtime = os.path.getmtime(config) + 10
+    os.utime(config, (mtime, mtime))
+    linter2 = get_linter(config=str(config))
+
+    assert linter1 is not linter2
+    assert linter1.config.max_line_length == 90
+    assert linter2.config.max_line_length == 70
+
+
+def test_get_linter_does_not_pool_config_with_errors(linter_pool) -> None:
+    """Test that get_linter does not reuse a linter whose configuration produced messages, so the
+    configuration errors are reported every time."""
+    curr_dir = os.path.dirname(__file__)
+    config = os.path.join(curr_dir, "file_fixtures", "test_with_errors.pylintrc")
+    linter1 = get_linter(config=config)
+    linter2 = get_linter(config=config)
+
+    assert linter1 is not linter2
+    message_ids = [
+        msg.msg_id for message_lis in linter2.reporter.messages.values() for msg in message_lis
+    ]
+    assert all(error in message_ids for error in CONFIG_ERRORS_TO_CHECK)
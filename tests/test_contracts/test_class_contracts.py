@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+import threading
 from dataclasses import dataclass
 from typing import List, Optional, Set, Tuple
 
@@ -619,5 +620,405 @@ def test_method_invariant_set_invalid() -> None:
     )
 
 
+class Thermostat:
+    """Represent a thermostat
+
+    Representation Invariants:
+     - all(reading > -273 for reading in self.readings)
+     - self.low <= self.high
+    """
+
+    readings: list[float]
+    low: float
+    high: float
+    name: str
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.readings = []
+        self.low = 15.0
+        self.high = 25.0
+
+
+def test_invariant_dependencies() -> None:
+    """Test that the attributes each representation invariant depends on are recorded."""
+    assert Thermostat.__invariant_dependencies__ == [
+        frozenset({"readings"}),
+        frozenset({"low", "high"}),
+    ]
+    assert Course.__invariant_dependencies__ == [frozenset({"num_students"}), None]
+
+
+def test_invariant_dependencies_unrelated_attribute_set() -> None:
+    """Test that setting an attribute does not check the representation invariants that do not
+    depend on it."""
+    thermostat = Thermostat("Living room")
+    thermostat.readings.append(-300.0)
+
+    thermostat.name = "Kitchen"
+
+    assert thermostat.name == "Kitchen"
+
+
+def test_invariant_dependencies_related_attribute_set() -> None:
+    """Test that setting an attribute checks the representation invariants that depend on it."""
+    thermostat = Thermostat("Living room")
+
+    with pytest.raises(AssertionError) as exception_info:
+        thermostat.low = 30.0
+
+    assert '"self.low <= self.high" was violated' in str(exception_info.value)
+    assert thermostat.low == 15.0
+
+
+def test_no_premature_check_from_inherited_init() -> None:
+    """Test that representation invariants of a class still being initialized are not checked when
+    a method called from an __init__ inherited from a class without contract checking returns."""
+
+    class Base:
+        def __init__(self) -> None:
+            self.setup()
+
+    @python_ta.contracts.check_contracts
+    class Range(Base):
+        """Representation Invariants:
+        - self.low <= self.high
+        """
+
+        low: int
+        high: int
+
+        def setup(self) -> None:
+            self.set_low()
+            self.high = 10
+
+        def set_low(self) -> None:
+            self.low = 5
+
+    r = Range()
+
+    assert (r.low, r.high) == (5, 10)
+    assert not python_ta.contracts._THREAD_STATE.initializing_instances
+
+
+def test_invariants_checked_after_init_error() -> None:
+    """Test that an instance is no longer considered to be initializing after its __init__ raises
+    an error."""
+
+    @python_ta.contracts.check_contracts
+    class Positive:
+        """Representation Invariants:
+        - self.value > 0
+        """
+
+        value: int
+
+        def __init__(self, value: int, fail: bool = False) -> None:
+            self.value = value
+            if fail:
+                raise ValueError
+
+        def decrement(self) -> None:
+            self.value -= 1
+
+    with pytest.raises(ValueError):
+        Positive(1, fail=True)
+
+    assert not python_ta.contracts._THREAD_STATE.initializing_instances
+    with pytest.raises(AssertionError):
+        Positive(1).decrement()
+
+
+def test_deferred_invariants_checked_at_end() -> None:
+    """Test that representation invariants violated inside a deferred_invariants block are only
+    reported at the end of the block."""
+    thermostat = Thermostat("Living room")
+
+    with pytest.raises(AssertionError) as exception_info:
+        with python_ta.contracts.deferred_invariants():
+            thermostat.low = 30.0
+            assert thermostat.low == 30.0
+
+    assert '"self.low <= self.high" was violated' in str(exception_info.value)
+
+
+def test_deferred_invariants_temporary_violation() -> None:
+    """Test that representation invariants that are violated in the middle of a
+    deferred_invariants block but satisfied at its end are not reported."""
+    thermostat = Thermostat("Living room")
+
+    with python_ta.contracts.deferred_invariants():
+        thermostat.low = 30.0
+        thermostat.high = 35.0
+
+    assert (thermostat.low, thermostat.high) == (30.0, 35.0)
+
+
+def test_deferred_invariants_method_call() -> None:
+    """Test that the representation invariants of an instance are checked once at the end of a
+    deferred_invariants block, rather than after each method call."""
+    person = Person("David", 31, ["Sushi"])
+
+    with pytest.raises(AssertionError) as exception_info:
+        with python_ta.contracts.deferred_invariants():
+            person.change_name("")
+            person.change_name("123")
+
+    assert 'Person representation invariant "is_valid_name(self.name)"' in str(exception_info.value)
+    assert python_ta.contracts._THREAD_STATE.deferred_instances is None
+
+
+def test_deferred_invariants_nested() -> None:
+    """Test that representation invariants are checked at the end of the outermost
+    deferred_invariants block."""
+    thermostat = Thermostat("Living room")
+
+    with python_ta.contracts.deferred_invariants():
+        with python_ta.contracts.deferred_invariants():
+            thermostat.low = 30.0
+        thermostat.high = 35.0
+
+
+def test_deferred_invariants_error_in_block() -> None:
+    """Test that representation invariants are not checked when a deferred_invariants block raises
+    an error."""
+    thermostat = Thermostat("Living room")
+
+    with pytest.raises(ValueError):
+        with python_ta.contracts.deferred_invariants():
+            thermostat.low = 30.0
+            raise ValueError
+
+    assert python_ta.contracts._THREAD_STATE.deferred_instances is None
+
+
+def test_deferred_invariants_other_thread() -> None:
+    """Test that the representation invariants of instances modified by another thread are still
+    checked immediately while a deferred_invariants block runs."""
+    errors = []
+
+    def violate() -> None:
+        try:
+            Thermostat("Kitchen").low = 30.0
+        except AssertionError as e:
+            errors.append(e)
+
+    thermostat = Thermostat("Living room")
+    with python_ta.contracts.deferred_invariants():
+        thread = threading.Thread(target=violate)
+        thread.start()
+        thread.join()
+        assert len(errors) == 1
+        thermostat.low = 30.0
+        thermostat.high = 35.0
+
+    assert '"self.low <= self.high" was violated' in str(errors[0])
+    assert python_ta.contracts._THREAD_STATE.deferred_instances is None
+
+
+def test_no_premature_check_from_unchecked_subclass_init() -> None:
+    """Test that representation invariants are not checked when a method called from the __init__
+    of a subclass without contract checking returns, while the instance is still being
+    initialized."""
+
+    @python_ta.contracts.check_contracts
+    class Parent:
+        """Representation Invariants:
+        - self.x > 0
+        """
+
+        x: int
+
+        def __init__(self) -> None:
+            self.x = 1
+
+        def setup(self) -> None:
+            self.x = -1
+
+    class Child(Parent):
+        def __init__(self) -> None:
+            Parent.__init__(self)
+            self.setup()
+            self.x = 5
+
+    child = Child()
+
+    assert child.x == 5
+    with pytest.raises(AssertionError):
+        child.setup()
+
+
+def test_method_receivers_tracked_without_frame_locals() -> None:
+    """Test that attribute assignments in contract-checked methods, in closures defined in them
+    and in undecorated subclass methods are checked when the method returns, and that the record
+    of the in-progress method calls is emptied even when a method raises an error."""
+
+    @python_ta.contracts.check_contracts
+    class Counter:
+        """Representation Invariants:
+        - self.count >= 0
+        """
+
+        count: int
+
+        def __init__(self) -> None:
+            self.count = 0
+
+        def bump(self) -> None:
+            self.count = -1
+            self.count = 1
+
+        def bump_in_closure(self) -> None:
+            def reset() -> None:
+                self.count = -1
+                self.count = 2
+
+            reset()
+
+        def fail(self) -> None:
+            self.count = 3
+            raise ValueError
+
+    class SubCounter(Counter):
+        def bump_unchecked(self) -> None:
+            self.count = -1
+            self.count = 4
+
+    counter = SubCounter()
+    counter.bump()
+    counter.bump_in_closure()
+    counter.bump_unchecked()
+    with pytest.raises(ValueError):
+        counter.fail()
+
+    assert counter.count == 3
+    assert python_ta.contracts._THREAD_STATE.method_calls == []
+    with pytest.raises(AssertionError):
+        counter.count = -1
+    assert counter.count == 3
+
+
+def test_method_calls_recorded_per_thread() -> None:
+    """Test that the calls to contract-checked methods running in one thread are not seen by the
+    attribute assignments in another thread."""
+    entered = threading.Event()
+    release = threading.Event()
+
+    @python_ta.contracts.check_contracts
+    class Counter:
+        """Representation Invariants:
+        - self.count >= 0
+        """
+
+        count: int
+
+        def __init__(self) -> None:
+            self.count = 0
+
+        def wait_and_bump(self) -> None:
+            entered.set()
+            release.wait(5)
+            self.count = -1
+            self.count = 1
+
+    waiting = Counter()
+    thread = threading.Thread(target=waiting.wait_and_bump)
+    thread.start()
+    try:
+        entered.wait(5)
+        assert python_ta.contracts._THREAD_STATE.method_calls == []
+    finally:
+        release.set()
+        thread.join()
+    counter = Counter()
+    counter.wait_and_bump()
+
+    assert waiting.count == 1
+    assert counter.count == 1
+    assert python_ta.contracts._THREAD_STATE.method_calls == []
+
+
+def test_initialization_recorded_per_thread() -> None:
+    """Test that the representation invariants of an instance are checked after a method call in
+    one thread while another thread is running its __init__ method."""
+    entered = threading.Event()
+    release = threading.Event()
+    instances = []
+
+    @python_ta.contracts.check_contracts
+    class Counter:
+        """Representation Invariants:
+        - self.count >= 0
+        """
+
+        count: int
+
+        def __init__(self) -> None:
+            self.count = 0
+            instances.append(self)
+            entered.set()
+            release.wait(5)
+
+        def decrement(self) -> None:
+            self.count -= 1
+
+    thread = threading.Thread(target=Counter)
+    thread.start()
+    try:
+        entered.wait(5)
+        with pytest.raises(AssertionError):
+            instances[0].decrement()
+        instances[0].count = 0
+    finally:
+        release.set()
+        thread.join()
+
+    assert python_ta.contracts._THREAD_STATE.initializing_instances == {}
+
+
+def test_no_premature_check_from_unchecked_subclass_init_subclass_kwargs() -> None:
+    """Test that the __init__ methods of subclasses without contract checking are tracked when the
+    contract-checked class defines __init_subclass__, and for the subclasses created before the
+    class is decorated."""
+
+    class Parent:
+        """Representation Invariants:
+        - self.x > 0
+        """
+
+        x: int
+        tags: list[str] = []
+
+        def __init__(self) -> None:
+            self.x = 1
+
+        def __init_subclass__(cls, tag: str = "", **kwargs) -> None:
+            super().__init_subclass__(**kwargs)
+            Parent.tags.append(tag)
+
+        def setup(self) -> None:
+            self.x = -1
+
+    class EarlyChild(Parent, tag="early"):
+        def __init__(self) -> None:
+            Parent.__init__(self)
+            self.setup()
+            self.x = 2
+
+    Parent = python_ta.contracts.check_contracts(Parent)
+
+    class LateChild(Parent, tag="late"):
+        def __init__(self) -> None:
+            Parent.__init__(self)
+            self.setup()
+            self.x = 3
+
+    assert Parent.tags == ["early", "late"]
+    assert EarlyChild().x == 2
+    assert LateChild().x == 3
+    with pytest.raises(AssertionError):
+        LateChild().setup()
+
+
 if __name__ == "__main__":
     pytest.main(["test_class_contracts.py"])
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import io
+import json
 import sys
-from typing import Dict, Generic, List, Set, TypeVar, Union
+from typing import Callable, Dict, Generic, List, Set, TypeVar, Union
 
 import pytest
 from nested_preconditions_example import Student, my_function
@@ -1135,3 +1137,504 @@ def test_custom_generic_class_with_parameter() -> None:
         return value.item
 
     process_generic(GenericClass(10))
+
+
+def test_type_hints_resolved_once(mocker) -> None:
+    """Test that the type hints of a function are only resolved on its first call."""
+
+    @check_contracts
+    def add_one(x: int) -> int:
+        return x + 1
+
+    spy = mocker.spy(python_ta.contracts.typing, "get_type_hints")
+    add_one(1)
+    add_one(2)
+
+    spy.assert_called_once()
+
+
+def test_clear_contract_plans_function() -> None:
+    """Test that the preconditions of a function are parsed again after its contract plan is
+    cleared."""
+
+    @check_contracts
+    def double(x: int) -> int:
+        """Precondition: x > 0"""
+        return x * 2
+
+    double(1)
+    double.__doc__ = """Precondition: x > 1"""
+    double(1)
+
+    python_ta.contracts.clear_contract_plans(double)
+
+    with pytest.raises(AssertionError):
+        double(1)
+
+
+def test_clear_contract_plans_class() -> None:
+    """Test that the type hints of the methods of a class are resolved again after their contract
+    plans are cleared."""
+
+    @check_contracts
+    class Counter:
+        count: int
+
+        def __init__(self) -> None:
+            self.count = 0
+
+        def increment(self, amount: int) -> None:
+            self.count += amount
+
+    counter = Counter()
+    counter.increment(1)
+    Counter.increment.__annotations__["amount"] = str
+    counter.increment(1)
+
+    python_ta.contracts.clear_contract_plans(Counter)
+
+    with pytest.raises(AssertionError):
+        counter.increment(1)
+
+
+def test_large_list_int_with_bool() -> None:
+    """Calling a function with a large list of ints containing a bool, which should raise an
+    AssertionError with strict type checking enabled."""
+
+    @check_contracts
+    def total(nums: list[int]) -> int:
+        return sum(nums)
+
+    nums = list(range(10000))
+    assert total(nums) == sum(nums)
+
+    nums.append(True)
+    with pytest.raises(AssertionError):
+        total(nums)
+
+
+def test_list_int_subclass() -> None:
+    """Calling a function with a list containing an instance of a subclass of int, which is checked
+    without the fast type check."""
+
+    class MyInt(int):
+        pass
+
+    @check_contracts
+    def total(nums: list[int]) -> int:
+        return sum(nums)
+
+    assert total([1, MyInt(2)]) == 3
+
+
+def test_dict_union_values() -> None:
+    """Calling a function with a dict whose values have different types of a Union."""
+
+    @check_contracts
+    def count(d: dict[str, Union[int, list[float]]]) -> int:
+        return len(d)
+
+    assert count({"a": 1, "b": [1.0, 2.0]}) == 2
+    with pytest.raises(AssertionError):
+        count({"a": 1, "b": [1.0, 2]})
+
+
+def test_fast_type_check_cached() -> None:
+    """Test that the fast type check of a type annotation is only computed once."""
+    expected_type = dict[str, list[int]]
+    fast_check = python_ta.contracts._get_fast_type_check(expected_type)
+
+    assert python_ta.contracts._get_fast_type_check(expected_type) is fast_check
+
+
+def test_collection_item_index_reported() -> None:
+    """Test that the index of an item of a list argument that does not match its type annotation is
+    reported."""
+
+    @check_contracts
+    def total(nums: list[int]) -> int:
+        return sum(nums)
+
+    with pytest.raises(AssertionError) as excinfo:
+        total([1, 2, 3.0, 4])
+
+    msg = str(excinfo.value)
+    assert "Value 3.0 at nums[2] did not match expected type int" in msg
+
+
+def test_collection_nested_item_reported() -> None:
+    """Test that the location of an item of a nested collection in a return value that does not
+    match its type annotation is reported."""
+
+    @check_contracts
+    def group() -> dict[str, list[int]]:
+        return {"a": [1], "b": [2, "3"]}
+
+    with pytest.raises(AssertionError) as excinfo:
+        group()
+
+    msg = str(excinfo.value)
+    assert "Value '3' at return['b'][1] did not match expected type int" in msg
+
+
+def test_collection_check_first(monkeypatch) -> None:
+    """Test that only the first COLLECTION_CHECK_SIZE items of a collection are checked with the
+    "first" collection check strategy."""
+    monkeypatch.setattr(python_ta.contracts, "COLLECTION_CHECK_STRATEGY", "first")
+    monkeypatch.setattr(python_ta.contracts, "COLLECTION_CHECK_SIZE", 3)
+
+    @check_contracts
+    def total(nums: list[int]) -> int:
+        return len(nums)
+
+    assert total([1, 2, 3, "4"]) == 4
+    with pytest.raises(AssertionError) as excinfo:
+        total([1, 2, "3", 4])
+
+    assert "at nums[2]" in str(excinfo.value)
+
+
+def test_collection_check_sample(monkeypatch) -> None:
+    """Test that only a sample of COLLECTION_CHECK_SIZE items of a collection are checked with the
+    "sample" collection check strategy, and that the index of a sampled item is reported."""
+    monkeypatch.setattr(python_ta.contracts, "COLLECTION_CHECK_STRATEGY", "sample")
+    monkeypatch.setattr(python_ta.contracts, "COLLECTION_CHECK_SIZE", 10)
+    spy_calls = []
+    check_item_type = python_ta.contracts._check_item_type
+
+    def spy(location, *args) -> None:
+        spy_calls.append(location)
+        check_item_type(location, *args)
+
+    monkeypatch.setattr(python_ta.contracts, "_check_item_type", spy)
+
+    @check_contracts
+    def total(nums: list[int]) -> int:
+        return len(nums)
+
+    assert total(list(range(1000))) == 1000
+    assert len(spy_calls) == 10
+
+    with pytest.raises(AssertionError) as excinfo:
+        total([str(i) for i in range(1000)])
+
+    assert f"at {spy_calls[10]} did not match" in str(excinfo.value)
+
+
+def test_collection_check_budget(monkeypatch) -> None:
+    """Test that at most COLLECTION_CHECK_SIZE items (including nested collections) are checked in
+    total for each argument with the "budget" collection check strategy."""
+    monkeypatch.setattr(python_ta.contracts, "COLLECTION_CHECK_STRATEGY", "budget")
+    monkeypatch.setattr(python_ta.contracts, "COLLECTION_CHECK_SIZE", 5)
+
+    @check_contracts
+    def total(nums: list[list[int]]) -> int:
+        return len(nums)
+
+    assert total([[1, 2, 3], [4, "5"]]) == 2
+    with pytest.raises(AssertionError):
+        total([[1, "2"], [3, 4]])
+
+
+def test_collection_check_decorator_override() -> None:
+    """Test that the collection check strategy and size given to check_contracts override the
+    module-level settings."""
+
+    @check_contracts(collection_check_strategy="first", collection_check_size=2)
+    def total(nums: list[int]) -> int:
+        return len(nums)
+
+    assert total([1, 2, "3"]) == 3
+    with pytest.raises(AssertionError):
+        total([1, "2", 3])
+
+
+def test_collection_check_class_override() -> None:
+    """Test that the collection check strategy given to check_contracts for a class applies to its
+    methods."""
+
+    @check_contracts(collection_check_strategy="first", collection_check_size=1)
+    class Totaller:
+        def total(self, nums: list[int]) -> int:
+            return len(nums)
+
+    assert Totaller().total([1, "2"]) == 2
+
+
+def test_collection_check_invalid_strategy() -> None:
+    """Test that check_contracts raises a ValueError for an invalid collection check strategy."""
+    with pytest.raises(ValueError):
+        check_contracts(collection_check_strategy="some")
+
+
+def test_contract_profile(monkeypatch) -> None:
+    """Test that the number of calls and contract checks of a function are recorded when
+    PROFILE_CONTRACTS is True."""
+    monkeypatch.setattr(python_ta.contracts, "PROFILE_CONTRACTS", True)
+    python_ta.contracts.reset_contract_profile()
+
+    @check_contracts
+    def increment(x: int) -> int:
+        """Precondition: x >= 0"""
+        return x + 1
+
+    increment(1)
+    increment(2)
+
+    profile = python_ta.contracts.get_contract_profile()
+    function_profile = profile[f"{__name__}.{increment.__qualname__}"]
+    assert function_profile["calls"] == 2
+    assert function_profile["parameter_types"]["checks"] == 2
+    assert function_profile["preconditions"]["checks"] == 2
+    assert function_profile["return_type"]["checks"] == 2
+    assert function_profile["representation_invariants"]["checks"] == 0
+    assert function_profile["preconditions"]["time"] > 0
+
+
+def test_contract_profile_disabled() -> None:
+    """Test that nothing is recorded when PROFILE_CONTRACTS is False."""
+    python_ta.contracts.reset_contract_profile()
+
+    @check_contracts
+    def increment(x: int) -> int:
+        return x + 1
+
+    increment(1)
+
+    assert python_ta.contracts.get_contract_profile() == {}
+
+
+def test_print_contract_profile(monkeypatch) -> None:
+    """Test that the contract checking profile is printed as a table or as JSON."""
+    monkeypatch.setattr(python_ta.contracts, "PROFILE_CONTRACTS", True)
+    python_ta.contracts.reset_contract_profile()
+
+    @check_contracts
+    def increment(x: int) -> int:
+        return x + 1
+
+    increment(1)
+    name = f"{__name__}.{increment.__qualname__}"
+
+    table = io.StringIO()
+    python_ta.contracts.print_contract_profile(file=table)
+    header, row = table.getvalue().splitlines()
+    assert header.split()[:2] == ["Function", "Calls"]
+    assert row.split()[:2] == [name, "1"]
+
+    output = io.StringIO()
+    python_ta.contracts.print_contract_profile("json", file=output)
+    assert json.loads(output.getvalue()) == python_ta.contracts.get_contract_profile()
+
+
+def test_enable_contract_profiling_registers_once(monkeypatch) -> None:
+    """Test that calling enable_contract_profiling repeatedly prints the profile only once at exit,
+    with the arguments of the last call."""
+    registered = []
+    monkeypatch.setattr(python_ta.contracts.atexit, "register", registered.append)
+    monkeypatch.setattr(python_ta.contracts, "PROFILE_CONTRACTS", False)
+    monkeypatch.setattr(python_ta.contracts, "_PROFILE_AT_EXIT_ARGS", None)
+    python_ta.contracts.reset_contract_profile()
+    output = io.StringIO()
+
+    python_ta.contracts.enable_contract_profiling()
+    python_ta.contracts.enable_contract_profiling("json", file=output)
+
+    assert python_ta.contracts.PROFILE_CONTRACTS
+    assert len(registered) == 1
+    registered[0]()
+    assert json.loads(output.getvalue()) == {}
+
+
+@pytest.fixture()
+def adaptive_contract_checking(monkeypatch):
+    """Fixture for enabling adaptive contract checking, with a threshold of 3 and a sample rate
+    of 2."""
+    monkeypatch.setattr(python_ta.contracts, "ADAPTIVE_CONTRACT_CHECKING", True)
+    monkeypatch.setattr(python_ta.contracts, "ADAPTIVE_CHECK_THRESHOLD", 3)
+    monkeypatch.setattr(python_ta.contracts, "ADAPTIVE_CHECK_SAMPLE_RATE", 2)
+
+
+def _checked_calls(func: Callable, args_list: list) -> list[bool]:
+    """Return whether the precondition of func (which must be "x != 0") was checked when calling
+    it on each of the given arguments."""
+    checked = []
+    for args in args_list:
+        try:
+            func(*args)
+        except AssertionError:
+            checked.append(True)
+        else:
+            checked.append(False)
+    return checked
+
+
+def test_adaptive_contract_checking(adaptive_contract_checking) -> None:
+    """Test that the contracts of a function are checked on one in every ADAPTIVE_CHECK_SAMPLE_RATE
+    calls once they have been satisfied ADAPTIVE_CHECK_THRESHOLD times."""
+
+    @check_contracts
+    def inverse(x: float) -> float:
+        """Precondition: x != 0"""
+        return 1 / x if x != 0 else 0.0
+
+    for x in [1.0, 2.0, 3.0]:
+        inverse(x)
+
+    assert _checked_calls(inverse, [(0.0,), (0.0,)]) == [False, True]
+
+
+def test_adaptive_contract_checking_new_arg_types(adaptive_contract_checking) -> None:
+    """Test that the contracts of a function are checked when it is called with arguments of new
+    types."""
+
+    @check_contracts
+    def inverse(x: Union[int, float]) -> float:
+        """Precondition: x != 0"""
+        return 1 / x if x != 0 else 0.0
+
+    for x in [1.0, 2.0, 3.0]:
+        inverse(x)
+
+    assert _checked_calls(inverse, [(0,)]) == [True]
+
+
+def test_adaptive_contract_checking_new_element_types(adaptive_contract_checking) -> None:
+    """Test that the contracts of a function are checked when it is called with a collection whose
+    elements are of a new type."""
+
+    @check_contracts
+    def total(xs: list[int], counts: dict[str, int]) -> int:
+        return sum(xs) + sum(counts.values())
+
+    for _ in range(3):
+        total([1, 2], {"a": 1})
+
+    for args in [(["a"], {"a": 1}), ([1], {"a": "b"}), ([1], {1: 1})] * 2:
+        with pytest.raises(AssertionError):
+            total(*args)
+
+
+def test_adaptive_contract_checking_function_assertion(adaptive_contract_checking) -> None:
+    """Test that an assertion failing in the body of a function does not cause its contracts to be
+    checked on every call again."""
+
+    @check_contracts
+    def inverse(x: float) -> float:
+        """Precondition: x != 0"""
+        assert x != 1.0
+        return 1 / x if x != 0 else 0.0
+
+    for x in [2.0, 3.0, 4.0, 5.0]:
+        inverse(x)
+    # This call is checked, as one in every ADAPTIVE_CHECK_SAMPLE_RATE calls
+    with pytest.raises(AssertionError):
+        inverse(1.0)
+    assert _checked_calls(inverse, [(0.0,), (0.0,)]) == [False, True]
+
+
+def test_adaptive_contract_checking_after_violation(adaptive_contract_checking) -> None:
+    """Test that every call is checked again after a contract violation."""
+
+    @check_contracts
+    def inverse(x: float) -> float:
+        """Precondition: x != 0"""
+        return 1 / x if x != 0 else 0.0
+
+    for x in [1.0, 2.0, 3.0]:
+        inverse(x)
+    assert _checked_calls(inverse, [(0.0,), (0.0,), (0.0,)]) == [False, True, True]
+
+
+def test_contract_violation_large_argument(monkeypatch) -> None:
+    """Test that only the first and last items of a large argument are shown in a contract error
+    message."""
+    monkeypatch.setattr(python_ta.contracts, "DEBUG_CONTRACTS", False)
+
+    @check_contracts
+    def first(nums: list[int]) -> int:
+        """Precondition: len(nums) < 10"""
+        return nums[0]
+
+    with pytest.raises(AssertionError) as excinfo:
+        first(list(range(1_000_000)))
+
+    msg = str(excinfo.value)
+    assert "{nums: [0, 1, 2, 3," in msg
+    assert len(msg) < 150
+
+
+def test_display_value_keeps_dict_order(monkeypatch) -> None:
+    """Test that the items of a dict are shown in the order they were inserted."""
+    monkeypatch.setattr(python_ta.contracts, "DEBUG_CONTRACTS", False)
+
+    assert python_ta.contracts._display_value({"b": 1, "a": 2}) == "{'b': 1, 'a': 2}"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ([[[[1]]]], "[[[[1]]]]"),
+        ({"a": {"b": {"c": {"d": 1}}}}, "{'a': {'b': {'c': {'d': 1}}}}"),
+        ((1,), "(1,)"),
+        (frozenset({1}), "frozenset({1})"),
+    ],
+)
+def test_display_value_short_nested_value(monkeypatch, value, expected) -> None:
+    """Test that short values are shown in full, however deeply they are nested."""
+    monkeypatch.setattr(python_ta.contracts, "DEBUG_CONTRACTS", False)
+
+    assert python_ta.contracts._display_value(value) == expected
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        list(range(1000)),
+        {i: [i] for i in range(1000)},
+        [list(range(1000)) for _ in range(1000)],
+        set(range(1000)),
+    ],
+)
+def test_display_value_large_value_tail(monkeypatch, value) -> None:
+    """Test that a large value is shown with the first and last characters of its representation."""
+    monkeypatch.setattr(python_ta.contracts, "DEBUG_CONTRACTS", False)
+    s = repr(value)
+
+    assert python_ta.contracts._display_value(value) == s[:13] + "..." + s[-13:]
+
+
+def test_debug_message_not_formatted(monkeypatch) -> None:
+    """Test that debugging messages are not formatted when DEBUG_CONTRACTS is False."""
+    monkeypatch.setattr(python_ta.contracts, "DEBUG_CONTRACTS", False)
+
+    class Unprintable:
+        def __str__(self) -> str:
+            raise AssertionError("debugging message was formatted")
+
+    python_ta.contracts._debug("Checking %s", Unprintable())
+
+
+@pytest.mark.parametrize(
+    "make_value,expected_type",
+    [
+        (lambda item: [item] * 100_000, int),
+        (lambda item: tuple([item, item] for _ in range(100_000)), list[int]),
+    ],
+)
+def test_large_argument_type_error_message(monkeypatch, make_value, expected_type) -> None:
+    """Test that the type error for a large argument of the wrong type only represents the
+    first and last items of the argument, instead of computing the representation of all of them."""
+    monkeypatch.setattr(python_ta.contracts, "DEBUG_CONTRACTS", False)
+    reprs = []
+
+    class Item:
+        def __repr__(self) -> str:
+            reprs.append(self)
+            return "Item()"
+
+    with pytest.raises(TypeError) as excinfo:
+        python_ta.contracts.check_type_strict("x", make_value(Item()), expected_type)
+
+    assert len(str(excinfo.value)) < 200
+    assert len(reprs) < 100
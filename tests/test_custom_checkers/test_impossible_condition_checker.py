@@ -1,3 +1,5 @@
+from typing import Any, Optional
+
 import astroid
 import pylint.testutils
 from astroid import nodes
@@ -256,8 +258,31 @@ class TestImpossibleConditionChecker(pylint.testutils.CheckerTestCase):
         with self.assertNoMessages():
             self.checker.visit_if(condition_node)
 
-    def _apply_cfg_visitor(self, src: str) -> nodes.NodeNG:
+    def test_timeout_not_impossible(self, caplog):
+        src = """
+        def func(x: int, y: int, z: int):
+            '''
+            Preconditions:
+                - x > 0 and y > 0 and z > 0
+                - x ** 3 + y ** 3 == z ** 3
+            '''
+            if x == y:
+                print(x)
+        """
+        mod = self._apply_cfg_visitor(src, {"z3-timeout": 50})
+        condition_node, *_ = mod.nodes_of_class(nodes.If)
+
+        with self.assertNoMessages():
+            self.checker.visit_if(condition_node)
+            self.checker.leave_functiondef(mod.body[0])
+
+        assert "Z3 skipped" in caplog.text
+
+    def _apply_cfg_visitor(
+        self, src: str, options: Optional[dict[str, Any]] = None
+    ) -> nodes.NodeNG:
         z3v = Z3Visitor()
         mod = z3v.visitor.visit(astroid.parse(src))
-        mod.accept(CFGVisitor(options={"separate-condition-blocks": True}, z3_enabled=True))
+        options = {"separate-condition-blocks": True, **(options or {})}
+        mod.accept(CFGVisitor(options=options, z3_enabled=True))
         return mod
@@ -1,9 +1,14 @@
 import os
+from unittest.mock import patch
 
 import pylint.testutils
 from astroid import MANAGER
 
-from python_ta.checkers.static_type_checker import StaticTypeChecker
+from python_ta.checkers.static_type_checker import StaticTypeChecker, run_mypy_batch
+
+EXAMPLES_DIR = os.path.normpath(
+    os.path.join(__file__, "../../../examples/custom_checkers/static_type_checker_examples")
+)
 
 
 class TestStaticTypeChecker(pylint.testutils.CheckerTestCase):
@@ -453,3 +458,79 @@ class TestStaticTypeCheckerCustomConfig(pylint.testutils.CheckerTestCase):
         mod = MANAGER.ast_from_file(file_path)
         with self.assertNoMessages():
             self.checker.process_module(mod)
+
+    def test_batch_results_used_by_process_module(self) -> None:
+        """Mypy is not run again for a file that was checked by run_mypy_batch."""
+        file_paths = [
+            os.path.join(EXAMPLES_DIR, "e9952_incompatible_assignment.py"),
+            os.path.join(EXAMPLES_DIR, "imports_no_error.py"),
+        ]
+        run_mypy_batch(file_paths, self.checker.linter.config.mypy_options)
+
+        with patch("python_ta.checkers.static_type_checker.api.run") as mock_run:
+            mod = MANAGER.ast_from_file(file_paths[1])
+            with self.assertNoMessages():
+                self.checker.process_module(mod)
+
+            mod = MANAGER.ast_from_file(file_paths[0])
+            with self.assertAddsMessages(
+                pylint.testutils.MessageTest(
+                    msg_id="incompatible-assignment",
+                    line=2,
+                    col_offset=7,
+                    end_line=2,
+                    end_col_offset=19,
+                    args=("str", "int"),
+                ),
+                pylint.testutils.MessageTest(
+                    msg_id="incompatible-assignment",
+                    line=4,
+                    col_offset=14,
+                    end_line=4,
+                    end_col_offset=18,
+                    args=("str", "int"),
+                ),
+                ignore_position=True,
+            ):
+                self.checker.process_module(mod)
+
+        mock_run.assert_not_called()
+
+    def test_batch_results_used_once(self) -> None:
+        """Mypy is run again for a file whose batch results have already been used."""
+        file_path = os.path.join(EXAMPLES_DIR, "static_type_checker_no_error.py")
+        run_mypy_batch([file_path], self.checker.linter.config.mypy_options)
+        mod = MANAGER.ast_from_file(file_path)
+        self.checker.process_module(mod)
+
+        with patch(
+            "python_ta.checkers.static_type_checker.api.run", return_value=("", "", 0)
+        ) as mock_run:
+            self.checker.process_module(mod)
+
+        mock_run.assert_called_once()
+
+    def test_batch_duplicate_module_names(self, tmp_path) -> None:
+        """Files with the same module name cannot be checked by mypy together, so each file is
+        checked separately."""
+        file_paths = []
+        for directory in ("a", "b"):
+            (tmp_path / directory).mkdir()
+            file_path = tmp_path / directory / "same_name.py"
+            file_path.write_text('x: int = "one"\n')
+            file_paths.append(str(file_path))
+        run_mypy_batch(file_paths, self.checker.linter.config.mypy_options)
+
+        mod = MANAGER.ast_from_file(file_paths[0])
+        with self.assertAddsMessages(
+            pylint.testutils.MessageTest(
+                msg_id="incompatible-assignment",
+                line=1,
+                col_offset=10,
+                end_line=1,
+                end_col_offset=14,
+                args=("str", "int"),
+            ),
+            ignore_position=True,
+        ):
+            self.checker.process_module(mod)
@@ -6,13 +6,14 @@ types of accumulator loops
 import copy
 import csv
 import io
+import json
 import shutil
 import sys
 
 import pytest
 import tabulate
 
-from python_ta.debug import AccumulationTable
+from python_ta.debug import AccumulationTable, monitoring
 
 
 def test_one_accumulator() -> None:
@@ -239,6 +240,41 @@ def test_accumulation_table_dict_deepcopy():
     assert recorded_value_2 == expected_value_2
 
 
+def test_accumulation_table_unchanged_values_shared():
+    data = [[1], [2]]
+    list_so_far = []
+    with AccumulationTable(["data", "list_so_far"]) as table:
+        for number in range(3):
+            list_so_far.append([number])
+
+    recorded_data = table.loop_accumulators["data"]
+    recorded_lists = table.loop_accumulators["list_so_far"]
+    assert recorded_data == [[[1], [2]]] * 4
+    assert recorded_lists == [[], [[0]], [[0], [1]], [[0], [1], [2]]]
+    assert recorded_data[0] is recorded_data[3]
+    assert recorded_lists[1][0] is recorded_lists[3][0]
+
+
+def test_accumulation_table_max_capture_size():
+    list_so_far = []
+    with AccumulationTable(["list_so_far"], max_capture_size=2) as table:
+        for number in range(4):
+            list_so_far.append(number)
+
+    assert table.loop_accumulators["list_so_far"] == [[], [0], [0, 1], "[0, 1, ...]", "[0, 1, ...]"]
+
+
+def test_accumulation_table_forgets_values_no_longer_captured():
+    current = []
+    with AccumulationTable(["current"]) as table:
+        for number in range(10):
+            current = [[number]]
+
+    assert table.loop_accumulators["current"] == [[]] + [[[number]] for number in range(10)]
+    # Only the containers captured in the last iteration are kept alive
+    assert len(table._capture._copies) + len(table._capture._previous_copies) == 2
+
+
 class MyClass:
     items: list
     sum_so_far: int
@@ -545,3 +581,128 @@ def test_output_to_new_file(tmp_path, output_format):
         expected_content = expected_content + "\n"
 
     assert content == expected_content
+
+
+def test_stream_csv_to_new_file(tmp_path):
+    """Test that streaming the csv output writes the same content as the csv format."""
+    output_file = tmp_path / "output.txt"
+    numbers = [10, 20, 30, 40, 50, 60]
+    sum_so_far = 0
+    list_so_far = []
+    avg_so_far = None
+
+    table_kwargs = {"output": str(output_file), "format": "csv", "stream": True, "buffer_size": 2}
+
+    with AccumulationTable(["sum_so_far", "avg_so_far", "list_so_far"], **table_kwargs) as table:
+        for number in numbers:
+            sum_so_far = sum_so_far + number
+            avg_so_far = sum_so_far / (len(list_so_far) + 1)
+            list_so_far.append((sum_so_far, avg_so_far))
+
+    with open(output_file, "r") as file:
+        content = file.read()
+
+    assert content == get_expected_content("csv")
+    assert table.loop_accumulators == {"sum_so_far": [], "avg_so_far": [], "list_so_far": []}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_ndjson_output(tmp_path, stream):
+    """Test that the ndjson format writes one JSON object per iteration."""
+    output_file = tmp_path / "output.txt"
+    list_so_far = []
+
+    table_kwargs = {"output": str(output_file), "format": "ndjson", "stream": stream}
+
+    with AccumulationTable(["list_so_far"], **table_kwargs):
+        for number in [1, 2]:
+            list_so_far.append({number})
+
+    with open(output_file, "r") as file:
+        rows = [json.loads(line) for line in file]
+
+    assert rows == [
+        {"iteration": 0, "number": "N/A", "list_so_far": []},
+        {"iteration": 1, "number": 1, "list_so_far": ["{1}"]},
+        {"iteration": 2, "number": 2, "list_so_far": ["{1}", "{2}"]},
+    ]
+
+
+@pytest.mark.parametrize(
+    "sample_kwargs,expected_iterations",
+    [
+        ({"sample_every": 3}, [0, 3, 6, 9]),
+        ({"sample_first": 2}, [0, 1]),
+        ({"sample_last": 2}, [8, 9]),
+        ({"sample_first": 2, "sample_last": 2}, [0, 1, 8, 9]),
+        ({"sample_every": 2, "sample_first": 1, "sample_last": 1}, [0, 8]),
+        ({"sample_first": 6, "sample_last": 6}, list(range(10))),
+    ],
+)
+def test_stream_sampling(tmp_path, sample_kwargs, expected_iterations):
+    """Test that only the sampled iterations are streamed."""
+    output_file = tmp_path / "output.txt"
+    total = 0
+
+    table_kwargs = {"output": str(output_file), "format": "ndjson", "stream": True}
+
+    with AccumulationTable(["total"], **table_kwargs, **sample_kwargs):
+        for number in range(9):
+            total += number
+
+    with open(output_file, "r") as file:
+        rows = [json.loads(line) for line in file]
+
+    assert [row["iteration"] for row in rows] == expected_iterations
+    assert [row["total"] for row in rows] == [
+        sum(range(iteration)) for iteration in expected_iterations
+    ]
+
+
+def test_stream_flushed_on_exception(tmp_path):
+    """Test that the buffered rows are written when the loop raises an exception."""
+    output_file = tmp_path / "output.txt"
+    total = 0
+
+    table_kwargs = {"output": str(output_file), "format": "csv", "stream": True}
+
+    with pytest.raises(ZeroDivisionError):
+        with AccumulationTable(["total"], **table_kwargs):
+            for number in [2, 1, 0]:
+                total += 1 / number
+
+    assert output_file.read_text() == "iteration,number,total\n0,N/A,0\n1,2,0.5\n2,1,1.5\n"
+
+
+def test_stream_table_format_not_supported():
+    """Test that streaming the table format raises a ValueError."""
+    with pytest.raises(ValueError):
+        AccumulationTable(["total"], stream=True)
+
+
+@pytest.mark.parametrize("use_sys_monitoring", [True, False])
+def test_tracing_backends(monkeypatch, use_sys_monitoring) -> None:
+    """Test that the loop is traced the same way with sys.monitoring and sys.settrace."""
+    monkeypatch.setattr(monitoring, "USE_SYS_MONITORING", use_sys_monitoring)
+    test_list = [10, 20, 30]
+    sum_so_far = 0
+    with AccumulationTable(["sum_so_far"]) as table:
+        for number in test_list:
+            sum_so_far = sum_so_far + number
+        sum_so_far = sum_so_far * 2
+
+    assert table.loop_variables == {"number": ["N/A", 10, 20, 30]}
+    assert table.loop_accumulators == {"sum_so_far": [0, 10, 30, 60]}
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires Python 3.12 or higher")
+def test_sys_monitoring_backend() -> None:
+    """Test that sys.monitoring is used instead of sys.settrace on Python 3.12+."""
+    test_list = [10, 20, 30]
+    traces = []
+    with AccumulationTable(["traces"]) as table:
+        for number in test_list:
+            traces = traces + [sys.gettrace()]
+
+    assert table.loop_accumulators == {"traces": [[], [None], [None, None], [None, None, None]]}
+    assert sys.monitoring.get_tool(sys.monitoring.DEBUGGER_ID) is None
@@ -3,7 +3,11 @@ Test suite for the RecursionTable class on different
 types of recursive functions.
 """
 
-from python_ta.debug import RecursionTable
+import sys
+
+import pytest
+
+from python_ta.debug import RecursionTable, monitoring
 from python_ta.util.tree import Tree
 
 
@@ -352,3 +356,112 @@ def test_multiple_parameters_multiple_calls_tree() -> None:
     node4.add_child(node6)
 
     assert actual_tree == expected_tree
+
+
+def test_max_capture_size() -> None:
+    with RecursionTable("sum_list", max_capture_size=2) as table:
+
+        def sum_list(lst):
+            if lst == []:
+                return 0
+            else:
+                return lst[0] + sum_list(lst[1:])
+
+        sum_list([1, 2, 3])
+
+    recursive_dict = table.get_recursive_dict()
+    assert recursive_dict["lst"] == ["[1, 2, ...]", [2, 3], [3], []]
+    assert recursive_dict["return value"] == [6, 5, 3, 0]
+
+
+@pytest.mark.parametrize("use_sys_monitoring", [True, False])
+def test_tracing_backends(monkeypatch, use_sys_monitoring) -> None:
+    """Test that the function is traced the same way with sys.monitoring and sys.settrace,
+    including the calls that raise an exception."""
+    monkeypatch.setattr(monitoring, "USE_SYS_MONITORING", use_sys_monitoring)
+    with RecursionTable("checked_fact") as table:
+
+        def checked_fact(n):
+            if n < 0:
+                raise ValueError
+            elif n == 0:
+                return 1
+            else:
+                return n * checked_fact(n - 1)
+
+        checked_fact(2)
+        with pytest.raises(ValueError):
+            checked_fact(-1)
+
+    assert table.get_recursive_dict() == {
+        "n": [2, 1, 0, -1],
+        "return value": [2, 1, 1, None],
+        "called by": ["N/A", "checked_fact(2)", "checked_fact(1)", "N/A"],
+    }
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires Python 3.12 or higher")
+def test_sys_monitoring_backend() -> None:
+    """Test that sys.monitoring is used instead of sys.settrace on Python 3.12+."""
+    with RecursionTable("fact") as table:
+
+        def fact(n):
+            assert sys.gettrace() is None
+            return 1 if n == 0 else n * fact(n - 1)
+
+        fact(2)
+
+    assert table.get_recursive_dict()["return value"] == [2, 1, 1]
+    assert sys.monitoring.get_tool(sys.monitoring.DEBUGGER_ID) is None
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires Python 3.12 or higher")
+def test_sys_monitoring_other_tool_events_stay_disabled(monkeypatch) -> None:
+    """Test that the events disabled by another sys.monitoring tool are not re-enabled when a
+    RecursionTable stops tracing."""
+    monkeypatch.setattr(monitoring, "_DISABLED_TOOL_IDS", set())
+    events = sys.monitoring.events
+    other_tool_id = 5
+    lines = []
+
+    def target():
+        return 1
+
+    def on_line(code, line_number):
+        lines.append(line_number)
+        return sys.monitoring.DISABLE
+
+    sys.monitoring.use_tool_id(other_tool_id, "test")
+    try:
+        sys.monitoring.register_callback(other_tool_id, events.LINE, on_line)
+        sys.monitoring.set_local_events(other_tool_id, target.__code__, events.LINE)
+        target()
+        with RecursionTable("fact"):
+
+            def fact(n):
+                return 1 if n == 0 else n * fact(n - 1)
+
+            fact(1)
+        target()
+    finally:
+        sys.monitoring.set_local_events(other_tool_id, target.__code__, events.NO_EVENTS)
+        sys.monitoring.register_callback(other_tool_id, events.LINE, None)
+        sys.monitoring.free_tool_id(other_tool_id)
+
+    assert len(lines) == 1
+
+
+@pytest.mark.skipif(sys.version_info < (3, 12), reason="requires Python 3.12 or higher")
+def test_sys_monitoring_tool_id_reused() -> None:
+    """Test that a function whose calls were ignored by a RecursionTable is traced by a later
+    RecursionTable using the same sys.monitoring tool id."""
+
+    def countdown(n):
+        return 0 if n == 0 else countdown(n - 1)
+
+    with RecursionTable("fact"):
+        countdown(1)
+    with RecursionTable("countdown") as table:
+        countdown(1)
+
+    assert table.get_recursive_dict()["n"] == [1, 0]
@@ -9,8 +9,10 @@ import os
 import re
 import subprocess
 import sys
+import weakref
 from typing import Iterable, Optional
 
+from python_ta.debug.id_tracker import IDTracker
 from python_ta.debug.snapshot import snapshot, snapshot_to_json
 
 SNAPSHOT_DIR = os.path.join(
@@ -623,6 +625,60 @@ def test_snapshot_to_json_one_class():
     assert json_data == expected_output
 
 
+def test_snapshot_to_json_multiple_snapshots():
+    """
+    Test snapshot_to_json with an IDTracker shared between snapshots, where one of the values is mutated.
+    """
+    id_tracker = IDTracker()
+    nums = [1, 2]
+    words = ["a"]
+
+    first = snapshot_to_json([{"func1": {"nums": nums, "words": words}}], id_tracker)
+    words.append("b")
+    second = snapshot_to_json([{"func1": {"nums": nums, "words": words}}], id_tracker)
+
+    assert first[1:] == [
+        {"id": 2, "type": "int", "value": 1},
+        {"id": 3, "type": "int", "value": 2},
+        {"id": 1, "type": "list", "value": [2, 3]},
+        {"id": 5, "type": "str", "value": "a"},
+        {"id": 4, "type": "list", "value": [5]},
+    ]
+    assert second[1:] == [
+        {"id": 2, "type": "int", "value": 1},
+        {"id": 3, "type": "int", "value": 2},
+        {"id": 1, "type": "list", "value": [2, 3]},
+        {"id": 5, "type": "str", "value": "a"},
+        {"id": 6, "type": "str", "value": "b"},
+        {"id": 4, "type": "list", "value": [5, 6]},
+    ]
+    # The entries of the values that were not mutated are reused
+    assert second[3] is first[3]
+
+
+def test_snapshot_to_json_multiple_snapshots_releases_values():
+    """
+    Test that an IDTracker shared between snapshots only keeps the values of the latest snapshot alive.
+    """
+
+    class Removed:
+        def __init__(self, value: float) -> None:
+            self.value = value
+
+    id_tracker = IDTracker()
+    nums = [1, 2]
+    removed = Removed(3.5)
+
+    snapshot_to_json([{"func1": {"nums": nums, "removed": removed}}], id_tracker)
+    removed_ref = weakref.ref(removed)
+    del removed
+    snapshot_to_json([{"func1": {"nums": nums}}], id_tracker)
+
+    assert removed_ref() is None
+    # Only the entries of nums and its elements are kept
+    assert len(id_tracker.json_entries) == 3
+
+
 def test_snapshot_no_save_file():
     """
     Tests that snapshot's save feature is not triggered when save = False
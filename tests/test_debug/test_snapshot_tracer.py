@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import os.path
 import re
+import subprocess
 import sys
 from typing import Iterator
 
@@ -9,7 +10,7 @@ import pytest
 from bs4 import BeautifulSoup
 from pytest_snapshot.plugin import Snapshot
 
-from python_ta.debug import SnapshotTracer
+from python_ta.debug import SnapshotTracer, monitoring
 
 SNAPSHOT_DIR = os.path.join(
     os.path.dirname(os.path.realpath(__file__)), "snapshot_tracer_testing_snapshots"
@@ -237,6 +238,77 @@ class TestSnapshotTracer:
                 {"snapshot-0.svg": actual_file.read()}, func_no_output_dir.__name__
             )
 
+    @pytest.mark.parametrize("use_sys_monitoring", [True, False])
+    def test_snapshots_rendered_on_exit(self, tmp_path, mocker, monkeypatch, use_sys_monitoring):
+        """
+        Test that SnapshotTracer renders the memory model diagram of each snapshot once the `with` block exits,
+        with both sys.monitoring and sys.settrace.
+        """
+        monkeypatch.setattr(monitoring, "USE_SYS_MONITORING", use_sys_monitoring)
+        outputs = []
+
+        def render(json_data: list[dict], memory_viz_args: list[str], **_kwargs) -> None:
+            assert sys.gettrace() is None
+            assert memory_viz_args.count("--output") == 1
+            output = memory_viz_args[memory_viz_args.index("--output") + 1]
+            outputs.append(output)
+            with open(output, "w") as file:
+                file.write("<svg></svg>")
+            return subprocess.CompletedProcess([], 0, "", "")
+
+        mocker.patch("python_ta.debug.snapshot_tracer.run_memory_viz", side_effect=render)
+
+        func_multi_line(str(tmp_path))
+
+        assert sorted(outputs) == [str(tmp_path / f"snapshot-{i}.svg") for i in range(5)]
+
+    def test_first_snapshot_rendered_alone(self, tmp_path, mocker, capsys):
+        """
+        Test that SnapshotTracer renders the first memory model diagram before the others, and writes the
+        output of MemoryViz in the order of the snapshots.
+        """
+        events = []
+
+        def render(json_data: list[dict], memory_viz_args: list[str], **_kwargs):
+            output = memory_viz_args[memory_viz_args.index("--output") + 1]
+            events.append(("start", output))
+            with open(output, "w") as file:
+                file.write("<svg></svg>")
+            events.append(("end", output))
+            return subprocess.CompletedProcess([], 0, f"{os.path.basename(output)}\n", "")
+
+        mocker.patch("python_ta.debug.snapshot_tracer.run_memory_viz", side_effect=render)
+
+        func_multi_line(str(tmp_path))
+
+        first_output = str(tmp_path / "snapshot-0.svg")
+        assert events[:2] == [("start", first_output), ("end", first_output)]
+        assert capsys.readouterr().out == "".join(f"snapshot-{i}.svg\n" for i in range(5))
+
+    def test_render_error_does_not_replace_block_error(self, tmp_path, mocker):
+        """
+        Test that an error rendering the memory model diagrams is only raised when the `with` block
+        does not raise an error.
+        """
+        mocker.patch(
+            "python_ta.debug.snapshot_tracer.run_memory_viz",
+            side_effect=subprocess.CalledProcessError(1, "npx"),
+        )
+
+        def func_raise(raise_error: bool) -> None:
+            with SnapshotTracer(
+                output_directory=str(tmp_path),
+                include_frames=(r"^func_raise$",),
+            ):
+                num = 123
+                if raise_error:
+                    raise ValueError
+
+        with pytest.raises(ValueError):
+            func_raise(True)
+        with pytest.raises(subprocess.CalledProcessError):
+            func_raise(False)
+
     def test_generated_webstepper_html(self, snapshot, tmp_path, prevent_webbrowser_and_httpserver):
         """
         Test that SnapshotTracer generates the correct Webstepper HTML for the given code.
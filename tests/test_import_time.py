@@ -0,0 +1,69 @@
+"""Tests that importing PythonTA does not import its heavy dependencies until they are needed.
+
+Each import is run in a fresh interpreter, so that modules imported by other tests do not interfere.
+"""
+
+import json
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ["pylint", "astroid", "typeguard", "requests", "watchdog", "aiohttp", "bs4"]
+
+
+def _imported_modules(statement: str) -> set[str]:
+    """Return the names of the heavy modules loaded after running statement in a fresh
+    interpreter.
+
+    typeguard is imported lazily, so it is only reported once it has been loaded
+    (i.e., once one of its submodules has been imported).
+    """
+    code = (
+        f"import json, sys\n{statement}\n"
+        "loaded = {name.split('.')[0] for name in sys.modules}\n"
+        "if 'typeguard._checkers' not in sys.modules:\n"
+        "    loaded.discard('typeguard')\n"
+        "print(json.dumps(sorted(loaded)))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(json.loads(result.stdout.splitlines()[-1])) & set(HEAVY_MODULES)
+
+
+@pytest.mark.parametrize(
+    "statement,allowed",
+    [
+        ("import python_ta", set()),
+        ("import python_ta.contracts", set()),
+        ("from python_ta.contracts import check_contracts", set()),
+        ("import python_ta.debug", set()),
+        ("from python_ta.debug import AccumulationTable", {"astroid"}),
+        ("from python_ta.debug import SnapshotTracer", set()),
+    ],
+)
+def test_import_does_not_load_heavy_modules(statement: str, allowed: set[str]) -> None:
+    """Test that statement only imports the allowed heavy modules."""
+    assert _imported_modules(statement) <= allowed
+
+
+def test_check_contracts_loads_typeguard_when_needed() -> None:
+    """Test that typeguard is loaded when a contract check needs it."""
+    statement = (
+        "from typing import Callable\n"
+        "from python_ta.contracts import check_contracts\n"
+        "@check_contracts\n"
+        "def apply(f: Callable[[int], int]) -> int:\n"
+        "    return f(1)\n"
+        "apply(abs)"
+    )
+    assert "typeguard" in _imported_modules(statement)
+
+
+def test_lazy_attributes_are_available() -> None:
+    """Test that the attributes of python_ta imported lazily are available."""
+    import python_ta
+
+    assert callable(python_ta.get_file_paths)
+    assert callable(python_ta.check_file)
@@ -123,3 +123,24 @@ def test_no_config() -> None:
     )
 
     assert output.returncode == 0
+
+
+def test_check_jobs_errors_nonzero() -> None:
+    """Test that python_ta --jobs exits with non-zero status code when it detects errors in a file
+    checked by a worker process.
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "python_ta",
+            "--jobs",
+            "2",
+            "--config",
+            TEST_CONFIG,
+            path.join(SOURCE_ROOT, "tests", "fixtures", "no_errors.py"),
+            path.join(SOURCE_ROOT, "examples", "nodes", "name.py"),
+        ]
+    )
+
+    assert output.returncode != 0
@@ -1,3 +1,4 @@
+import json
 import os
 import re
 import signal
@@ -165,8 +166,8 @@ def test_watch_update(temp_script_file_path, snapshot):
 
 
 def test_websocket_message(temp_script_file_path):
-    """Test that the "reload" message is sent to any open websocket connections
-    upon update to the files being watched
+    """Test that an update containing only the modified file is sent to any open websocket
+    connections upon update to the files being watched
     """
     process = subprocess.Popen([sys.executable, temp_script_file_path])
 
@@ -177,10 +178,12 @@ def test_websocket_message(temp_script_file_path):
         ws = websocket.create_connection("ws://localhost:5008/ws", timeout=10)
 
         with open(temp_script_file_path, "a") as py_file:
-            py_file.write("# trigger reload\n")
+            py_file.write("# trigger update\n")
 
-        message = ws.recv()
-        assert message == "reload"
+        update = json.loads(ws.recv())
+        assert [file["index"] for file in update["files"]] == [0]
+        assert "<section id=0>" in update["files"][0]["section"]
+        assert "watch_integration.py" in update["files"][0]["toc"]
     finally:
         try:
             ws.close()
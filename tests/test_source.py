@@ -0,0 +1,72 @@
+"""
+Contains tests for sharing the source of checked files between the stages of checking them.
+"""
+
+import io
+import tokenize
+
+import pycodestyle
+from pylint.utils import utils
+
+import python_ta
+from python_ta.util.source import clear_source_bundles, get_source_bundle
+
+SOURCE = """def foo(x):\r\n    # A comment\r\n    return x\r\n"""
+
+
+def test_source_bundle_reused(tmp_path) -> None:
+    """Test that the source bundle of an unmodified file is reused."""
+    file_path = tmp_path / "foo.py"
+    file_path.write_bytes(SOURCE.encode("utf-8"))
+
+    bundle = get_source_bundle(str(file_path))
+
+    assert get_source_bundle(str(file_path)) is bundle
+
+
+def test_source_bundle_modified_file(tmp_path) -> None:
+    """Test that a file is read again after it has been modified."""
+    file_path = tmp_path / "foo.py"
+    file_path.write_bytes(SOURCE.encode("utf-8"))
+    bundle = get_source_bundle(str(file_path))
+
+    file_path.write_bytes(b"x = 1\n")
+
+    assert get_source_bundle(str(file_path)) is not bundle
+    assert get_source_bundle(str(file_path)).lines == ["x = 1\n"]
+
+
+def test_source_bundle_matches_tokenize(tmp_path) -> None:
+    """Test that the lines and tokens of a source bundle match those computed by tokenize."""
+    file_path = tmp_path / "foo.py"
+    file_path.write_bytes(b"\xef\xbb\xbf" + SOURCE.encode("utf-8"))
+
+    bundle = get_source_bundle(str(file_path))
+
+    assert bundle.lines == pycodestyle.readlines(str(file_path))
+    with open(file_path, "rb") as f:
+        assert bundle.tokens == list(tokenize.tokenize(f.readline))
+
+
+def test_check_reads_file_once(tmp_path, mocker) -> None:
+    """Test that checking a file shares its source bundle, rather than having pylint tokenize
+    the file again."""
+    file_path = tmp_path / "foo.py"
+    file_path.write_bytes(SOURCE.encode("utf-8"))
+    clear_source_bundles()
+    spy = mocker.spy(tokenize, "tokenize")
+
+    python_ta.check_all(
+        str(file_path),
+        config={
+            "output-format": "pyta-json",
+            "pyta-error-permission": "no",
+            "pyta-file-permission": "no",
+        },
+        output=io.StringIO(),
+    )
+
+    bundle = get_source_bundle(str(file_path))
+    assert bundle.module is not None
+    assert utils.tokenize_module(bundle.module) == bundle.tokens
+    spy.assert_called_once()
@@ -1,5 +1,6 @@
 """Contains tests for python_ta watch functionality."""
 
+import time
 from unittest.mock import MagicMock, patch
 
 from watchdog.events import FileModifiedEvent
@@ -71,3 +72,67 @@ def test_on_modified_with_unwatched_file(
     mock_check_file.assert_not_called()
     mock_reporter.print_messages.assert_not_called()
     mock_upload.assert_not_called()
+
+
+@patch("python_ta.check.watch.upload_linter_results")
+@patch("python_ta.check.watch.check_file")
+def test_on_modified_checks_dependents(
+    mock_check_file: MagicMock, mock_upload: MagicMock, tmp_path
+) -> None:
+    """Test that Watch Detection also checks the watched files that import the modified file,
+    without using cached results for them, and does not check other files."""
+    modified = tmp_path / "shapes.py"
+    direct = tmp_path / "area.py"
+    indirect = tmp_path / "report.py"
+    unrelated = tmp_path / "other.py"
+    modified.write_text("def square(x):\n    return x * x\n")
+    direct.write_text("from shapes import square\n")
+    indirect.write_text("import area\n")
+    unrelated.write_text("import math\n")
+
+    mock_linter = MagicMock()
+    mock_check_file.return_value = (None, mock_linter)
+    handler = FileChangeHandler(
+        files_to_watch={str(modified), str(direct), str(indirect), str(unrelated)},
+        linter=mock_linter,
+        local_config={},
+        load_default_config=True,
+        autoformat=None,
+        level="all",
+        f_paths=[],
+    )
+
+    handler.on_modified(FileModifiedEvent(str(modified)))
+
+    checked = [
+        (call.kwargs["file_py"], call.kwargs.get("use_cache", True))
+        for call in mock_check_file.call_args_list
+    ]
+    assert checked == [(str(modified), True), (str(direct), False), (str(indirect), False)]
+    mock_upload.assert_called_once()
+
+
+@patch("python_ta.check.watch.upload_linter_results")
+@patch("python_ta.check.watch.check_file")
+def test_on_modified_debounce(mock_check_file: MagicMock, mock_upload: MagicMock) -> None:
+    """Test that a burst of modification events triggers a single check."""
+    mock_linter = MagicMock()
+    mock_check_file.return_value = (None, mock_linter)
+    handler = FileChangeHandler(
+        files_to_watch={"/mock/path/to/file.py"},
+        linter=mock_linter,
+        local_config={},
+        load_default_config=True,
+        autoformat=None,
+        level="all",
+        f_paths=[],
+        debounce_delay=0.1,
+    )
+
+    for _ in range(3):
+        handler.on_modified(FileModifiedEvent("/mock/path/to/file.py"))
+    mock_check_file.assert_not_called()
+
+    time.sleep(0.5)
+    mock_check_file.assert_called_once()
+    mock_upload.assert_called_once()